@@ -30,6 +30,22 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# Индексы, которые миграции создают только в PostgreSQL сырым SQL
+# (выражения и операторные классы); в моделях их нет
+POSTGRESQL_ONLY_INDEXES = {"ix_users_email_lower_pattern", "ix_users_name_trgm"}
+
+# Таблицы, куда миграции сохраняют удаляемые строки; моделей у них нет
+MIGRATION_BACKUP_TABLES = {"reviews_dedupe_backup"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Исключает из сравнения со схемой объекты, которых нет в моделях намеренно"""
+    if type_ == "index" and name in POSTGRESQL_ONLY_INDEXES:
+        return False
+    if type_ == "table" and name in MIGRATION_BACKUP_TABLES:
+        return False
+    return True
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -47,6 +63,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -55,13 +72,33 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # Повтор после ошибки продолжает с упавшей ревизии (см. app/migrate.py)
+        transaction_per_migration=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode.
 
     In this scenario we need to create an Engine
     and associate a connection with the context.
+    A connection passed in config.attributes["connection"]
+    (tests, programmatic upgrades) is used as is.
 
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -69,12 +106,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        do_run_migrations(connection)
 
 
 if context.is_offline_mode():
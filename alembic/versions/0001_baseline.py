@@ -0,0 +1,157 @@
+"""Базовая схема: таблицы из app/models/models.py
+
+Таблицы, уже созданные через Base.metadata.create_all в существующих
+развертываниях, пропускаются. В таких products нет колонки sku (появилась
+вместе с импортом товаров): она и уникальный индекс ix_products_sku
+добавляются к существующей таблице.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORDER_STATUS = sa.Enum('PENDING', 'CONFIRMED', 'SHIPPED', 'DELIVERED', 'CANCELLED', name='orderstatus')
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('email', sa.String(length=100), nullable=False),
+            sa.Column('hashed_password', sa.String(length=255), nullable=False),
+            sa.Column('phone', sa.String(length=20), nullable=True),
+            sa.Column('address', sa.Text(), nullable=True),
+            sa.Column('is_active', sa.Integer(), nullable=True),
+            sa.Column('is_admin', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_users_id', 'users', ['id'])
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    if 'categories' not in existing:
+        op.create_table(
+            'categories',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_categories_id', 'categories', ['id'])
+        op.create_index('ix_categories_name', 'categories', ['name'], unique=True)
+
+    if 'products' not in existing:
+        op.create_table(
+            'products',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('sku', sa.String(length=64), nullable=True),
+            sa.Column('name', sa.String(length=200), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column('stock', sa.Integer(), nullable=False),
+            sa.Column('category_id', sa.Integer(), nullable=True),
+            sa.Column('image_url', sa.String(length=500), nullable=True),
+            sa.Column('is_active', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_products_id', 'products', ['id'])
+        op.create_index('ix_products_sku', 'products', ['sku'], unique=True)
+        op.create_index('ix_products_name', 'products', ['name'])
+    elif 'sku' not in {column['name'] for column in sa.inspect(op.get_bind()).get_columns('products')}:
+        op.add_column('products', sa.Column('sku', sa.String(length=64), nullable=True))
+        op.create_index('ix_products_sku', 'products', ['sku'], unique=True)
+
+    if 'cart_items' not in existing:
+        op.create_table(
+            'cart_items',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('quantity', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_cart_items_id', 'cart_items', ['id'])
+
+    if 'orders' not in existing:
+        op.create_table(
+            'orders',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column('status', ORDER_STATUS, nullable=False),
+            sa.Column('shipping_address', sa.Text(), nullable=False),
+            sa.Column('payment_method', sa.String(length=50), nullable=True),
+            sa.Column('notes', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_orders_id', 'orders', ['id'])
+
+    if 'order_items' not in existing:
+        op.create_table(
+            'order_items',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('order_id', sa.Integer(), nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('quantity', sa.Integer(), nullable=False),
+            sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+            sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_order_items_id', 'order_items', ['id'])
+
+    if 'reviews' not in existing:
+        op.create_table(
+            'reviews',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('rating', sa.Integer(), nullable=False),
+            sa.Column('comment', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_reviews_id', 'reviews', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_table('reviews')
+    op.drop_table('order_items')
+    op.drop_table('orders')
+    op.drop_table('cart_items')
+    op.drop_table('products')
+    op.drop_table('categories')
+    op.drop_table('users')
+    ORDER_STATUS.drop(op.get_bind(), checkfirst=True)
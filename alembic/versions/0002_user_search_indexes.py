@@ -0,0 +1,46 @@
+"""Индексы поиска и keyset-пагинации пользователей
+
+- (created_at, id) для сортировки GET /users и курсора по ней;
+- lower(email) text_pattern_ops для поиска по началу email (PostgreSQL);
+- GIN trigram по name для поиска подстроки в имени (PostgreSQL, pg_trgm).
+
+Revision ID: 0002_user_search_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-19 10:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.migrate import create_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_user_search_indexes'
+down_revision: Union[str, None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently('ix_users_created_at_id', 'users', ['created_at', 'id'])
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        with op.get_context().autocommit_block():
+            op.execute(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_lower_pattern '
+                'ON users (lower(email) text_pattern_ops)'
+            )
+            op.execute(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_name_trgm '
+                'ON users USING gin (name gin_trgm_ops)'
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_users_name_trgm')
+        op.execute('DROP INDEX IF EXISTS ix_users_email_lower_pattern')
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -0,0 +1,51 @@
+"""Rollup-таблицы продаж sales_daily и sales_daily_product
+
+После применения заполните историю: python scripts/sales_rollups.py backfill
+
+Revision ID: 0003_sales_rollups
+Revises: 0002_user_search_indexes
+Create Date: 2026-10-19 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_sales_rollups'
+down_revision: Union[str, None] = '0002_user_search_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sales_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('orders_count', sa.Integer(), nullable=False),
+        sa.Column('units', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('day'),
+    )
+    op.create_table(
+        'sales_daily_product',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('orders_count', sa.Integer(), nullable=False),
+        sa.Column('units', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('day', 'product_id'),
+    )
+    op.create_index('ix_sales_daily_product_product_day', 'sales_daily_product', ['product_id', 'day'])
+    op.create_index('ix_sales_daily_product_category_day', 'sales_daily_product', ['category_id', 'day'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sales_daily_product_category_day', table_name='sales_daily_product')
+    op.drop_index('ix_sales_daily_product_product_day', table_name='sales_daily_product')
+    op.drop_table('sales_daily_product')
+    op.drop_table('sales_daily')
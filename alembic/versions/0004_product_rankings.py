@@ -0,0 +1,46 @@
+"""Затухающие счетчики популярности и предрассчитанные рейтинги товаров
+
+Revision ID: 0004_product_rankings
+Revises: 0003_sales_rollups
+Create Date: 2026-10-19 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_product_rankings'
+down_revision: Union[str, None] = '0003_sales_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_popularity',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('bestseller_score', sa.Float(), nullable=False),
+        sa.Column('trending_score', sa.Float(), nullable=False),
+        sa.Column('units_sold', sa.Integer(), nullable=False),
+        sa.Column('scored_at', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    op.create_table(
+        'product_rankings',
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('kind', 'category_id', 'position'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('product_rankings')
+    op.drop_table('product_popularity')
@@ -0,0 +1,60 @@
+"""Счетчики совместных покупок, состояние задач и рекомендации товаров
+
+Revision ID: 0005_also_bought
+Revises: 0004_product_rankings
+Create Date: 2026-10-19 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_also_bought'
+down_revision: Union[str, None] = '0004_product_rankings'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_state',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('last_id', sa.BigInteger(), nullable=False),
+        sa.Column('processed', sa.BigInteger(), nullable=False),
+        sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.create_table(
+        'product_pair_counts',
+        sa.Column('product_a', sa.Integer(), nullable=False),
+        sa.Column('product_b', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('product_a', 'product_b'),
+    )
+    op.create_index('ix_product_pair_counts_b_a', 'product_pair_counts', ['product_b', 'product_a'])
+    op.create_table(
+        'product_basket_counts',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('baskets', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    op.create_table(
+        'product_recommendations',
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('recommended_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('kind', 'product_id', 'position'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('product_recommendations')
+    op.drop_table('product_basket_counts')
+    op.drop_index('ix_product_pair_counts_b_a', table_name='product_pair_counts')
+    op.drop_table('product_pair_counts')
+    op.drop_table('job_state')
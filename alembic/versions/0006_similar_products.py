@@ -0,0 +1,37 @@
+"""Очередь пересчета похожих товаров и индекс обратных ссылок рекомендаций
+
+Revision ID: 0006_similar_products
+Revises: 0005_also_bought
+Create Date: 2026-10-19 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_similar_products'
+down_revision: Union[str, None] = '0005_also_bought'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_similarity_queue',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('queued_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    op.create_index(
+        'ix_product_recommendations_kind_recommended',
+        'product_recommendations',
+        ['kind', 'recommended_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_recommendations_kind_recommended', table_name='product_recommendations')
+    op.drop_table('product_similarity_queue')
@@ -0,0 +1,32 @@
+"""Индекс истории заказов пользователя (user_id, created_at DESC)
+
+Revision ID: 0007_orders_user_created_index
+Revises: 0006_similar_products
+Create Date: 2026-10-19 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.migrate import create_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_orders_user_created_index'
+down_revision: Union[str, None] = '0006_similar_products'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently(
+        'ix_orders_user_id_created_at',
+        'orders',
+        ['user_id', sa.text('created_at DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_user_id_created_at', table_name='orders')
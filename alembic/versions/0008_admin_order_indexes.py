@@ -0,0 +1,40 @@
+"""Покрывающие индексы списка заказов администратора
+
+Revision ID: 0008_admin_order_indexes
+Revises: 0007_orders_user_created_index
+Create Date: 2026-10-19 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.migrate import create_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_admin_order_indexes'
+down_revision: Union[str, None] = '0007_orders_user_created_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently(
+        'ix_orders_status_created_at_id',
+        'orders',
+        ['status', sa.text('created_at DESC'), sa.text('id DESC')],
+        postgresql_include=['user_id', 'total_amount'],
+    )
+    create_index_concurrently(
+        'ix_orders_created_at_id',
+        'orders',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        postgresql_include=['user_id', 'status', 'total_amount'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_created_at_id', table_name='orders')
+    op.drop_index('ix_orders_status_created_at_id', table_name='orders')
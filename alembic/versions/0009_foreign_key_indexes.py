@@ -0,0 +1,98 @@
+"""Индексы внешних ключей по запросам эндпоинтов и уникальность корзины и отзывов
+
+Корзина и отзывы хранят одну строку на (user_id, product_id). Перед созданием
+уникальных индексов дубликаты схлопываются: количества в корзине суммируются
+в строку с наименьшим id, из отзывов остается последний. Если дубликат
+появился во время построения индекса, схлопывание и построение повторяются.
+
+Удаление более старых отзывов пользователя к тому же товару - потеря
+пользовательского контента: перед удалением строки копируются в таблицу
+reviews_dedupe_backup (создается, только если дубликаты есть, и не удаляется
+при откате), а их число пишется в лог.
+
+Revision ID: 0009_foreign_key_indexes
+Revises: 0008_admin_order_indexes
+Create Date: 2026-10-19 17:00:00
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.migrate import create_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_foreign_key_indexes'
+down_revision: Union[str, None] = '0008_admin_order_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+REVIEWS_BACKUP_TABLE = 'reviews_dedupe_backup'
+
+# Все отзывы пары (user_id, product_id), кроме последнего
+DUPLICATE_REVIEWS = (
+    'FROM reviews WHERE id NOT IN ('
+    '    SELECT MAX(id) FROM reviews GROUP BY user_id, product_id'
+    ')'
+)
+
+
+def _dedupe_cart_items() -> None:
+    op.execute(
+        'UPDATE cart_items SET quantity = ('
+        '    SELECT SUM(duplicate.quantity) FROM cart_items AS duplicate'
+        '    WHERE duplicate.user_id = cart_items.user_id AND duplicate.product_id = cart_items.product_id'
+        ') WHERE id IN ('
+        '    SELECT MIN(id) FROM cart_items GROUP BY user_id, product_id HAVING COUNT(*) > 1'
+        ')'
+    )
+    op.execute(
+        'DELETE FROM cart_items WHERE id NOT IN ('
+        '    SELECT MIN(id) FROM cart_items GROUP BY user_id, product_id'
+        ')'
+    )
+
+
+def _dedupe_reviews() -> None:
+    bind = op.get_bind()
+    if not bind.execute(sa.text(f'SELECT COUNT(*) {DUPLICATE_REVIEWS}')).scalar():
+        return
+    op.execute(f'CREATE TABLE IF NOT EXISTS {REVIEWS_BACKUP_TABLE} AS SELECT * FROM reviews WHERE 1 = 0')
+    op.execute(f'INSERT INTO {REVIEWS_BACKUP_TABLE} SELECT * {DUPLICATE_REVIEWS}')
+    # Удаляются только сохраненные строки, даже если дубликаты появились после копирования
+    deleted = bind.execute(sa.text(
+        f'DELETE FROM reviews WHERE id IN (SELECT id FROM {REVIEWS_BACKUP_TABLE})'
+    )).rowcount
+    logger.warning(
+        "Deleted %d duplicate reviews (older reviews of the same user and product), copies kept in %s",
+        deleted, REVIEWS_BACKUP_TABLE
+    )
+
+
+def upgrade() -> None:
+    create_index_concurrently(
+        'uq_cart_items_user_product', 'cart_items', ['user_id', 'product_id'], dedupe=_dedupe_cart_items, unique=True
+    )
+    create_index_concurrently('ix_cart_items_product_id', 'cart_items', ['product_id'])
+    create_index_concurrently('ix_order_items_order_id', 'order_items', ['order_id'])
+    create_index_concurrently('ix_order_items_product_id', 'order_items', ['product_id'])
+    create_index_concurrently(
+        'uq_reviews_user_product', 'reviews', ['user_id', 'product_id'], dedupe=_dedupe_reviews, unique=True
+    )
+    create_index_concurrently(
+        'ix_reviews_product_id_created_at', 'reviews', ['product_id', sa.text('created_at DESC')]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reviews_product_id_created_at', table_name='reviews')
+    op.drop_index('uq_reviews_user_product', table_name='reviews')
+    op.drop_index('ix_order_items_product_id', table_name='order_items')
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_cart_items_product_id', table_name='cart_items')
+    op.drop_index('uq_cart_items_user_product', table_name='cart_items')
@@ -0,0 +1,273 @@
+"""
+Пакетная задача "с этим товаром покупают" по совместным покупкам.
+
+Новые заказы (id больше обработанного в прошлый раз) читаются пачками.
+Id заказа выдается до фиксации его транзакции, поэтому заказ с меньшим id
+может стать видимым позже заказа с большим. Позиция задачи продвигается
+только по заказам старше ALSO_BOUGHT_SETTLE_SECONDS и не дальше первого
+более свежего: за это время транзакция оформления успевает завершиться.
+Для каждой пачки NumPy строит разреженную матрицу совместной встречаемости
+в виде COO-пар (product_a, product_b, count) и прибавляет ее к накопленным
+счетчикам product_pair_counts/product_basket_counts. Память ограничена
+размером пачки, а не всей историей заказов.
+
+Затем для товаров, затронутых новыми заказами, пары оцениваются по lift
+    lift(a, b) = count(a, b) * N / (baskets(a) * baskets(b)),
+где N - число обработанных корзин, и в product_recommendations
+сохраняются top-K соседей.
+
+Отмены уже учтенных заказов счетчики не уменьшают; для полного пересчета
+используйте reset=True (scripts/build_also_bought.py --rebuild).
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Order, OrderItem, OrderStatus, ProductBasketCount, ProductPairCount
+from app.recommendations import get_job_state, mark_job_run, replace_recommendations
+from app.utils import dialect_insert
+
+JOB_NAME = "also_bought"
+KIND = "also_bought"
+
+# Размер пачки товаров при пересчете соседей
+NEIGHBOUR_BATCH_SIZE = 500
+
+
+def count_cooccurrences(
+    order_ids: np.ndarray,
+    product_ids: np.ndarray,
+    max_basket: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Считает совместную встречаемость товаров в корзинах пачки
+
+    Аргументы:
+        order_ids, product_ids: Позиции заказов (повторы товара в заказе допустимы)
+        max_basket: Корзины с большим числом разных товаров пропускаются
+
+    Возвращает:
+        (товары, число корзин с товаром, product_a, product_b, число корзин с парой, число корзин)
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if len(order_ids) == 0:
+        return empty, empty, empty, empty, empty, 0
+
+    order = np.lexsort((product_ids, order_ids))
+    orders = np.asarray(order_ids, dtype=np.int64)[order]
+    products = np.asarray(product_ids, dtype=np.int64)[order]
+
+    # Товар учитывается в корзине один раз
+    unique = np.ones(len(orders), dtype=bool)
+    unique[1:] = (orders[1:] != orders[:-1]) | (products[1:] != products[:-1])
+    orders, products = orders[unique], products[unique]
+
+    starts = np.flatnonzero(np.r_[True, orders[1:] != orders[:-1]])
+    sizes = np.diff(np.r_[starts, len(orders)])
+    keep = np.repeat(sizes <= max_basket, sizes)
+    products = products[keep]
+    sizes = sizes[sizes <= max_basket]
+    baskets = len(sizes)
+    if baskets == 0:
+        return empty, empty, empty, empty, empty, 0
+
+    items, item_counts = np.unique(products, return_counts=True)
+
+    # Каждый элемент корзины образует пары со всеми следующими за ним элементами той же корзины;
+    # товары внутри корзины отсортированы, поэтому product_a < product_b
+    ends = np.repeat(np.cumsum(sizes), sizes)
+    index = np.arange(len(products))
+    later = ends - index - 1
+    left = np.repeat(index, later)
+    right = left + 1 + np.arange(len(left)) - np.repeat(np.cumsum(later) - later, later)
+
+    width = int(products.max()) + 1
+    pair_keys, pair_counts = np.unique(products[left] * width + products[right], return_counts=True)
+    return items, item_counts, pair_keys // width, pair_keys % width, pair_counts, baskets
+
+
+def _add_counts(db: Session, items, item_counts, product_a, product_b, pair_counts) -> None:
+    """Прибавляет счетчики пачки к накопленным через upsert"""
+    baskets_table = ProductBasketCount.__table__
+    stmt = dialect_insert(db, baskets_table)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["product_id"],
+            set_={"baskets": baskets_table.c.baskets + stmt.excluded.baskets}
+        ),
+        [{"product_id": int(p), "baskets": int(c)} for p, c in zip(items, item_counts)]
+    )
+
+    if len(pair_counts):
+        pairs_table = ProductPairCount.__table__
+        stmt = dialect_insert(db, pairs_table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["product_a", "product_b"],
+                set_={"count": pairs_table.c.count + stmt.excluded.count}
+            ),
+            [
+                {"product_a": int(a), "product_b": int(b), "count": int(c)}
+                for a, b, c in zip(product_a, product_b, pair_counts)
+            ]
+        )
+
+
+def top_neighbours(
+    sources: np.ndarray,
+    targets: np.ndarray,
+    counts: np.ndarray,
+    source_baskets: np.ndarray,
+    target_baskets: np.ndarray,
+    total_baskets: int,
+    top_k: int
+) -> Dict[int, List[Tuple[int, float]]]:
+    """Оценивает направленные пары по lift и оставляет top_k соседей каждого товара"""
+    lift = counts * float(total_baskets) / (source_baskets * target_baskets)
+    order = np.lexsort((targets, -counts, -lift, sources))
+    sources, targets, lift = sources[order], targets[order], lift[order]
+
+    starts = np.flatnonzero(np.r_[True, sources[1:] != sources[:-1]])
+    rank = np.arange(len(sources)) - np.repeat(starts, np.diff(np.r_[starts, len(sources)]))
+    keep = rank < top_k
+
+    neighbours: Dict[int, List[Tuple[int, float]]] = {}
+    for source, target, score in zip(sources[keep], targets[keep], lift[keep]):
+        neighbours.setdefault(int(source), []).append((int(target), float(score)))
+    return neighbours
+
+
+def refresh_neighbours(db: Session, product_ids: List[int], total_baskets: int) -> int:
+    """Пересчитывает списки соседей для товаров пачками; возвращает число записанных строк"""
+    written = 0
+    min_support = settings.ALSO_BOUGHT_MIN_SUPPORT
+    for start in range(0, len(product_ids), NEIGHBOUR_BATCH_SIZE):
+        batch = product_ids[start:start + NEIGHBOUR_BATCH_SIZE]
+        rows = db.execute(
+            select(ProductPairCount.product_a, ProductPairCount.product_b, ProductPairCount.count)
+            .where(
+                or_(ProductPairCount.product_a.in_(batch), ProductPairCount.product_b.in_(batch)),
+                ProductPairCount.count >= min_support
+            )
+        ).all()
+
+        batch_set = set(batch)
+        sources, targets, counts = [], [], []
+        for product_a, product_b, count in rows:
+            if product_a in batch_set:
+                sources.append(product_a)
+                targets.append(product_b)
+                counts.append(count)
+            if product_b in batch_set:
+                sources.append(product_b)
+                targets.append(product_a)
+                counts.append(count)
+
+        neighbours = {product_id: [] for product_id in batch}
+        if sources:
+            involved = set(sources) | set(targets)
+            baskets = dict(db.execute(
+                select(ProductBasketCount.product_id, ProductBasketCount.baskets)
+                .where(ProductBasketCount.product_id.in_(involved))
+            ).all())
+            sources = np.array(sources, dtype=np.int64)
+            targets = np.array(targets, dtype=np.int64)
+            neighbours.update(top_neighbours(
+                sources,
+                targets,
+                np.array(counts, dtype=np.float64),
+                np.array([baskets[p] for p in sources.tolist()], dtype=np.float64),
+                np.array([baskets[p] for p in targets.tolist()], dtype=np.float64),
+                total_baskets,
+                settings.RECOMMENDATION_TOP_K,
+            ))
+
+        written += replace_recommendations(db, KIND, neighbours)
+        db.commit()
+    return written
+
+
+def build_also_bought(
+    db: Session,
+    chunk_orders: Optional[int] = None,
+    reset: bool = False,
+    refresh_all: bool = False
+) -> dict:
+    """
+    Обрабатывает заказы, созданные после прошлого запуска, и обновляет рекомендации
+
+    Аргументы:
+        db: Сессия БД
+        chunk_orders: Заказов в одной пачке (по умолчанию ALSO_BOUGHT_CHUNK_ORDERS)
+        reset: Сбросить накопленные счетчики и обработать всю историю заново
+        refresh_all: Пересчитать соседей всех товаров, а не только затронутых
+
+    Возвращает:
+        Отчет: orders, baskets, products_refreshed, rows_written
+    """
+    chunk_orders = chunk_orders or settings.ALSO_BOUGHT_CHUNK_ORDERS
+    state = get_job_state(db, JOB_NAME)
+    if reset:
+        db.execute(delete(ProductPairCount))
+        db.execute(delete(ProductBasketCount))
+        state.last_id = 0
+        state.processed = 0
+        db.commit()
+
+    # Заказы не новее cutoff и с id меньше первого более свежего заказа
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.ALSO_BOUGHT_SETTLE_SECONDS)
+    first_unsettled = db.execute(
+        select(func.min(Order.id)).where(Order.id > state.last_id, Order.created_at >= cutoff)
+    ).scalar()
+    settled = [Order.created_at < cutoff]
+    if first_unsettled is not None:
+        settled.append(Order.id < first_unsettled)
+
+    touched: Set[int] = set()
+    orders_seen = baskets_added = 0
+    while True:
+        order_ids = list(db.execute(
+            select(Order.id)
+            .where(Order.id > state.last_id, Order.status != OrderStatus.CANCELLED, *settled)
+            .order_by(Order.id)
+            .limit(chunk_orders)
+        ).scalars())
+        if not order_ids:
+            break
+
+        rows = db.execute(
+            select(OrderItem.order_id, OrderItem.product_id).where(OrderItem.order_id.in_(order_ids))
+        ).all()
+        items, item_counts, product_a, product_b, pair_counts, baskets = count_cooccurrences(
+            np.array([row[0] for row in rows], dtype=np.int64),
+            np.array([row[1] for row in rows], dtype=np.int64),
+            settings.ALSO_BOUGHT_MAX_BASKET,
+        )
+        if baskets:
+            _add_counts(db, items, item_counts, product_a, product_b, pair_counts)
+            touched.update(items.tolist())
+
+        # Счетчики и позиция задачи фиксируются одной транзакцией: повторный запуск не задвоит пачку
+        state.last_id = order_ids[-1]
+        state.processed += baskets
+        db.commit()
+        orders_seen += len(order_ids)
+        baskets_added += baskets
+
+    if refresh_all:
+        touched = set(db.execute(select(ProductBasketCount.product_id)).scalars())
+
+    written = refresh_neighbours(db, sorted(touched), state.processed) if state.processed else 0
+    mark_job_run(state)
+    db.commit()
+    return {
+        "orders": orders_seen,
+        "baskets": baskets_added,
+        "products_refreshed": len(touched),
+        "rows_written": written,
+    }
@@ -0,0 +1,297 @@
+"""
+Аналитика продаж на rollup-таблицах.
+
+sales_daily и sales_daily_product обновляются инкрементально в транзакции
+оформления заказа и при отмене/восстановлении заказа, поэтому отчеты читают
+несколько строк на день вместо агрегации всей истории orders/order_items.
+Для исторических данных есть пересчет (backfill_sales) и сверка с исходными
+таблицами (check_sales_consistency), см. scripts/sales_rollups.py.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Category, Order, OrderItem, OrderStatus, Product, SalesDaily, SalesDailyProduct
+from app.utils import dialect_insert
+
+# (product_id, category_id, quantity, price)
+SaleLine = Tuple[int, Optional[int], int, Decimal]
+
+ROLLUP_COLUMNS = ("orders_count", "units", "revenue")
+
+
+def sales_day(created_at: datetime) -> date:
+    """День продажи в UTC; наивные значения (SQLite) считаются UTC"""
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+def _increment(db: Session, table, rows: List[dict], index_elements: List[str]) -> None:
+    """Upsert с прибавлением счетчиков к существующей строке"""
+    stmt = dialect_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: table.c[column] + stmt.excluded[column] for column in ROLLUP_COLUMNS}
+    )
+    db.execute(stmt, rows)
+
+
+def record_order_sales(db: Session, day: date, lines: Iterable[SaleLine], sign: int = 1) -> None:
+    """
+    Добавляет заказ в дневные сводки (sign=1) или вычитает его (sign=-1)
+
+    Аргументы:
+        db: Сессия БД (транзакцию фиксирует вызывающий код)
+        day: День заказа, см. sales_day
+        lines: Позиции заказа (product_id, category_id, quantity, price)
+        sign: 1 для нового заказа, -1 для отмены
+    """
+    by_product = {}
+    for product_id, category_id, quantity, price in lines:
+        row = by_product.setdefault(product_id, {
+            "day": day, "product_id": product_id, "category_id": category_id,
+            "orders_count": sign, "units": 0, "revenue": Decimal("0.00"),
+        })
+        row["units"] += sign * quantity
+        row["revenue"] += sign * price * quantity
+    if not by_product:
+        return
+
+    products = list(by_product.values())
+    _increment(db, SalesDailyProduct.__table__, products, ["day", "product_id"])
+    _increment(db, SalesDaily.__table__, [{
+        "day": day,
+        "orders_count": sign,
+        "units": sum(row["units"] for row in products),
+        "revenue": sum(row["revenue"] for row in products),
+    }], ["day"])
+
+
+def record_order_status_change(db: Session, order: Order, previous_status: OrderStatus) -> None:
+    """Вычитает заказ из сводок при отмене и возвращает при снятии отмены"""
+    was_cancelled = previous_status == OrderStatus.CANCELLED
+    is_cancelled = order.status == OrderStatus.CANCELLED
+    if was_cancelled == is_cancelled:
+        return
+
+    lines = db.execute(
+        select(OrderItem.product_id, Product.category_id, OrderItem.quantity, OrderItem.price)
+        .join(Product, Product.id == OrderItem.product_id)
+        .where(OrderItem.order_id == order.id)
+    ).all()
+    record_order_sales(db, sales_day(order.created_at), lines, sign=-1 if is_cancelled else 1)
+
+
+def record_orders_cancelled(db: Session, order_ids: List[int], chunk_size: int = 1000) -> None:
+    """
+    Вычитает из сводок отмененные заказы одним upsert на пачку заказов
+    (для массовой смены статуса; транзакцию фиксирует вызывающий код)
+    """
+    for start in range(0, len(order_ids), chunk_size):
+        rows = db.execute(
+            select(Order.id, Order.created_at, OrderItem.product_id, Product.category_id,
+                   OrderItem.quantity, OrderItem.price)
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .join(Product, Product.id == OrderItem.product_id)
+            .where(Order.id.in_(order_ids[start:start + chunk_size]))
+        ).all()
+
+        products, days = {}, {}
+        for order_id, created_at, product_id, category_id, quantity, price in rows:
+            day = sales_day(created_at)
+            product_row = products.setdefault((day, product_id), {
+                "day": day, "product_id": product_id, "category_id": category_id,
+                "orders": set(), "units": 0, "revenue": Decimal("0.00"),
+            })
+            day_row = days.setdefault(day, {"day": day, "orders": set(), "units": 0, "revenue": Decimal("0.00")})
+            for row in (product_row, day_row):
+                row["orders"].add(order_id)
+                row["units"] -= quantity
+                row["revenue"] -= price * quantity
+        if not days:
+            continue
+
+        for row in (*products.values(), *days.values()):
+            row["orders_count"] = -len(row.pop("orders"))
+        _increment(db, SalesDailyProduct.__table__, list(products.values()), ["day", "product_id"])
+        _increment(db, SalesDaily.__table__, list(days.values()), ["day"])
+
+
+def _day_range(date_from: date, date_to: date):
+    """Условия на created_at для полуинтервала UTC [date_from, date_to + 1 день)"""
+    start = datetime.combine(date_from, datetime.min.time(), tzinfo=timezone.utc)
+    end = datetime.combine(date_to + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    return Order.created_at >= start, Order.created_at < end
+
+
+def _order_day(db: Session):
+    """
+    День заказа в UTC в SQL, как у sales_day. В PostgreSQL date(created_at)
+    берет день в часовом поясе сессии, поэтому момент сначала переводится в UTC;
+    SQLite хранит наивные значения в UTC.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date(func.timezone("UTC", Order.created_at))
+    return func.date(Order.created_at)
+
+
+def _source_product_select(db: Session, date_from: date, date_to: date):
+    """Агрегат продаж по дню и товару из исходных таблиц"""
+    day = _order_day(db)
+    return (
+        select(
+            day.label("day"),
+            OrderItem.product_id,
+            Product.category_id,
+            func.count(func.distinct(Order.id)).label("orders_count"),
+            func.sum(OrderItem.quantity).label("units"),
+            func.sum(OrderItem.price * OrderItem.quantity).label("revenue"),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .join(Product, Product.id == OrderItem.product_id)
+        .where(Order.status != OrderStatus.CANCELLED, *_day_range(date_from, date_to))
+        .group_by(day, OrderItem.product_id, Product.category_id)
+    )
+
+
+def _source_daily_select(db: Session, date_from: date, date_to: date):
+    """Агрегат продаж по дню из исходных таблиц"""
+    day = _order_day(db)
+    return (
+        select(
+            day.label("day"),
+            func.count(func.distinct(Order.id)).label("orders_count"),
+            func.sum(OrderItem.quantity).label("units"),
+            func.sum(OrderItem.price * OrderItem.quantity).label("revenue"),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(Order.status != OrderStatus.CANCELLED, *_day_range(date_from, date_to))
+        .group_by(day)
+    )
+
+
+def order_date_bounds(db: Session) -> Tuple[Optional[date], Optional[date]]:
+    """Дни первого и последнего заказа"""
+    first, last = db.execute(select(func.min(Order.created_at), func.max(Order.created_at))).one()
+    if first is None:
+        return None, None
+    return sales_day(first), sales_day(last)
+
+
+def backfill_sales(db: Session, date_from: date, date_to: date, chunk_days: int = 31) -> int:
+    """
+    Пересчитывает сводки за период из orders/order_items
+
+    Каждые chunk_days дней пересчитываются отдельной транзакцией:
+    строки сводок за период удаляются и вставляются заново через INSERT ... SELECT.
+
+    Возвращает:
+        Количество пересчитанных дней с продажами
+    """
+    days = 0
+    start = date_from
+    while start <= date_to:
+        end = min(start + timedelta(days=chunk_days - 1), date_to)
+        db.execute(delete(SalesDailyProduct).where(SalesDailyProduct.day.between(start, end)))
+        db.execute(delete(SalesDaily).where(SalesDaily.day.between(start, end)))
+
+        product_select = _source_product_select(db, start, end)
+        db.execute(insert(SalesDailyProduct).from_select(
+            ["day", "product_id", "category_id", "orders_count", "units", "revenue"], product_select
+        ))
+        result = db.execute(insert(SalesDaily).from_select(
+            ["day", "orders_count", "units", "revenue"], _source_daily_select(db, start, end)
+        ))
+        days += result.rowcount
+        db.commit()
+        start = end + timedelta(days=1)
+    return days
+
+
+def check_sales_consistency(db: Session, date_from: date, date_to: date) -> List[dict]:
+    """
+    Сверяет дневные сводки с агрегатом исходных таблиц
+
+    Возвращает:
+        Расхождения: {"day", "expected": {...}, "actual": {...}}
+    """
+    empty = {column: 0 for column in ROLLUP_COLUMNS}
+    expected = defaultdict(lambda: dict(empty))
+    for row in db.execute(_source_daily_select(db, date_from, date_to)).mappings():
+        expected[str(row["day"])] = {column: row[column] for column in ROLLUP_COLUMNS}
+
+    actual = defaultdict(lambda: dict(empty))
+    rollups = db.execute(select(SalesDaily).where(SalesDaily.day.between(date_from, date_to))).scalars()
+    for row in rollups:
+        actual[str(row.day)] = {column: getattr(row, column) for column in ROLLUP_COLUMNS}
+
+    mismatches = []
+    for day in sorted(set(expected) | set(actual)):
+        left, right = expected[day], actual[day]
+        if any(_money(left[column]) != _money(right[column]) for column in ROLLUP_COLUMNS):
+            mismatches.append({"day": day, "expected": left, "actual": right})
+    return mismatches
+
+
+def _money(value) -> Decimal:
+    # SQLite суммирует Numeric во float: сравнение идет с точностью до копеек
+    return Decimal(str(value)).quantize(Decimal("0.01"))
+
+
+def daily_sales(db: Session, date_from: date, date_to: date) -> list:
+    """Выручка, заказы и единицы по дням"""
+    return db.execute(
+        select(SalesDaily)
+        .where(SalesDaily.day.between(date_from, date_to))
+        .order_by(SalesDaily.day)
+    ).scalars().all()
+
+
+def category_sales(db: Session, date_from: date, date_to: date) -> list:
+    """Выручка и единицы по категориям за период"""
+    return db.execute(
+        select(
+            SalesDailyProduct.category_id,
+            Category.name.label("category_name"),
+            func.sum(SalesDailyProduct.units).label("units"),
+            func.sum(SalesDailyProduct.revenue).label("revenue"),
+        )
+        .outerjoin(Category, Category.id == SalesDailyProduct.category_id)
+        .where(SalesDailyProduct.day.between(date_from, date_to))
+        .group_by(SalesDailyProduct.category_id, Category.name)
+        .order_by(func.sum(SalesDailyProduct.revenue).desc())
+    ).mappings().all()
+
+
+def product_sales(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    category_id: Optional[int] = None,
+    limit: int = 20
+) -> list:
+    """Топ товаров по выручке за период"""
+    stmt = (
+        select(
+            SalesDailyProduct.product_id,
+            Product.name,
+            func.sum(SalesDailyProduct.orders_count).label("orders_count"),
+            func.sum(SalesDailyProduct.units).label("units"),
+            func.sum(SalesDailyProduct.revenue).label("revenue"),
+        )
+        .join(Product, Product.id == SalesDailyProduct.product_id)
+        .where(SalesDailyProduct.day.between(date_from, date_to))
+    )
+    if category_id is not None:
+        stmt = stmt.where(SalesDailyProduct.category_id == category_id)
+    return db.execute(
+        stmt.group_by(SalesDailyProduct.product_id, Product.name)
+        .order_by(func.sum(SalesDailyProduct.revenue).desc())
+        .limit(limit)
+    ).mappings().all()
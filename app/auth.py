@@ -2,12 +2,15 @@
 Утилиты аутентификации для генерации JWT токенов и хеширования паролей
 """
 
+import math
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, HTTPException, Security, status
+from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.config import settings
@@ -33,13 +36,62 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
-def get_password_hash(password: str) -> str:
-    """Хеширует пароль"""
-    salt = bcrypt.gensalt()
+# Наибольшая стоимость bcrypt (log2 числа раундов)
+BCRYPT_MAX_ROUNDS = 31
+
+
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    """Хеширует пароль со стоимостью rounds (по умолчанию BCRYPT_ROUNDS)"""
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Стоимость, с которой создан хеш bcrypt вида $2b$12$..., или None для нераспознанного хеша"""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Хеш создан со стоимостью, отличной от BCRYPT_ROUNDS"""
+    return hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float,
+    min_rounds: int = 10,
+    max_rounds: int = BCRYPT_MAX_ROUNDS,
+    samples: int = 3
+) -> int:
+    """
+    Подбирает стоимость bcrypt под целевое время хеширования на текущем железе
+
+    Время хеширования удваивается с каждым раундом, поэтому оно замеряется
+    на небольшой стоимости и экстраполируется.
+
+    Аргументы:
+        target_ms: Целевое время одного хеширования, мс
+        min_rounds: Нижняя граница стоимости (безопасность важнее целевого времени)
+        max_rounds: Верхняя граница стоимости
+        samples: Число замеров, берется лучший
+
+    Возвращает:
+        Наибольшая стоимость, при которой хеширование укладывается в target_ms
+    """
+    base_rounds = 8
+    salt = bcrypt.gensalt(rounds=base_rounds)
+    best = math.inf
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", salt)
+        best = min(best, (time.perf_counter() - started) * 1000)
+    rounds = base_rounds + math.floor(math.log2(target_ms / max(best, 1e-6)))
+    return max(min_rounds, min(rounds, max_rounds))
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Создает JWT токен доступа"""
     to_encode = data.copy()
@@ -60,12 +112,19 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
 
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    """Аутентифицирует пользователя"""
+    """Аутентифицирует пользователя; хеш с устаревшей стоимостью пересчитывается"""
     user = get_user_by_email(db, email)
     if not user:
         return None
     if not verify_password(password, user.hashed_password):
         return None
+    if needs_rehash(user.hashed_password):
+        # Пароль известен только при входе: хеш переводится на текущую стоимость здесь
+        user.hashed_password = get_password_hash(password)
+        try:
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
     return user
 
 
@@ -114,3 +173,21 @@ async def get_current_admin_user(current_user: User = Depends(get_current_active
         )
     return current_user
 
+
+async def get_optional_admin_user(
+    token: Optional[HTTPAuthorizationCredentials] = Security(HTTPBearer(auto_error=False)),
+    db: Session = Depends(get_db)
+) -> Optional[User]:
+    """Получает администратора если токен предоставлен и валиден, иначе None"""
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    email: str = payload.get("sub")
+    if email:
+        user = get_user_by_email(db, email=email)
+        if user and user.is_admin == 1 and user.is_active == 1:
+            return user
+    return None
@@ -0,0 +1,174 @@
+"""
+Set-based массовые обновления.
+
+Вместо цикла "загрузить объект, setattr, commit" изменения применяются
+немногими UPDATE-запросами в одной транзакции. В PostgreSQL значения
+передаются через UPDATE ... FROM (VALUES ...), в остальных диалектах
+через executemany одного UPDATE.
+"""
+
+from decimal import Decimal
+from itertools import groupby
+from typing import Dict, FrozenSet, List, Tuple
+
+from sqlalchemy import Integer, Numeric, bindparam, case, column, func, literal, select, update, values
+from sqlalchemy.orm import Session
+
+from app.models import Order, OrderStatus, Product
+from app.recommendations import SIMILARITY_FIELDS, enqueue_similarity_refreshes
+
+BULK_PRODUCT_COLUMNS = ("price", "stock", "is_active")
+
+BULK_CHUNK_SIZE = 1000
+
+# Допустимые переходы статуса заказа при массовой смене
+ORDER_STATUS_TRANSITIONS: Dict[OrderStatus, FrozenSet[OrderStatus]] = {
+    OrderStatus.PENDING: frozenset({OrderStatus.CONFIRMED, OrderStatus.CANCELLED}),
+    OrderStatus.CONFIRMED: frozenset({OrderStatus.SHIPPED, OrderStatus.CANCELLED}),
+    OrderStatus.SHIPPED: frozenset({OrderStatus.DELIVERED}),
+    OrderStatus.DELIVERED: frozenset(),
+    OrderStatus.CANCELLED: frozenset(),
+}
+
+_COLUMN_TYPES = {
+    "id": Integer,
+    "price": Numeric(10, 2),
+    "stock": Integer,
+    "is_active": Integer,
+}
+
+
+def _update_group_postgresql(db: Session, fields: Tuple[str, ...], rows: List[dict]) -> List[int]:
+    products = Product.__table__
+    source = values(
+        *[column(name, _COLUMN_TYPES[name]) for name in ("id", *fields)],
+        name="bulk_values"
+    ).data([tuple(row[name] for name in ("id", *fields)) for row in rows])
+
+    stmt = (
+        update(products)
+        .where(products.c.id == source.c.id)
+        .values({**{name: source.c[name] for name in fields}, "updated_at": func.now()})
+        .returning(products.c.id)
+    )
+    return list(db.execute(stmt).scalars())
+
+
+def _update_group_generic(db: Session, fields: Tuple[str, ...], rows: List[dict]) -> List[int]:
+    products = Product.__table__
+    ids = [row["id"] for row in rows]
+    existing = set(db.execute(select(products.c.id).where(products.c.id.in_(ids))).scalars())
+    rows = [row for row in rows if row["id"] in existing]
+    if not rows:
+        return []
+
+    stmt = (
+        update(products)
+        .where(products.c.id == bindparam("_id"))
+        .values({**{name: bindparam(f"_{name}") for name in fields}, "updated_at": func.now()})
+    )
+    db.execute(stmt, [{f"_{name}": value for name, value in row.items()} for row in rows])
+    return [row["id"] for row in rows]
+
+
+def bulk_update_products(db: Session, items: List[Dict]) -> List[int]:
+    """
+    Применяет точечные изменения price/stock/is_active по ID товаров.
+    Записи группируются по набору изменяемых полей: на каждую группу (и пачку
+    до BULK_CHUNK_SIZE строк) выполняется один UPDATE. Товары, у которых
+    меняется is_active, ставятся в очередь пересчета похожих товаров.
+
+    Аргументы:
+        db: Сессия БД (транзакцию фиксирует вызывающий код)
+        items: Словари вида {"id": 1, "price": Decimal("9.99")} без неизменяемых полей
+
+    Возвращает:
+        ID обновленных товаров
+    """
+    update_group = (
+        _update_group_postgresql if db.get_bind().dialect.name == "postgresql" else _update_group_generic
+    )
+
+    def group_key(item: Dict) -> Tuple[str, ...]:
+        return tuple(name for name in BULK_PRODUCT_COLUMNS if name in item)
+
+    updated = []
+    for fields, group in groupby(sorted(items, key=group_key), key=group_key):
+        if not fields:
+            continue
+        group = list(group)
+        for start in range(0, len(group), BULK_CHUNK_SIZE):
+            ids = update_group(db, fields, group[start:start + BULK_CHUNK_SIZE])
+            if SIMILARITY_FIELDS.intersection(fields):
+                enqueue_similarity_refreshes(db, ids)
+            updated += ids
+    return updated
+
+
+def adjust_category_prices(db: Session, category_id: int, percent: Decimal) -> List[int]:
+    """
+    Изменяет цены всех товаров категории на percent процентов одним UPDATE.
+    Цена округляется до копеек и не опускается ниже 0.01.
+
+    Возвращает:
+        ID обновленных товаров
+    """
+    products = Product.__table__
+    factor = Decimal(1) + Decimal(percent) / Decimal(100)
+    new_price = func.round(products.c.price * literal(factor, Numeric(12, 6)), 2)
+    minimum = literal(Decimal("0.01"), Numeric(10, 2))
+
+    stmt = (
+        update(products)
+        .where(products.c.category_id == category_id)
+        .values(price=case((new_price < minimum, minimum), else_=new_price), updated_at=func.now())
+        .returning(products.c.id)
+    )
+    return list(db.execute(stmt).scalars())
+
+
+def order_status_sources(target: OrderStatus) -> List[OrderStatus]:
+    """Статусы, из которых разрешен переход в target"""
+    return [source for source, targets in ORDER_STATUS_TRANSITIONS.items() if target in targets]
+
+
+def bulk_transition_orders(
+    db: Session,
+    order_ids: List[int],
+    target: OrderStatus
+) -> Tuple[List[int], Dict[int, OrderStatus]]:
+    """
+    Переводит заказы в статус target UPDATE-запросами по BULK_CHUNK_SIZE заказов.
+    Проверка перехода входит в WHERE (status IN допустимых источников), поэтому
+    заказ, статус которого успел измениться, не будет переведен.
+
+    Аргументы:
+        db: Сессия БД (транзакцию фиксирует вызывающий код)
+        order_ids: ID заказов без повторов
+        target: Целевой статус
+
+    Возвращает:
+        (ID обновленных заказов, {ID: текущий статус} для заказов с недопустимым переходом)
+    """
+    orders = Order.__table__
+    sources = order_status_sources(target)
+    updated: List[int] = []
+    if sources:
+        for start in range(0, len(order_ids), BULK_CHUNK_SIZE):
+            chunk = order_ids[start:start + BULK_CHUNK_SIZE]
+            stmt = (
+                update(orders)
+                .where(orders.c.id.in_(chunk), orders.c.status.in_(sources))
+                .values(status=target, updated_at=func.now())
+                .returning(orders.c.id)
+            )
+            updated += db.execute(stmt).scalars()
+
+    done = set(updated)
+    rejected: Dict[int, OrderStatus] = {}
+    pending = [order_id for order_id in order_ids if order_id not in done]
+    for start in range(0, len(pending), BULK_CHUNK_SIZE):
+        rejected.update(db.execute(
+            select(orders.c.id, orders.c.status).where(orders.c.id.in_(pending[start:start + BULK_CHUNK_SIZE]))
+        ).all())
+    return updated, rejected
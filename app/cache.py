@@ -0,0 +1,119 @@
+"""
+In-process кэш с TTL для горячих чтений каталога
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from app.config import settings
+
+
+class TTLCache:
+    """
+    Потокобезопасный LRU-кэш с временем жизни записей.
+
+    При ttl <= 0 кэш отключен: чтения всегда промахиваются, записи игнорируются.
+    Счетчики hits/misses накапливаются с запуска процесса (метрики, app/metrics.py).
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Возвращает значение по ключу или None, если его нет или оно устарело"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Возвращает словарь найденных актуальных значений для набора ключей"""
+        keys = list(keys)
+        if not self.enabled:
+            self.misses += len(keys)
+            return {}
+
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at <= now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                found[key] = value
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Сохраняет значение"""
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[Hashable, Any]) -> None:
+        """Сохраняет несколько значений, вытесняя самые давние при переполнении"""
+        if not self.enabled or not items:
+            return
+
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Удаляет значение по ключу"""
+        self.delete_many([key])
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        """Удаляет значения по набору ключей"""
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Полностью очищает кэш"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Кэш сериализованных товаров (ProductResponse) по ID
+product_cache = TTLCache(
+    ttl=settings.PRODUCT_CACHE_TTL,
+    max_entries=settings.PRODUCT_CACHE_MAX_ENTRIES
+)
+
+# Кэш категорий (CategoryResponse) по ID
+category_cache = TTLCache(
+    ttl=settings.CATEGORY_CACHE_TTL,
+    max_entries=settings.CATEGORY_CACHE_MAX_ENTRIES
+)
+
+# Кэш рейтингов товаров (списки ID) по (вид, категория)
+ranking_cache = TTLCache(
+    ttl=settings.RANKING_CACHE_TTL,
+    max_entries=settings.CATEGORY_CACHE_MAX_ENTRIES
+)
+
+# Кэш рекомендаций (списки ID) по (вид, ID товара)
+recommendation_cache = TTLCache(
+    ttl=settings.RECOMMENDATION_CACHE_TTL,
+    max_entries=settings.PRODUCT_CACHE_MAX_ENTRIES
+)
@@ -12,17 +12,100 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str = "5432"
     POSTGRES_DB: str = "myapp"
     
+    # Реплика только для чтения: ее используют узлы, роль которых не изменяет данные
+    POSTGRES_READ_HOST: Optional[str] = None
+    
     DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    
+    # Роль развертывания: all или роутеры через запятую (admin, auth, catalog, cart, orders, reviews)
+    DEPLOY_ROLE: str = "all"
+    
+    # Запуск (app/startup.py): проверка схемы require|warn|off, прогрев пула, заполнение кэшей
+    STARTUP_SCHEMA_CHECK: str = "require"
+    DB_POOL_WARMUP: int = 5
+    STARTUP_PRIME_CACHES: bool = True
     
     SECRET_KEY: str = "your-secret-key-change-this-in-production-please-make-it-secure"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Стоимость bcrypt (4-31); подобрать под железо: python scripts/calibrate_bcrypt.py
+    BCRYPT_ROUNDS: int = 12
     
     # Первый администратор (создается при запуске, если нет администраторов)
     FIRST_ADMIN_EMAIL: Optional[str] = None
     FIRST_ADMIN_PASSWORD: Optional[str] = None
     FIRST_ADMIN_NAME: Optional[str] = None
     
+    # Кэш товаров и пакетное чтение
+    PRODUCT_CACHE_TTL: int = 60
+    PRODUCT_CACHE_MAX_ENTRIES: int = 10000
+    PRODUCT_BATCH_MAX_SIZE: int = 100
+    CATEGORY_CACHE_TTL: int = 300
+    CATEGORY_CACHE_MAX_ENTRIES: int = 1000
+    
+    # Массовый импорт товаров
+    PRODUCT_IMPORT_CHUNK_SIZE: int = 1000
+    PRODUCT_IMPORT_MAX_ERRORS: int = 1000
+    PRODUCT_BULK_MAX_ITEMS: int = 10000
+    ORDER_BULK_MAX_ITEMS: int = 10000
+    
+    # Рейтинги товаров: период полураспада счетчиков и размер списков
+    BESTSELLER_HALF_LIFE_DAYS: float = 30
+    TRENDING_HALF_LIFE_DAYS: float = 3
+    RANKING_SIZE: int = 50
+    RANKING_CACHE_TTL: int = 300
+    
+    # Рекомендации "с этим товаром покупают"
+    RECOMMENDATION_TOP_K: int = 20
+    RECOMMENDATION_CACHE_TTL: int = 600
+    ALSO_BOUGHT_MIN_SUPPORT: int = 2
+    ALSO_BOUGHT_CHUNK_ORDERS: int = 5000
+    ALSO_BOUGHT_MAX_BASKET: int = 50
+    # Заказы моложе этого (секунды) ждут следующего запуска: их транзакции могли не завершиться
+    ALSO_BOUGHT_SETTLE_SECONDS: int = 600
+    
+    # Похожие товары (TF-IDF)
+    SIMILAR_MAX_DF: float = 0.5
+    SIMILAR_NAME_WEIGHT: int = 2
+    SIMILAR_CATEGORY_WEIGHT: float = 1.0
+    SIMILAR_BLOCK_CELLS: int = 8_000_000
+    
+    # Миграции при развертывании (app/migrate.py)
+    MIGRATION_LOCK_KEY: int = 727_001
+    MIGRATION_LOCK_TIMEOUT_MS: int = 5000
+    MIGRATION_STATEMENT_TIMEOUT_MS: int = 900_000
+    MIGRATION_RETRIES: int = 5
+    MIGRATION_RETRY_DELAY: float = 2.0
+    MIGRATION_WAIT_TIMEOUT: int = 900
+    MIGRATION_POLL_INTERVAL: float = 2.0
+    
+    # Production-сервер (app/serve.py): воркеры, бюджет соединений с БД, перезапуск воркеров
+    SERVE_BIND: str = "0.0.0.0:8000"
+    SERVE_WORKERS: Optional[int] = None
+    SERVE_WORKERS_PER_CORE: float = 1.0
+    SERVE_MAX_WORKERS: int = 16
+    SERVE_DB_CONNECTIONS: int = 40
+    SERVE_MAX_REQUESTS: int = 10000
+    SERVE_MAX_REQUESTS_JITTER: int = 1000
+    SERVE_TIMEOUT: int = 60
+    SERVE_GRACEFUL_TIMEOUT: int = 30
+    SERVE_KEEPALIVE: int = 5
+    
+    # Ограничение частоты запросов (app/ratelimit.py): токенов в секунду и объем корзины
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_RATE: float = 20
+    RATE_LIMIT_BURST: float = 100
+    RATE_LIMIT_AUTH_RATE: float = 0.2
+    RATE_LIMIT_AUTH_BURST: float = 10
+    RATE_LIMIT_TRUSTED_PROXIES: int = 0
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_BACKEND: str = "app.ratelimit:MemoryBackend"
+    
+    # Метрики Prometheus (app/metrics.py) на /metrics
+    METRICS_ENABLED: bool = True
+    
     # Настройки CORS
     CORS_ORIGINS: str = "http://localhost:3000,https://localhost:3000,http://localhost:5173,https://localhost:5173,http://localhost:8080,https://localhost:8080,http://localhost:4200,https://localhost:4200,http://localhost:5174,https://localhost:5174"
     
@@ -34,6 +117,16 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
     
+    @property
+    def DATABASE_READ_URL(self) -> Optional[str]:
+        """URL реплики только для чтения, если задан POSTGRES_READ_HOST"""
+        if not self.POSTGRES_READ_HOST:
+            return None
+        return (
+            f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_READ_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+    
     model_config = ConfigDict(
         env_file=".env",
         case_sensitive=True
@@ -1,11 +1,20 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.config import settings
+from app.metrics import instrument_engine
+from app.routers import is_read_only_role
+
+# Узлы только для чтения работают с репликой (если задана), а транзакции открываются как READ ONLY
+read_only = is_read_only_role(settings.DEPLOY_ROLE)
 
 engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DB_ECHO
+    (read_only and settings.DATABASE_READ_URL) or settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    connect_args={"options": "-c default_transaction_read_only=on"} if read_only else {}
 )
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -0,0 +1,80 @@
+"""
+Потоковый экспорт каталога товаров в CSV и JSON Lines.
+
+Строки читаются курсором на стороне сервера (yield_per/stream_results) и
+сразу кодируются пачками, поэтому память не зависит от размера каталога.
+Колонки совместимы с импортом (app/importer.py): категория выгружается
+и по ID, и по имени.
+"""
+
+import csv
+import io
+import json
+from typing import Iterator, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Category, Product
+
+EXPORT_COLUMNS = (
+    "id", "sku", "name", "description", "price", "stock", "category_id", "category",
+    "image_url", "is_active", "created_at", "updated_at"
+)
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+
+def export_select(filters: list):
+    """SELECT товаров с именем категории через join под условиями списка товаров"""
+    products = Product.__table__
+    categories = Category.__table__
+    columns = [
+        categories.c.name.label("category") if column == "category" else products.c[column]
+        for column in EXPORT_COLUMNS
+    ]
+    return (
+        select(*columns)
+        .select_from(products.outerjoin(categories, categories.c.id == products.c.category_id))
+        .where(*filters)
+        .order_by(products.c.id)
+    )
+
+
+def _iter_batches(db: Session, filters: list, batch_size: int) -> Iterator[List[tuple]]:
+    """Читает строки курсором на стороне сервера пачками по batch_size"""
+    result = db.execute(export_select(filters).execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield partition
+
+
+def iter_csv(db: Session, filters: list, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """Кодирует товары в CSV с заголовком пачками строк"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in _iter_batches(db, filters, batch_size):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_jsonl(db: Session, filters: list, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """Кодирует товары в JSON Lines пачками строк"""
+    dumps = json.JSONEncoder(default=_json_default, ensure_ascii=False).encode
+    for batch in _iter_batches(db, filters, batch_size):
+        yield "".join(dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in batch)
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
@@ -0,0 +1,278 @@
+"""
+Массовый импорт товаров из потоков CSV и JSON Lines.
+
+Строки читаются потоково и валидируются пачками схемой ProductCreate.
+Категории разрешаются по заранее загруженной карте имя -> ID.
+Пачки записываются upsert'ом по sku: в PostgreSQL через COPY во временную
+таблицу и INSERT ... ON CONFLICT, в остальных диалектах через executemany.
+У существующего товара обновляются только колонки, заданные в строке:
+отсутствующие и пустые значения (в том числе is_active) не затирают
+описание, категорию и снятие с продажи, сделанные вне фида.
+Новые товары и товары, у которых строка задает поля текста или активность,
+ставятся в очередь пересчета похожих товаров в транзакции пачки.
+"""
+
+import codecs
+import csv
+import io
+import json
+import time
+from collections import defaultdict
+from itertools import islice
+from typing import BinaryIO, Dict, FrozenSet, Iterable, Iterator, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Category, Product
+from app.recommendations import SIMILARITY_FIELDS, enqueue_similarity_refreshes
+from app.schemas import ProductCreate
+from app.utils import dialect_insert
+
+IMPORT_COLUMNS = ("sku", "name", "description", "price", "stock", "category_id", "image_url", "is_active")
+
+# Колонки, которые может обновить строка при совпадении sku
+UPSERT_COLUMNS = tuple(column for column in IMPORT_COLUMNS if column != "sku")
+
+# Запись для вставки и колонки, заданные в строке фида
+ImportRecord = Tuple[dict, FrozenSet[str]]
+
+STAGING_TABLE = "product_import_staging"
+
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """Потоково читает CSV с заголовком, пустые значения считаются отсутствующими"""
+    reader = csv.DictReader(codecs.getreader("utf-8-sig")(stream))
+    for number, row in enumerate(reader, start=1):
+        yield number, {key.strip(): value for key, value in row.items() if key and value not in (None, "")}
+
+
+def iter_jsonl_rows(stream: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """Потоково читает JSON Lines; некорректные строки передаются дальше как ошибки"""
+    number = 0
+    for line in codecs.getreader("utf-8-sig")(stream):
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, {"__error__": f"Invalid JSON: {e.msg}"}
+            continue
+        if not isinstance(row, dict):
+            yield number, {"__error__": "Row must be a JSON object"}
+            continue
+        yield number, row
+
+
+def load_category_map(db: Session) -> Tuple[Dict[str, int], set]:
+    """Загружает карту имя категории -> ID и множество существующих ID одним запросом"""
+    rows = db.execute(select(Category.id, Category.name)).all()
+    return {name: category_id for category_id, name in rows}, {category_id for category_id, _ in rows}
+
+
+def validate_row(row: dict, category_names: Dict[str, int], category_ids: set) -> Tuple[ImportRecord, List[str]]:
+    """
+    Проверяет строку фида
+
+    Возвращает:
+        (запись для вставки со значениями по умолчанию, колонки из строки) или None и список ошибок
+    """
+    if "__error__" in row:
+        return None, [row["__error__"]]
+
+    row = dict(row)
+    category_name = row.pop("category", None)
+    if category_name is not None and "category_id" not in row:
+        if category_name not in category_names:
+            return None, [f"Category not found: {category_name}"]
+        row["category_id"] = category_names[category_name]
+
+    try:
+        product = ProductCreate.model_validate(row)
+    except ValidationError as e:
+        return None, [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()]
+
+    if product.category_id is not None and product.category_id not in category_ids:
+        return None, [f"Category not found: {product.category_id}"]
+
+    columns = frozenset(product.model_fields_set & set(UPSERT_COLUMNS))
+    return (product.model_dump(include=set(IMPORT_COLUMNS)), columns), []
+
+
+def _update_groups(records: List[ImportRecord]) -> List[Tuple[FrozenSet[str], List[dict]]]:
+    """Записи с sku, сгруппированные по набору обновляемых колонок"""
+    groups = defaultdict(list)
+    for record, columns in records:
+        if record["sku"] is not None:
+            groups[columns].append(record)
+    return sorted(groups.items(), key=lambda item: sorted(item[0]))
+
+
+def _write_chunk_postgresql(db: Session, records: List[ImportRecord]) -> List[int]:
+    """COPY пачки во временную таблицу и upsert в products; возвращает ID вставленных товаров без sku"""
+    columns = ", ".join(IMPORT_COLUMNS)
+    db.execute(text(
+        f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ("
+        "sku varchar(64), name varchar(200), description text, price numeric(10, 2), "
+        "stock integer, category_id integer, image_url varchar(500), is_active integer, update_group integer"
+        ") ON COMMIT DROP"
+    ))
+
+    groups = _update_groups(records)
+    group_of = {id(record): index for index, (_, group) in enumerate(groups) for record in group}
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record, _ in records:
+        writer.writerow(
+            ["" if record[column] is None else record[column] for column in IMPORT_COLUMNS]
+            + [group_of.get(id(record), "")]
+        )
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} ({columns}, update_group) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+    for index, (update_columns, _) in enumerate(groups):
+        updates = "".join(f"{column} = EXCLUDED.{column}, " for column in UPSERT_COLUMNS if column in update_columns)
+        db.execute(text(
+            f"INSERT INTO products ({columns}) SELECT {columns} FROM {STAGING_TABLE} "
+            f"WHERE update_group = :group ON CONFLICT (sku) DO UPDATE SET {updates}updated_at = now()"
+        ), {"group": index})
+    return list(db.execute(text(
+        f"INSERT INTO products ({columns}) SELECT {columns} FROM {STAGING_TABLE} WHERE sku IS NULL RETURNING id"
+    )).scalars())
+
+
+def _write_chunk_generic(db: Session, records: List[ImportRecord]) -> List[int]:
+    """Upsert пачки через executemany для диалектов без COPY; возвращает ID вставленных товаров без sku"""
+    for update_columns, group in _update_groups(records):
+        stmt = dialect_insert(db, Product.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sku"],
+            set_={
+                **{column: stmt.excluded[column] for column in UPSERT_COLUMNS if column in update_columns},
+                "updated_at": func.now(),
+            }
+        )
+        db.execute(stmt, group)
+    without_sku = [record for record, _ in records if record["sku"] is None]
+    if not without_sku:
+        return []
+    return list(db.execute(insert(Product.__table__).returning(Product.__table__.c.id), without_sku).scalars())
+
+
+def _similarity_skus(db: Session, records: List[ImportRecord]) -> List[str]:
+    """sku новых товаров и товаров, у которых строка меняет поля похожести"""
+    skus = [record["sku"] for record, _ in records if record["sku"] is not None]
+    if not skus:
+        return []
+    fields = sorted(SIMILARITY_FIELDS)
+    existing = {
+        row.sku: row for row in db.execute(
+            select(Product.sku, *(getattr(Product, field) for field in fields)).where(Product.sku.in_(skus))
+        )
+    }
+    return [
+        record["sku"] for record, columns in records
+        if record["sku"] is not None and (
+            record["sku"] not in existing
+            or any(record[field] != getattr(existing[record["sku"]], field) for field in SIMILARITY_FIELDS & columns)
+        )
+    ]
+
+
+def write_chunk(db: Session, records: List[ImportRecord]) -> None:
+    """Записывает пачку валидных записей и фиксирует транзакцию"""
+    # Повторы sku внутри пачки объединяются: ON CONFLICT не может обновить строку дважды,
+    # поздняя строка перекрывает заданные в ней колонки
+    merged = {}
+    for index, (record, columns) in enumerate(records):
+        key = record["sku"] if record["sku"] is not None else ("row", index)
+        if key in merged:
+            previous, previous_columns = merged[key]
+            record = {**previous, **{column: record[column] for column in columns}}
+            columns = previous_columns | columns
+        merged[key] = (record, columns)
+    records = list(merged.values())
+
+    similarity_skus = _similarity_skus(db, records)
+    if db.get_bind().dialect.name == "postgresql":
+        queued = _write_chunk_postgresql(db, records)
+    else:
+        queued = _write_chunk_generic(db, records)
+    if similarity_skus:
+        queued += db.execute(select(Product.id).where(Product.sku.in_(similarity_skus))).scalars()
+    enqueue_similarity_refreshes(db, queued)
+    db.commit()
+
+
+def import_products(db: Session, rows: Iterable[Tuple[int, dict]], chunk_size: int = None) -> dict:
+    """
+    Импортирует товары из потока строк пачками
+
+    Аргументы:
+        db: Сессия БД
+        rows: Итератор пар (номер строки, словарь значений)
+        chunk_size: Размер пачки валидации и записи
+
+    Возвращает:
+        Отчет: processed, imported, failed, errors, elapsed_seconds, rows_per_second
+    """
+    chunk_size = chunk_size or settings.PRODUCT_IMPORT_CHUNK_SIZE
+    started = time.perf_counter()
+    category_names, category_ids = load_category_map(db)
+
+    processed = imported = failed = 0
+    errors = []
+
+    def report_error(number: int, messages: List[str]):
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.PRODUCT_IMPORT_MAX_ERRORS:
+            errors.append({"row": number, "errors": messages})
+
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        processed += len(chunk)
+
+        records, numbers = [], []
+        for number, row in chunk:
+            record, messages = validate_row(row, category_names, category_ids)
+            if messages:
+                report_error(number, messages)
+            else:
+                records.append(record)
+                numbers.append(number)
+
+        if not records:
+            continue
+        try:
+            write_chunk(db, records)
+            imported += len(records)
+        except Exception as e:
+            db.rollback()
+            message = f"Database error: {str(e).splitlines()[0]}"
+            for number in numbers:
+                report_error(number, [message])
+
+    elapsed = time.perf_counter() - started
+    return {
+        "processed": processed,
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(processed / elapsed, 1) if elapsed > 0 else 0.0,
+    }
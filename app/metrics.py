@@ -0,0 +1,222 @@
+"""
+Метрики Prometheus: HTTP-запросы, запросы к БД, пул соединений и кэши.
+
+MetricsMiddleware (чистый ASGI) считает запросы и их длительность по шаблону
+маршрута (/products/{product_id}), а не по фактическому пути, поэтому число
+меток ограничено числом маршрутов; неизвестные пути идут под route="unmatched",
+нестандартные методы - под method="OTHER". Для каждого запроса события
+SQLAlchemy before/after_cursor_execute накапливают число запросов к БД и их
+суммарное время в контекстной переменной запроса.
+
+Ожидание соединения из пула замеряется в Engine.raw_connection, открытие и
+закрытие соединений - событиями пула. Счетчики кэшей (app/cache.py)
+переносятся в метрики после каждого запроса.
+
+Под gunicorn (app/serve.py) метрики воркеров собираются через
+PROMETHEUS_MULTIPROC_DIR.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client import generate_latest, multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from app.cache import product_cache, category_cache, ranking_cache, recommendation_cache
+
+METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+
+# Запросы, которые не попадают в метрики
+EXCLUDED_PATHS = frozenset({"/metrics", "/health", "/ready"})
+
+CACHES = {
+    "product": product_cache,
+    "category": category_cache,
+    "ranking": ranking_cache,
+    "recommendation": recommendation_cache,
+}
+
+REQUESTS = Counter("http_requests_total", "HTTP requests", ["method", "route", "status"])
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "HTTP request latency", ["method", "route"])
+REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests being served", multiprocess_mode="livesum")
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "HTTP response body size", ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+)
+DB_QUERIES = Histogram(
+    "db_queries_per_request", "Database queries per HTTP request", ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+)
+DB_QUERY_TIME = Histogram(
+    "db_query_seconds_per_request", "Total database query time per HTTP request", ["route"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time waiting for a connection from the pool",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+CONNECTIONS_OPENED = Counter("db_connections_opened_total", "New database connections")
+CONNECTIONS_CLOSED = Counter("db_connections_closed_total", "Closed database connections")
+CACHE_HITS = Counter("cache_hits_total", "Cache hits", ["cache"])
+CACHE_MISSES = Counter("cache_misses_total", "Cache misses", ["cache"])
+CACHE_ENTRIES = Gauge("cache_entries", "Entries in cache", ["cache"], multiprocess_mode="livesum")
+
+
+class RequestStats:
+    """Запросы к БД в рамках одного HTTP-запроса"""
+
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+# Общий изменяемый объект виден и из пула потоков, куда Starlette выносит синхронные эндпоинты
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+# Значения счетчиков кэшей, уже перенесенные в метрики
+_synced_cache_counts = {name: (0, 0) for name in CACHES}
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += time.perf_counter() - started
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # Упавший запрос не доходит до after_cursor_execute
+    if context.connection is not None and context.connection.info.get("query_started"):
+        context.connection.info["query_started"].pop()
+
+
+@event.listens_for(Pool, "connect")
+def _pool_connect(dbapi_connection, connection_record):
+    CONNECTIONS_OPENED.inc()
+
+
+@event.listens_for(Pool, "close")
+def _pool_close(dbapi_connection, connection_record):
+    CONNECTIONS_CLOSED.inc()
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Замеряет ожидание соединения из пула (включая открытие нового) для движка"""
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+    engine.raw_connection = timed_raw_connection
+    return engine
+
+
+def sync_cache_metrics() -> None:
+    """Переносит прирост счетчиков кэшей в метрики"""
+    for name, cache in CACHES.items():
+        hits, misses = cache.hits, cache.misses
+        synced_hits, synced_misses = _synced_cache_counts[name]
+        if hits == synced_hits and misses == synced_misses:
+            continue
+        CACHE_HITS.labels(name).inc(max(0, hits - synced_hits))
+        CACHE_MISSES.labels(name).inc(max(0, misses - synced_misses))
+        CACHE_ENTRIES.labels(name).set(len(cache))
+        _synced_cache_counts[name] = (hits, misses)
+
+
+def route_label(scope: dict) -> str:
+    """Шаблон маршрута, сопоставленного роутером, или unmatched"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware: счетчики, длительность и размер ответов HTTP-запросов, запросы к БД"""
+
+    def __init__(self, app):
+        self.app = app
+        # Дочерние метрики по меткам: labels() с блокировкой и разбором меток дороже самих наблюдений
+        self._route_metrics: Dict[Tuple[str, str], tuple] = {}
+        self._request_counters: Dict[Tuple[str, str, int], Any] = {}
+
+    def route_metrics(self, method: str, route: str) -> tuple:
+        key = (method, route)
+        children = self._route_metrics.get(key)
+        if children is None:
+            children = self._route_metrics[key] = (
+                REQUEST_DURATION.labels(method, route),
+                RESPONSE_SIZE.labels(method, route),
+                DB_QUERIES.labels(route),
+                DB_QUERY_TIME.labels(route),
+            )
+        return children
+
+    def request_counter(self, method: str, route: str, status_code: int):
+        key = (method, route, status_code)
+        counter = self._request_counters.get(key)
+        if counter is None:
+            counter = self._request_counters[key] = REQUESTS.labels(method, route, str(status_code))
+        return counter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            request_stats.reset(token)
+            method = scope["method"] if scope["method"] in METHODS else "OTHER"
+            route = route_label(scope)
+            duration, response_size, db_queries, db_query_time = self.route_metrics(method, route)
+            duration.observe(time.perf_counter() - started)
+            response_size.observe(size)
+            db_queries.observe(stats.queries)
+            db_query_time.observe(stats.query_seconds)
+            self.request_counter(method, route, status_code).inc()
+            sync_cache_metrics()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Текст метрик для /metrics; под gunicorn - сумма по всем воркерам"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,307 @@
+"""
+Применение миграций при развертывании нескольких реплик.
+
+Каждый контейнер при старте запускает `python -m app.migrate`. В PostgreSQL
+мигрирует ровно один экземпляр - тот, кто взял advisory lock; остальные ждут,
+пока версия схемы не станет равна head, и только после этого стартуют сервер.
+Если мигрирующий экземпляр упал, блокировка освобождается и ее берет
+следующий ожидающий.
+
+Соединение миграций работает с lock_timeout и statement_timeout: DDL, который
+не дождался блокировки горячей таблицы, падает быстро, а не выстраивает за
+собой очередь запросов приложения; такие ошибки повторяются с паузой.
+Каждая ревизия выполняется в своей транзакции, поэтому повтор продолжает
+с упавшей ревизии. Индексы на больших таблицах строятся через
+create_index_concurrently вне транзакции.
+
+Миграции идут через собственный движок основной БД (DATABASE_URL) на запись:
+движок приложения узлов только для чтения (DEPLOY_ROLE=catalog) смотрит
+в реплику и открывает транзакции как READ ONLY.
+
+Запуск: python -m app.migrate [--check]
+  --check  - только проверить, что схема в актуальной версии (код 0 или 1)
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.pool import NullPool
+
+from alembic import command, op
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# SQLSTATE lock_not_available: lock_timeout истек в ожидании блокировки
+LOCK_NOT_AVAILABLE = "55P03"
+
+# SQLSTATE unique_violation: в таблице есть дубликаты ключа уникального индекса
+UNIQUE_VIOLATION = "23505"
+
+
+def alembic_config(with_ini: bool = True) -> Config:
+    """Конфигурация Alembic проекта; без ini логирование не перенастраивается"""
+    config = Config(str(PROJECT_ROOT / "alembic.ini")) if with_ini else Config()
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return config
+
+
+def head_revisions(config: Optional[Config] = None) -> Set[str]:
+    """Ревизии head из каталога миграций"""
+    return set(ScriptDirectory.from_config(config or alembic_config(with_ini=False)).get_heads())
+
+
+def current_revisions(connection: Connection) -> Set[str]:
+    """Ревизии, записанные в alembic_version базы"""
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+def schema_is_current(connection: Connection) -> bool:
+    """Схема базы в версии head"""
+    return current_revisions(connection) == head_revisions()
+
+
+def is_lock_timeout(error: DBAPIError) -> bool:
+    """Ошибка вызвана истекшим lock_timeout"""
+    return getattr(error.orig, "pgcode", None) == LOCK_NOT_AVAILABLE
+
+
+def is_unique_violation(error: DBAPIError) -> bool:
+    """Ошибка вызвана дубликатами ключа уникального индекса"""
+    return getattr(error.orig, "pgcode", None) == UNIQUE_VIOLATION
+
+
+def run_with_retries(
+    action: Callable[[], None],
+    on_retry: Callable[[], None],
+    retries: Optional[int] = None,
+    delay: Optional[float] = None,
+    retry_on: Callable[[DBAPIError], bool] = is_lock_timeout
+) -> None:
+    """
+    Выполняет action, повторяя его при ошибках, отобранных retry_on
+
+    Аргументы:
+        action: Шаг миграции
+        on_retry: Подготовка к повтору (откат транзакции)
+        retries: Число повторов (по умолчанию MIGRATION_RETRIES)
+        delay: Начальная пауза в секундах, удваивается с каждой попыткой
+        retry_on: Какие ошибки повторять (по умолчанию истекший lock_timeout)
+
+    Исключения:
+        DBAPIError: Ошибка не повторяется или попытки исчерпаны
+    """
+    retries = settings.MIGRATION_RETRIES if retries is None else retries
+    delay = settings.MIGRATION_RETRY_DELAY if delay is None else delay
+    for attempt in range(retries + 1):
+        try:
+            action()
+            return
+        except DBAPIError as error:
+            if not retry_on(error) or attempt == retries:
+                raise
+            on_retry()
+            pause = delay * 2 ** attempt
+            logger.warning(
+                "Migration step failed with SQLSTATE %s, retry %d/%d in %.1fs",
+                getattr(error.orig, "pgcode", None), attempt + 1, retries, pause
+            )
+            time.sleep(pause)
+
+
+def migration_engine() -> Engine:
+    """Движок миграций: основная БД на запись при любой DEPLOY_ROLE, без пула"""
+    return create_engine(settings.DATABASE_URL, echo=settings.DB_ECHO, poolclass=NullPool)
+
+
+def _upgrade(connection: Connection, config: Config) -> None:
+    config.attributes["connection"] = connection
+    run_with_retries(lambda: command.upgrade(config, "head"), connection.rollback)
+    connection.commit()
+
+
+def _try_lock(connection: Connection) -> bool:
+    locked = connection.execute(
+        text("SELECT pg_try_advisory_lock(:key)"), {"key": settings.MIGRATION_LOCK_KEY}
+    ).scalar()
+    connection.commit()
+    return bool(locked)
+
+
+def _unlock(connection: Connection) -> None:
+    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": settings.MIGRATION_LOCK_KEY})
+    connection.commit()
+
+
+def _set_timeouts(connection: Connection) -> None:
+    # Сессионные значения: действуют на все ревизии, включая блоки вне транзакции
+    connection.execute(text(f"SET lock_timeout = {int(settings.MIGRATION_LOCK_TIMEOUT_MS)}"))
+    connection.execute(text(f"SET statement_timeout = {int(settings.MIGRATION_STATEMENT_TIMEOUT_MS)}"))
+    connection.commit()
+
+
+def migrate(engine: Engine, config: Optional[Config] = None, wait_timeout: Optional[float] = None) -> bool:
+    """
+    Приводит схему к head: мигрирует под advisory lock или ждет другой экземпляр
+
+    Аргументы:
+        engine: Движок БД
+        config: Конфигурация Alembic (по умолчанию alembic.ini проекта)
+        wait_timeout: Сколько секунд ждать чужую миграцию (по умолчанию MIGRATION_WAIT_TIMEOUT)
+
+    Возвращает:
+        True, если миграции применял этот экземпляр
+
+    Исключения:
+        TimeoutError: Схема не стала актуальной за wait_timeout
+    """
+    config = config or alembic_config()
+    if engine.dialect.name != "postgresql":
+        with engine.connect() as connection:
+            _upgrade(connection, config)
+        return True
+
+    wait_timeout = settings.MIGRATION_WAIT_TIMEOUT if wait_timeout is None else wait_timeout
+    deadline = time.monotonic() + wait_timeout
+    with engine.connect() as connection:
+        while True:
+            if _try_lock(connection):
+                try:
+                    _set_timeouts(connection)
+                    current = schema_is_current(connection)
+                    connection.commit()
+                    if current:
+                        logger.info("Schema is already at head")
+                        return False
+                    logger.info("Advisory lock acquired, upgrading schema to head")
+                    _upgrade(connection, config)
+                    return True
+                finally:
+                    connection.rollback()
+                    _unlock(connection)
+
+            current = schema_is_current(connection)
+            connection.commit()
+            if current:
+                return False
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Schema did not reach head within {wait_timeout}s")
+            logger.info("Another instance is migrating, waiting for schema head")
+            time.sleep(settings.MIGRATION_POLL_INTERVAL)
+
+
+class ReadinessGate:
+    """Готовность экземпляра: после первой успешной проверки схемы БД больше не опрашивается"""
+
+    def __init__(self):
+        self.ready = False
+
+    def check(self, connection: Connection) -> bool:
+        if not self.ready:
+            self.ready = schema_is_current(connection)
+        return self.ready
+
+    def reset(self) -> None:
+        self.ready = False
+
+
+readiness_gate = ReadinessGate()
+
+
+def _drop_invalid_index(index_name: str) -> None:
+    """Удаляет невалидный индекс, оставшийся от прерванного CREATE INDEX CONCURRENTLY"""
+    invalid = op.get_bind().execute(
+        text(
+            "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+            "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+        ),
+        {"name": index_name}
+    ).first()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: List,
+    dedupe: Optional[Callable[[], None]] = None,
+    **kw
+) -> None:
+    """
+    Создает индекс в миграции без блокировки записи в таблицу.
+
+    В PostgreSQL индекс строится через CREATE INDEX CONCURRENTLY вне транзакции;
+    невалидный индекс, оставшийся от прерванной попытки, сначала удаляется.
+    В остальных диалектах - обычный CREATE INDEX IF NOT EXISTS.
+
+    dedupe схлопывает дубликаты ключа уникального индекса перед построением.
+    Приложение пишет в таблицу и во время построения, поэтому новый дубликат
+    может сорвать CREATE UNIQUE INDEX CONCURRENTLY: тогда невалидный индекс
+    удаляется, dedupe выполняется заново и построение повторяется
+    (до MIGRATION_RETRIES раз).
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        if dedupe is not None:
+            dedupe()
+        op.create_index(index_name, table_name, columns, if_not_exists=True, **kw)
+        return
+
+    def build() -> None:
+        _drop_invalid_index(index_name)
+        if dedupe is not None:
+            # Шаги dedupe видят один снимок таблицы и фиксируются вместе
+            op.execute("BEGIN")
+            try:
+                dedupe()
+            except Exception:
+                op.execute("ROLLBACK")
+                raise
+            op.execute("COMMIT")
+        op.create_index(index_name, table_name, columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+
+    with op.get_context().autocommit_block():
+        run_with_retries(
+            build,
+            lambda: None,
+            retry_on=is_unique_violation if dedupe is not None else (lambda error: False)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Только проверить версию схемы")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    engine = migration_engine()
+    try:
+        if args.check:
+            with engine.connect() as connection:
+                current = schema_is_current(connection)
+            print("Schema is at head" if current else "Schema is behind head")
+            sys.exit(0 if current else 1)
+
+        started = time.perf_counter()
+        migrated = migrate(engine)
+        action = "Migrated" if migrated else "Schema already at head after"
+        print(f"{action} in {time.perf_counter() - started:.2f}s")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
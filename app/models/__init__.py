@@ -11,7 +11,16 @@ from .models import (
     Order,
     OrderItem,
     Review,
-    OrderStatus
+    OrderStatus,
+    SalesDaily,
+    SalesDailyProduct,
+    ProductPopularity,
+    ProductRanking,
+    JobState,
+    ProductPairCount,
+    ProductBasketCount,
+    ProductRecommendation,
+    ProductSimilarityQueue
 )
 
 __all__ = [
@@ -23,6 +32,15 @@ __all__ = [
     "Order",
     "OrderItem",
     "Review",
-    "OrderStatus"
+    "OrderStatus",
+    "SalesDaily",
+    "SalesDailyProduct",
+    "ProductPopularity",
+    "ProductRanking",
+    "JobState",
+    "ProductPairCount",
+    "ProductBasketCount",
+    "ProductRecommendation",
+    "ProductSimilarityQueue"
 ]
 
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Numeric, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Date, DateTime, Text, Numeric, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 import enum
 from app.database import Base
@@ -23,7 +23,8 @@ class User(Base):
     email = Column(String(100), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
     phone = Column(String(20), nullable=True)
-    address = Column(Text, nullable=True)
+    # Тяжелые Text колонки отложены: читаются только там, где попадают в ответ
+    address = deferred(Column(Text, nullable=True))
     is_active = Column(Integer, default=1)
     is_admin = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -33,6 +34,12 @@ class User(Base):
     orders = relationship("Order", back_populates="user", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="user", cascade="all, delete-orphan")
     
+    # Сортировка и курсор GET /users. Индексы поиска по email и имени
+    # специфичны для PostgreSQL и создаются только миграцией 0002
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<User(id={self.id}, name='{self.name}', email='{self.email}')>"
 
@@ -43,7 +50,7 @@ class Category(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, unique=True, index=True)
-    description = Column(Text, nullable=True)
+    description = deferred(Column(Text, nullable=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     products = relationship("Product", back_populates="category")
@@ -57,8 +64,9 @@ class Product(Base):
     __tablename__ = "products"
     
     id = Column(Integer, primary_key=True, index=True)
+    sku = Column(String(64), nullable=True, unique=True, index=True)
     name = Column(String(200), nullable=False, index=True)
-    description = Column(Text, nullable=True)
+    description = deferred(Column(Text, nullable=True))
     price = Column(Numeric(10, 2), nullable=False)
     stock = Column(Integer, nullable=False, default=0)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
@@ -90,6 +98,12 @@ class CartItem(Base):
     user = relationship("User", back_populates="cart_items")
     product = relationship("Product", back_populates="cart_items")
     
+    # Одна строка на товар в корзине; индекс обслуживает и выборки по user_id
+    __table_args__ = (
+        Index("uq_cart_items_user_product", "user_id", "product_id", unique=True),
+        Index("ix_cart_items_product_id", "product_id"),
+    )
+    
     def __repr__(self):
         return f"<CartItem(id={self.id}, user_id={self.user_id}, product_id={self.product_id}, quantity={self.quantity})>"
 
@@ -111,6 +125,21 @@ class Order(Base):
     user = relationship("User", back_populates="orders")
     order_items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
     
+    # История заказов пользователя: фильтр по user_id, новые первыми.
+    # Список заказов администратора: keyset по (created_at, id), в PostgreSQL
+    # индексы покрывают выбираемые колонки (INCLUDE) для index-only scan
+    __table_args__ = (
+        Index("ix_orders_user_id_created_at", user_id, created_at.desc()),
+        Index(
+            "ix_orders_status_created_at_id", status, created_at.desc(), id.desc(),
+            postgresql_include=["user_id", "total_amount"]
+        ),
+        Index(
+            "ix_orders_created_at_id", created_at.desc(), id.desc(),
+            postgresql_include=["user_id", "status", "total_amount"]
+        ),
+    )
+    
     def __repr__(self):
         return f"<Order(id={self.id}, user_id={self.user_id}, status={self.status}, total={self.total_amount})>"
 
@@ -129,6 +158,11 @@ class OrderItem(Base):
     order = relationship("Order", back_populates="order_items")
     product = relationship("Product", back_populates="order_items")
     
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),
+        Index("ix_order_items_product_id", "product_id"),
+    )
+    
     def __repr__(self):
         return f"<OrderItem(id={self.id}, order_id={self.order_id}, product_id={self.product_id})>"
 
@@ -148,6 +182,137 @@ class Review(Base):
     user = relationship("User", back_populates="reviews")
     product = relationship("Product", back_populates="reviews")
     
+    # Один отзыв пользователя на товар; отзывы товара читаются новыми первыми
+    __table_args__ = (
+        Index("uq_reviews_user_product", "user_id", "product_id", unique=True),
+        Index("ix_reviews_product_id_created_at", product_id, created_at.desc()),
+    )
+    
     def __repr__(self):
         return f"<Review(id={self.id}, product_id={self.product_id}, rating={self.rating})>"
 
+
+
+class SalesDaily(Base):
+    """Дневная сводка продаж (rollup по неотмененным заказам)"""
+    __tablename__ = "sales_daily"
+    
+    day = Column(Date, primary_key=True)
+    orders_count = Column(Integer, nullable=False, default=0)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<SalesDaily(day={self.day}, orders={self.orders_count}, revenue={self.revenue})>"
+
+
+class SalesDailyProduct(Base):
+    """Дневная сводка продаж по товару; категория фиксируется на момент продажи"""
+    __tablename__ = "sales_daily_product"
+    
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    category_id = Column(Integer, nullable=True)
+    orders_count = Column(Integer, nullable=False, default=0)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    
+    __table_args__ = (
+        Index("ix_sales_daily_product_product_day", "product_id", "day"),
+        Index("ix_sales_daily_product_category_day", "category_id", "day"),
+    )
+    
+    def __repr__(self):
+        return f"<SalesDailyProduct(day={self.day}, product_id={self.product_id}, units={self.units})>"
+
+
+class ProductPopularity(Base):
+    """
+    Затухающие счетчики продаж товара.
+    Оценки приведены к моменту scored_at (unix-время) и затухают экспоненциально.
+    """
+    __tablename__ = "product_popularity"
+    
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    bestseller_score = Column(Float, nullable=False, default=0)
+    trending_score = Column(Float, nullable=False, default=0)
+    units_sold = Column(Integer, nullable=False, default=0)
+    scored_at = Column(Float, nullable=False)
+    
+    def __repr__(self):
+        return f"<ProductPopularity(product_id={self.product_id}, trending={self.trending_score})>"
+
+
+class ProductRanking(Base):
+    """Предрассчитанный топ-N товаров; category_id = 0 для общего списка"""
+    __tablename__ = "product_rankings"
+    
+    kind = Column(String(20), primary_key=True)
+    category_id = Column(Integer, primary_key=True)
+    position = Column(Integer, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    score = Column(Float, nullable=False)
+    
+    def __repr__(self):
+        return f"<ProductRanking(kind='{self.kind}', category_id={self.category_id}, position={self.position})>"
+
+
+class JobState(Base):
+    """Состояние инкрементальных фоновых задач: до какого места обработаны данные"""
+    __tablename__ = "job_state"
+    
+    name = Column(String(50), primary_key=True)
+    last_id = Column(BigInteger, nullable=False, default=0)
+    processed = Column(BigInteger, nullable=False, default=0)
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<JobState(name='{self.name}', last_id={self.last_id})>"
+
+
+class ProductPairCount(Base):
+    """Число корзин, где товары встретились вместе (product_a < product_b)"""
+    __tablename__ = "product_pair_counts"
+    
+    product_a = Column(Integer, primary_key=True)
+    product_b = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index("ix_product_pair_counts_b_a", "product_b", "product_a"),
+    )
+
+
+class ProductBasketCount(Base):
+    """Число корзин, содержащих товар"""
+    __tablename__ = "product_basket_counts"
+    
+    product_id = Column(Integer, primary_key=True)
+    baskets = Column(Integer, nullable=False, default=0)
+
+
+class ProductRecommendation(Base):
+    """Предрассчитанные соседи товара (kind: also_bought, similar) по позициям"""
+    __tablename__ = "product_recommendations"
+    
+    kind = Column(String(20), primary_key=True)
+    product_id = Column(Integer, primary_key=True)
+    position = Column(Integer, primary_key=True)
+    recommended_id = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+    
+    # Поиск списков, ссылающихся на измененный товар
+    __table_args__ = (
+        Index("ix_product_recommendations_kind_recommended", "kind", "recommended_id"),
+    )
+    
+    def __repr__(self):
+        return f"<ProductRecommendation(kind='{self.kind}', product_id={self.product_id}, recommended_id={self.recommended_id})>"
+
+
+class ProductSimilarityQueue(Base):
+    """Товары, созданные или измененные после прошлого пересчета похожих товаров"""
+    __tablename__ = "product_similarity_queue"
+    
+    product_id = Column(Integer, primary_key=True)
+    queued_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,326 @@
+"""
+Планы загрузки ORM и быстрый путь чтения каталога для горячих эндпоинтов.
+
+Каждый план явно перечисляет читаемые колонки (load_only) и разрешенные связи.
+Все остальное помечено raiseload: случайная ленивая загрузка падает с ошибкой
+в тестах, а не добавляет незаметные запросы в проде.
+
+Анонимное чтение каталога идет мимо ORM: Core select() и сборка ответов
+через model_construct без identity map и повторной валидации.
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload
+
+from app.models import User, Category, Product, CartItem, Order, OrderItem, OrderStatus, Review
+from app.schemas import (
+    PRODUCT_FIELDS, ProductResponse, CategoryResponse, OrderSummaryResponse, AdminOrderResponse,
+    get_product_fields_model
+)
+from app.utils import escape_like
+
+CATEGORY_COLUMNS = (Category.id, Category.name, Category.description, Category.created_at)
+
+REVIEW_AUTHOR_COLUMNS = (User.id, User.name)
+
+
+def category_load_options() -> list:
+    """Опции загрузки категории в полном представлении CategoryResponse"""
+    return [load_only(*CATEGORY_COLUMNS, raiseload=True), raiseload("*")]
+
+
+def product_load_options(fields: Tuple[str, ...] = PRODUCT_FIELDS) -> list:
+    """
+    Опции загрузки товара под набор полей ответа.
+    Применимы как к запросу товаров, так и вложенно: joinedload(...).options(*product_load_options())
+    """
+    columns = [getattr(Product, field) for field in fields if field != "category"]
+    if "category" not in fields:
+        return [load_only(*columns, raiseload=True), raiseload("*")]
+    return [
+        load_only(*columns, Product.category_id, raiseload=True),
+        joinedload(Product.category).options(*category_load_options()),
+        raiseload("*"),
+    ]
+
+
+def cart_item_load_options() -> list:
+    """Строки корзины вместе с полными товарами и их категориями одним запросом"""
+    return [
+        joinedload(CartItem.product).options(*product_load_options()),
+        raiseload("*"),
+    ]
+
+
+def order_load_options() -> list:
+    """Заказ с позициями, товарами и категориями товаров"""
+    return [
+        joinedload(Order.order_items).options(
+            joinedload(OrderItem.product).options(*product_load_options()),
+            raiseload("*"),
+        ),
+        raiseload("*"),
+    ]
+
+
+def review_list_load_options() -> list:
+    """Отзывы с автором: из users читаются только id и name"""
+    return [
+        joinedload(Review.user).options(load_only(*REVIEW_AUTHOR_COLUMNS, raiseload=True), raiseload("*")),
+        raiseload("*"),
+    ]
+
+
+def product_list_filters(
+    category_id: Optional[int] = None,
+    search: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    in_stock: Optional[bool] = None,
+    include_inactive: bool = False
+) -> list:
+    """Условия WHERE для списка товаров, общие для ORM и Core запросов"""
+    filters = []
+    if category_id:
+        filters.append(Product.category_id == category_id)
+    if search:
+        filters.append(Product.name.ilike(f"%{search}%"))
+    if min_price:
+        filters.append(Product.price >= min_price)
+    if max_price:
+        filters.append(Product.price <= max_price)
+    if in_stock:
+        filters.append(Product.stock > 0)
+    if not include_inactive:
+        filters.append(Product.is_active == 1)
+    return filters
+
+
+def user_search_filters(
+    email: Optional[str] = None,
+    name: Optional[str] = None,
+    is_active: Optional[int] = None,
+    is_admin: Optional[int] = None
+) -> list:
+    """
+    Условия WHERE для поиска пользователей администратором.
+    Форма условий совпадает с индексами миграции 0002: начало email ищется
+    по lower(email) LIKE 'prefix%', подстрока имени через ILIKE (trigram).
+    """
+    filters = []
+    if email:
+        filters.append(func.lower(User.email).like(f"{escape_like(email.lower())}%", escape="\\"))
+    if name:
+        filters.append(User.name.ilike(f"%{escape_like(name)}%", escape="\\"))
+    if is_active is not None:
+        filters.append(User.is_active == is_active)
+    if is_admin is not None:
+        filters.append(User.is_admin == is_admin)
+    return filters
+
+
+def user_keyset_filter(created_at, user_id: int):
+    """Условие следующей страницы при сортировке (created_at DESC, id DESC)"""
+    return tuple_(User.created_at, User.id) < tuple_(created_at, user_id)
+
+
+ADMIN_ORDER_COLUMNS = (Order.id, Order.user_id, Order.status, Order.total_amount, Order.created_at)
+
+
+def order_admin_filters(
+    status: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    user_id: Optional[int] = None,
+    min_total: Optional[Decimal] = None,
+    max_total: Optional[Decimal] = None
+) -> list:
+    """
+    Условия WHERE для списка заказов администратора.
+    Статус и период обслуживает индекс (status, created_at, id), пользователя -
+    (user_id, created_at); сумма проверяется по колонке, включенной в индекс.
+    """
+    filters = []
+    if status:
+        filters.append(Order.status == OrderStatus[status.upper()])
+    if date_from:
+        filters.append(Order.created_at >= datetime.combine(date_from, datetime.min.time()))
+    if date_to:
+        filters.append(Order.created_at < datetime.combine(date_to + timedelta(days=1), datetime.min.time()))
+    if user_id is not None:
+        filters.append(Order.user_id == user_id)
+    if min_total is not None:
+        filters.append(Order.total_amount >= min_total)
+    if max_total is not None:
+        filters.append(Order.total_amount <= max_total)
+    return filters
+
+
+def order_keyset_filter(created_at, order_id: int):
+    """Условие следующей страницы при сортировке (created_at DESC, id DESC)"""
+    return tuple_(Order.created_at, Order.id) < tuple_(created_at, order_id)
+
+
+CATEGORY_FIELDS: Tuple[str, ...] = tuple(CategoryResponse.model_fields)
+
+
+def count_products(db: Session, filters: list) -> int:
+    """Считает товары под условиями без загрузки строк"""
+    products = Product.__table__
+    return db.execute(select(func.count()).select_from(products).where(*filters)).scalar_one()
+
+
+def fetch_products(
+    db: Session,
+    filters: list,
+    fields: Tuple[str, ...] = PRODUCT_FIELDS,
+    order_by=None,
+    offset: Optional[int] = None,
+    limit: Optional[int] = None
+) -> list:
+    """
+    Быстрое чтение товаров через Core select() без ORM-объектов.
+    Строки сразу превращаются в схемы ответа через model_construct:
+    данные из БД уже соответствуют схеме, повторная валидация не нужна.
+    
+    Аргументы:
+        filters: Условия WHERE (см. product_list_filters)
+        fields: Поля ответа из PRODUCT_FIELDS
+        order_by, offset, limit: Сортировка и окно выборки
+        
+    Возвращает:
+        Список ProductResponse (или суженных схем при неполном fields)
+    """
+    products = Product.__table__
+    scalar_fields = [field for field in fields if field != "category"]
+    with_category = "category" in fields
+    
+    columns = [products.c[field] for field in scalar_fields]
+    if with_category:
+        categories = Category.__table__
+        columns += [categories.c[field] for field in CATEGORY_FIELDS]
+        stmt = select(*columns).select_from(
+            products.outerjoin(categories, categories.c.id == products.c.category_id)
+        )
+    else:
+        stmt = select(*columns)
+    
+    stmt = stmt.where(*filters)
+    if order_by is not None:
+        stmt = stmt.order_by(order_by)
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    
+    construct = (ProductResponse if fields == PRODUCT_FIELDS else get_product_fields_model(fields)).model_construct
+    construct_category = CategoryResponse.model_construct
+    split = len(scalar_fields)
+    
+    items: List = []
+    for row in db.execute(stmt):
+        values = dict(zip(scalar_fields, row))
+        if with_category:
+            category_row = row[split:]
+            values["category"] = (
+                construct_category(**dict(zip(CATEGORY_FIELDS, category_row)))
+                if category_row[0] is not None else None
+            )
+        items.append(construct(**values))
+    return items
+
+
+def count_user_orders(db: Session, user_id: int) -> int:
+    """Считает заказы пользователя по индексу (user_id, created_at)"""
+    return db.execute(select(func.count()).select_from(Order.__table__).where(Order.user_id == user_id)).scalar_one()
+
+
+def fetch_order_summaries(db: Session, user_id: int, offset: int, limit: int) -> List[OrderSummaryResponse]:
+    """
+    Краткие карточки заказов пользователя для истории заказов.
+    Страница заказов читается по индексу (user_id, created_at DESC), затем
+    один групповой запрос по order_items считает позиции и единицы и находит
+    первую позицию заказа; к ней присоединяется товар для миниатюры.
+    
+    Аргументы:
+        user_id: Владелец заказов
+        offset, limit: Окно выборки
+        
+    Возвращает:
+        Список OrderSummaryResponse, новые заказы первыми
+    """
+    orders = Order.__table__
+    page = db.execute(
+        select(orders.c.id, orders.c.status, orders.c.total_amount, orders.c.created_at)
+        .where(orders.c.user_id == user_id)
+        .order_by(orders.c.created_at.desc(), orders.c.id.desc())
+        .offset(offset)
+        .limit(limit)
+    ).all()
+    if not page:
+        return []
+    
+    order_items = OrderItem.__table__
+    products = Product.__table__
+    stats = (
+        select(
+            order_items.c.order_id,
+            func.count().label("items_count"),
+            func.sum(order_items.c.quantity).label("units"),
+            func.min(order_items.c.id).label("first_item_id"),
+        )
+        .where(order_items.c.order_id.in_([row.id for row in page]))
+        .group_by(order_items.c.order_id)
+        .subquery()
+    )
+    first_item = order_items.alias("first_item")
+    summaries = {
+        row.order_id: row
+        for row in db.execute(
+            select(stats, products.c.id.label("product_id"), products.c.name, products.c.image_url)
+            .join(first_item, first_item.c.id == stats.c.first_item_id)
+            .join(products, products.c.id == first_item.c.product_id)
+        )
+    }
+    
+    construct = OrderSummaryResponse.model_construct
+    items = []
+    for order in page:
+        summary = summaries.get(order.id)
+        items.append(construct(
+            id=order.id,
+            status=order.status.value,
+            total_amount=order.total_amount,
+            created_at=order.created_at,
+            items_count=summary.items_count if summary else 0,
+            units=summary.units if summary else 0,
+            first_product_id=summary.product_id if summary else None,
+            first_product_name=summary.name if summary else None,
+            first_product_image_url=summary.image_url if summary else None,
+        ))
+    return items
+
+
+def fetch_admin_orders(db: Session, filters: list, limit: int) -> List[AdminOrderResponse]:
+    """
+    Страница списка заказов администратора, новые первыми.
+    Читаются только колонки покрывающих индексов orders (см. order_admin_filters).
+    """
+    rows = db.execute(
+        select(*ADMIN_ORDER_COLUMNS)
+        .where(*filters)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(limit)
+    )
+    construct = AdminOrderResponse.model_construct
+    return [
+        construct(
+            id=row.id, user_id=row.user_id, status=row.status.value,
+            total_amount=row.total_amount, created_at=row.created_at
+        )
+        for row in rows
+    ]
@@ -0,0 +1,140 @@
+"""
+Рейтинги товаров: хиты продаж (bestsellers) и набирающие популярность (trending).
+
+При оформлении заказа продажи добавляются к затухающим счетчикам
+product_popularity одним upsert: старая оценка затухает экспоненциально
+с периодом полураспада вида рейтинга и увеличивается на проданные единицы.
+Периодическая задача (scripts/refresh_rankings.py) пересчитывает оценки
+на текущий момент и записывает топ-N в product_rankings. Чтение рейтинга -
+один запрос по первичному ключу, результат кэшируется.
+"""
+
+import math
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.cache import ranking_cache
+from app.config import settings
+from app.models import Product, ProductPopularity, ProductRanking
+from app.utils import dialect_insert
+
+# Вид рейтинга -> (колонка счетчика, период полураспада в днях)
+RANKING_KINDS: Dict[str, Tuple[str, float]] = {
+    "bestsellers": ("bestseller_score", settings.BESTSELLER_HALF_LIFE_DAYS),
+    "trending": ("trending_score", settings.TRENDING_HALF_LIFE_DAYS),
+}
+
+# category_id общего списка в product_rankings
+ALL_CATEGORIES = 0
+
+
+def decay_rate(half_life_days: float) -> float:
+    """Коэффициент экспоненциального затухания в 1/сек"""
+    return math.log(2) / (half_life_days * 86400)
+
+
+def record_product_sales(db: Session, lines: Iterable[Tuple[int, int]], now: Optional[float] = None) -> None:
+    """
+    Добавляет проданные единицы к затухающим счетчикам товаров
+
+    Аргументы:
+        db: Сессия БД (транзакцию фиксирует вызывающий код)
+        lines: Пары (product_id, quantity)
+        now: Момент продажи, unix-время (по умолчанию текущее)
+    """
+    now = time.time() if now is None else now
+    units = defaultdict(int)
+    for product_id, quantity in lines:
+        units[product_id] += quantity
+    if not units:
+        return
+
+    table = ProductPopularity.__table__
+    stmt = dialect_insert(db, table)
+    elapsed = stmt.excluded.scored_at - table.c.scored_at
+    set_ = {
+        column: table.c[column] * func.exp(-decay_rate(half_life) * elapsed) + stmt.excluded[column]
+        for column, half_life in RANKING_KINDS.values()
+    }
+    set_["units_sold"] = table.c.units_sold + stmt.excluded.units_sold
+    set_["scored_at"] = stmt.excluded.scored_at
+
+    db.execute(stmt.on_conflict_do_update(index_elements=["product_id"], set_=set_), [
+        {
+            "product_id": product_id,
+            "bestseller_score": float(quantity),
+            "trending_score": float(quantity),
+            "units_sold": quantity,
+            "scored_at": now,
+        }
+        for product_id, quantity in units.items()
+    ])
+
+
+def refresh_rankings(db: Session, size: Optional[int] = None, now: Optional[float] = None) -> Dict[str, int]:
+    """
+    Пересчитывает топ-N каждого вида рейтинга: общий и по категориям
+
+    Оценки приводятся к моменту now, неактивные товары пропускаются.
+    Таблица рейтингов заменяется целиком в одной транзакции.
+
+    Возвращает:
+        Количество записанных позиций по видам рейтинга
+    """
+    size = size or settings.RANKING_SIZE
+    now = time.time() if now is None else now
+    rows = db.execute(
+        select(ProductPopularity, Product.category_id)
+        .join(Product, Product.id == ProductPopularity.product_id)
+        .where(Product.is_active == 1)
+    ).all()
+
+    records, written = [], {}
+    for kind, (column, half_life) in RANKING_KINDS.items():
+        rate = decay_rate(half_life)
+        scored = sorted(
+            (
+                (getattr(popularity, column) * math.exp(-rate * (now - popularity.scored_at)), popularity.product_id, category_id)
+                for popularity, category_id in rows
+            ),
+            key=lambda item: (-item[0], item[1])
+        )
+
+        lists = defaultdict(list)
+        for score, product_id, category_id in scored:
+            for list_category in (ALL_CATEGORIES, category_id):
+                if list_category is not None and len(lists[list_category]) < size:
+                    lists[list_category].append((product_id, score))
+
+        for category_id, ranked in lists.items():
+            records += [
+                {"kind": kind, "category_id": category_id, "position": position,
+                 "product_id": product_id, "score": score}
+                for position, (product_id, score) in enumerate(ranked, start=1)
+            ]
+        written[kind] = sum(len(ranked) for ranked in lists.values())
+
+    db.execute(delete(ProductRanking))
+    if records:
+        db.execute(insert(ProductRanking), records)
+    db.commit()
+    ranking_cache.clear()
+    return written
+
+
+def get_ranking(db: Session, kind: str, category_id: Optional[int] = None) -> List[int]:
+    """ID товаров рейтинга по порядку; читается из кэша или одним запросом по первичному ключу"""
+    key = (kind, category_id or ALL_CATEGORIES)
+    product_ids = ranking_cache.get(key)
+    if product_ids is None:
+        product_ids = list(db.execute(
+            select(ProductRanking.product_id)
+            .where(ProductRanking.kind == key[0], ProductRanking.category_id == key[1])
+            .order_by(ProductRanking.position)
+        ).scalars())
+        ranking_cache.set(key, product_ids)
+    return product_ids
@@ -0,0 +1,200 @@
+"""
+Ограничение частоты запросов: ASGI middleware с корзинами токенов (token bucket).
+
+Корзина наполняется со скоростью rate токенов в секунду до объема burst,
+запрос списывает стоимость своего маршрута (ROUTE_POLICIES): дорогой вход
+с bcrypt стоит больше, чем чтение из кэша. Ключ корзины - субъект валидного
+токена доступа, иначе IP клиента. IP берется из X-Forwarded-For с учетом
+RATE_LIMIT_TRUSTED_PROXIES доверенных прокси (nginx дописывает адрес клиента
+в конец заголовка). Вход, регистрация и смена пароля списываются из отдельной
+корзины "auth" по IP, чтобы перебор паролей не зависел от токена.
+
+Хранилище корзин подключаемое (RATE_LIMIT_BACKEND = "модуль:Класс"): по
+умолчанию MemoryBackend в памяти процесса, общее хранилище нужно, чтобы
+лимит действовал на все воркеры и реплики. Отклоненный запрос получает 429
+с заголовком Retry-After.
+"""
+
+import importlib
+import json
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from jose import JWTError, jwt
+
+from app.config import settings
+
+# (метод, шаблон пути, корзина, стоимость); первое совпадение побеждает
+ROUTE_POLICIES: List[Tuple[str, Pattern, str, float]] = [
+    ("POST", re.compile(r"^/auth/(login|register)$"), "auth", 1),
+    ("POST", re.compile(r"^/users/me/change-password$"), "auth", 1),
+    ("GET", re.compile(r"^/products/?$"), "default", 2),
+    ("GET", re.compile(r"^/products/export$"), "default", 20),
+    ("POST", re.compile(r"^/products/import$"), "default", 20),
+    ("GET", re.compile(r"^/products/(\d+|batch|bestsellers|trending)(/[\w-]+)?$"), "default", 0.5),
+    ("POST", re.compile(r"^/products/batch$"), "default", 0.5),
+    ("GET", re.compile(r"^/categories/"), "default", 0.5),
+]
+
+# Пробы оркестратора и сбор метрик не ограничиваются
+EXEMPT_PATHS = frozenset({"/health", "/ready", "/metrics"})
+
+DEFAULT_POLICY = ("default", 1.0)
+
+
+def bucket_limits() -> Dict[str, Tuple[float, float]]:
+    """Корзина -> (rate токенов в секунду, burst)"""
+    return {
+        "default": (settings.RATE_LIMIT_RATE, settings.RATE_LIMIT_BURST),
+        "auth": (settings.RATE_LIMIT_AUTH_RATE, settings.RATE_LIMIT_AUTH_BURST),
+    }
+
+
+def route_policy(method: str, path: str) -> Tuple[str, float]:
+    """Корзина и стоимость запроса"""
+    for policy_method, pattern, bucket, cost in ROUTE_POLICIES:
+        if method == policy_method and pattern.match(path):
+            return bucket, cost
+    return DEFAULT_POLICY
+
+
+class MemoryBackend:
+    """
+    Корзины токенов в памяти процесса.
+
+    Хранится не больше RATE_LIMIT_MAX_KEYS корзин; самые давние вытесняются
+    (вытесненная корзина начинает заново полной).
+    """
+
+    def __init__(self, max_keys: Optional[int] = None):
+        self.max_keys = max_keys or settings.RATE_LIMIT_MAX_KEYS
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, cost: float, rate: float, burst: float) -> float:
+        """
+        Списывает cost токенов из корзины key
+
+        Возвращает:
+            0, если запрос разрешен, иначе сколько секунд ждать до нужного числа токенов
+        """
+        now = time.monotonic()
+        cost = min(cost, burst)
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def reset(self) -> None:
+        """Удаляет все корзины"""
+        with self._lock:
+            self._buckets.clear()
+
+
+def load_backend(path: str):
+    """Создает хранилище корзин по пути вида "модуль:Класс\""""
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def client_ip(scope: dict) -> str:
+    """IP клиента: из X-Forwarded-For за доверенными прокси, иначе адрес соединения"""
+    peer = (scope.get("client") or ("unknown", 0))[0]
+    proxies = settings.RATE_LIMIT_TRUSTED_PROXIES
+    if proxies <= 0:
+        return peer
+    for name, value in scope.get("headers") or ():
+        if name == b"x-forwarded-for":
+            chain = [address.strip() for address in value.decode("latin-1").split(",") if address.strip()]
+            # Последние proxies адресов дописаны доверенными прокси; левее - то, что прислал клиент
+            return chain[-proxies] if len(chain) >= proxies else (chain[0] if chain else peer)
+    return peer
+
+
+def token_subject(scope: dict) -> Optional[str]:
+    """Субъект валидного Bearer-токена или None"""
+    for name, value in scope.get("headers") or ():
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            except JWTError:
+                return None
+            return payload.get("sub")
+    return None
+
+
+class RateLimiter:
+    """Политики маршрутов и хранилище корзин; общий экземпляр - rate_limiter"""
+
+    def __init__(self, backend=None):
+        self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = load_backend(settings.RATE_LIMIT_BACKEND)
+        return self._backend
+
+    async def check(self, scope: dict) -> float:
+        """Списывает стоимость запроса; возвращает 0 или паузу до повтора в секундах"""
+        path = scope["path"]
+        if path in EXEMPT_PATHS:
+            return 0.0
+        bucket, cost = route_policy(scope["method"], path)
+        identity = None if bucket == "auth" else token_subject(scope)
+        key = f"{bucket}:user:{identity}" if identity else f"{bucket}:ip:{client_ip(scope)}"
+        rate, burst = bucket_limits()[bucket]
+        return await self.backend.take(key, cost, rate, burst)
+
+    def reset(self) -> None:
+        """Сбрасывает корзины хранилища (тесты)"""
+        if self._backend is not None and hasattr(self._backend, "reset"):
+            self._backend.reset()
+
+
+rate_limiter = RateLimiter()
+
+
+class RateLimitMiddleware:
+    """ASGI middleware: отвечает 429 с Retry-After, когда в корзине не хватает токенов"""
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        wait = await self.limiter.check(scope)
+        if not wait:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(wait))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
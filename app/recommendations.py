@@ -0,0 +1,100 @@
+"""
+Хранение и чтение предрассчитанных рекомендаций товаров.
+
+Списки соседей строятся офлайн-задачами (app/also_bought.py и др.)
+и лежат в product_recommendations по ключу (вид, товар, позиция):
+чтение - один запрос по префиксу первичного ключа, результат кэшируется.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.cache import recommendation_cache
+from app.models import JobState, ProductRecommendation, ProductSimilarityQueue
+from app.utils import dialect_insert
+
+# Поля товара, изменение которых требует пересчета похожих товаров
+SIMILARITY_FIELDS = frozenset({"name", "description", "category_id", "is_active"})
+
+
+def get_job_state(db: Session, name: str) -> JobState:
+    """Состояние фоновой задачи; создается при первом запуске"""
+    state = db.get(JobState, name)
+    if state is None:
+        state = JobState(name=name, last_id=0, processed=0)
+        db.add(state)
+        db.flush()
+    return state
+
+
+def mark_job_run(state: JobState) -> None:
+    """Отмечает время завершения запуска задачи"""
+    state.last_run_at = datetime.now(timezone.utc)
+
+
+def enqueue_similarity_refresh(db: Session, product_id: int) -> None:
+    """Ставит товар в очередь пересчета похожих товаров (транзакцию фиксирует вызывающий код)"""
+    enqueue_similarity_refreshes(db, [product_id])
+
+
+def enqueue_similarity_refreshes(db: Session, product_ids: Iterable[int]) -> None:
+    """Ставит товары в очередь пересчета похожих товаров одним INSERT (транзакцию фиксирует вызывающий код)"""
+    queued_at = datetime.now(timezone.utc)
+    rows = [{"product_id": product_id, "queued_at": queued_at} for product_id in sorted(set(product_ids))]
+    if not rows:
+        return
+    stmt = dialect_insert(db, ProductSimilarityQueue.__table__).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["product_id"], set_={"queued_at": stmt.excluded.queued_at}
+    ))
+
+
+def replace_recommendations(
+    db: Session,
+    kind: str,
+    neighbours: Dict[int, Iterable[Tuple[int, float]]]
+) -> int:
+    """
+    Заменяет списки соседей товаров одного вида (транзакцию фиксирует вызывающий код)
+
+    Аргументы:
+        kind: Вид рекомендаций
+        neighbours: ID товара -> пары (ID соседа, оценка) по убыванию оценки
+
+    Возвращает:
+        Количество записанных строк
+    """
+    if not neighbours:
+        return 0
+    db.execute(delete(ProductRecommendation).where(
+        ProductRecommendation.kind == kind,
+        ProductRecommendation.product_id.in_(list(neighbours))
+    ))
+    rows = [
+        {"kind": kind, "product_id": product_id, "position": position,
+         "recommended_id": recommended_id, "score": float(score)}
+        for product_id, ranked in neighbours.items()
+        for position, (recommended_id, score) in enumerate(ranked, start=1)
+    ]
+    if rows:
+        db.execute(insert(ProductRecommendation), rows)
+    for product_id in neighbours:
+        recommendation_cache.delete((kind, product_id))
+    return len(rows)
+
+
+def get_recommendations(db: Session, kind: str, product_id: int) -> List[int]:
+    """ID рекомендованных товаров по порядку; из кэша или одним запросом по первичному ключу"""
+    key = (kind, product_id)
+    product_ids = recommendation_cache.get(key)
+    if product_ids is None:
+        product_ids = list(db.execute(
+            select(ProductRecommendation.recommended_id)
+            .where(ProductRecommendation.kind == kind, ProductRecommendation.product_id == product_id)
+            .order_by(ProductRecommendation.position)
+        ).scalars())
+        recommendation_cache.set(key, product_ids)
+    return product_ids
@@ -1,4 +1,53 @@
 """
-API routers
+API routers.
+
+DEPLOY_ROLE выбирает роутеры, которые подключает экземпляр: "all" или имена
+через запятую, например "catalog" для узлов чтения каталога. Модули
+невыбранных роутеров не импортируются. Порядок подключения фиксирован
+(ROUTERS): admin идет раньше catalog, чтобы /products/export и другие
+статические пути сопоставлялись до /products/{product_id}.
 """
 
+import importlib
+from typing import Tuple
+
+from fastapi import FastAPI
+
+ROUTERS = ("admin", "auth", "catalog", "cart", "orders", "reviews")
+
+# Роутеры, которые только читают данные: такие узлы работают с репликой
+READ_ONLY_ROUTERS = frozenset({"catalog"})
+
+
+def deploy_routers(role: str) -> Tuple[str, ...]:
+    """
+    Роутеры роли развертывания в порядке подключения
+
+    Исключения:
+        ValueError: Неизвестное имя роутера или пустая роль
+    """
+    if role.strip() == "all":
+        return ROUTERS
+    names = {name.strip() for name in role.split(",") if name.strip()}
+    unknown = names.difference(ROUTERS)
+    if unknown or not names:
+        raise ValueError(
+            f"Invalid DEPLOY_ROLE {role!r}: use 'all' or a comma-separated list of {', '.join(ROUTERS)}"
+        )
+    return tuple(name for name in ROUTERS if name in names)
+
+
+def is_read_only_role(role: str) -> bool:
+    """Роль подключает только роутеры чтения"""
+    return READ_ONLY_ROUTERS.issuperset(deploy_routers(role))
+
+
+def include_routers(app: FastAPI, role: str) -> Tuple[str, ...]:
+    """Подключает служебные эндпоинты и роутеры роли; возвращает имена подключенных роутеров"""
+    from app.routers import system
+
+    app.include_router(system.router)
+    names = deploy_routers(role)
+    for name in names:
+        app.include_router(importlib.import_module(f"app.routers.{name}").router)
+    return names
@@ -0,0 +1,400 @@
+"""
+Администрирование: изменение каталога, импорт и выгрузка товаров, заказы, аналитика продаж.
+
+Подключается перед роутером каталога: статические пути вроде /products/export
+должны сопоставляться раньше /products/{product_id}.
+"""
+
+import csv
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.analytics import record_orders_cancelled, daily_sales, category_sales, product_sales
+from app.auth import get_current_admin_user
+from app.bulk import bulk_update_products, adjust_category_prices, bulk_transition_orders
+from app.cache import product_cache, category_cache
+from app.config import settings
+from app.database import get_db
+from app.exporter import iter_csv, iter_jsonl, MEDIA_TYPES as EXPORT_MEDIA_TYPES
+from app.importer import iter_csv_rows, iter_jsonl_rows, import_products as run_product_import
+from app.models import User, Category, Product, OrderItem, OrderStatus
+from app.queries import product_list_filters, order_admin_filters, order_keyset_filter, fetch_admin_orders
+from app.recommendations import SIMILARITY_FIELDS, enqueue_similarity_refresh
+from app.schemas import (
+    CategoryCreate, CategoryUpdate, CategoryResponse,
+    ProductCreate, ProductUpdate, ProductResponse, ProductImportResponse,
+    ProductBulkUpdate, ProductBulkUpdateResponse,
+    ORDER_STATUS_PATTERN, OrderStatusBulkUpdate, OrderStatusBulkUpdateResponse,
+    SalesDailyResponse, SalesCategoryResponse, SalesProductResponse
+)
+from app.utils import encode_cursor, decode_cursor
+
+router = APIRouter()
+
+
+@router.post("/categories/", response_model=CategoryResponse, status_code=201, tags=["Categories"])
+def create_category(
+    category: CategoryCreate,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Создать новую категорию товаров (только администраторы)"""
+    db_category = db.query(Category).filter(Category.name == category.name).first()
+    if db_category:
+        raise HTTPException(status_code=400, detail="Category name already exists")
+    
+    new_category = Category(**category.model_dump())
+    db.add(new_category)
+    db.commit()
+    db.refresh(new_category)
+    return new_category
+
+
+@router.put("/categories/{category_id}", response_model=CategoryResponse, tags=["Categories"])
+def update_category(
+    category_id: int,
+    category_update: CategoryUpdate,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Обновить категорию (только администраторы)"""
+    category = db.query(Category).filter(Category.id == category_id).first()
+    if category is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    
+    update_data = category_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(category, field, value)
+    
+    db.commit()
+    db.refresh(category)
+    product_cache.clear()
+    category_cache.delete(category_id)
+    return category
+
+
+@router.delete("/categories/{category_id}", tags=["Categories"])
+def delete_category(
+    category_id: int,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Удалить категорию (только администраторы)"""
+    category = db.query(Category).filter(Category.id == category_id).first()
+    if category is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    
+    db.delete(category)
+    db.commit()
+    product_cache.clear()
+    category_cache.delete(category_id)
+    return {"message": "Category deleted successfully"}
+
+
+@router.post("/products/", response_model=ProductResponse, status_code=201, tags=["Products"])
+def create_product(
+    product: ProductCreate,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Создать новый товар (только администраторы)"""
+    if product.category_id:
+        category = db.query(Category).filter(Category.id == product.category_id).first()
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+    
+    if product.sku and db.query(Product.id).filter(Product.sku == product.sku).first():
+        raise HTTPException(status_code=400, detail="Product SKU already exists")
+    
+    new_product = Product(**product.model_dump())
+    db.add(new_product)
+    db.flush()
+    enqueue_similarity_refresh(db, new_product.id)
+    db.commit()
+    db.refresh(new_product)
+    return new_product
+
+
+@router.post("/products/import", response_model=ProductImportResponse, tags=["Products"])
+def import_products(
+    file: UploadFile = File(..., description="Файл CSV с заголовком или JSON Lines"),
+    format: Optional[str] = Query(
+        None,
+        pattern="^(csv|jsonl)$",
+        description="Формат файла: csv или jsonl (по умолчанию по расширению файла)"
+    ),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Массовый импорт товаров (только администраторы).
+    Товары с sku обновляются при совпадении, категории можно указывать по имени в колонке category.
+    """
+    file_format = format or ("jsonl" if (file.filename or "").endswith((".jsonl", ".ndjson")) else "csv")
+    rows = iter_jsonl_rows(file.file) if file_format == "jsonl" else iter_csv_rows(file.file)
+    
+    try:
+        report = run_product_import(db, rows)
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Malformed import file: {e}")
+    finally:
+        product_cache.clear()
+    
+    return report
+
+
+@router.get("/products/export", tags=["Products"])
+def export_products(
+    format: str = Query("csv", pattern="^(csv|jsonl)$", description="Формат выгрузки: csv или jsonl"),
+    category_id: Optional[int] = Query(None, description="Фильтр по ID категории"),
+    search: Optional[str] = Query(None, description="Поиск в названиях товаров"),
+    min_price: Optional[float] = Query(None, ge=0, description="Минимальная цена"),
+    max_price: Optional[float] = Query(None, ge=0, description="Максимальная цена"),
+    in_stock: Optional[bool] = Query(None, description="Фильтр по наличию на складе"),
+    include_inactive: Optional[bool] = Query(None, description="Включить неактивные товары"),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Потоковая выгрузка каталога в CSV или JSON Lines с фильтрами списка товаров (только администраторы)"""
+    filters = product_list_filters(
+        category_id=category_id,
+        search=search,
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+        include_inactive=bool(include_inactive)
+    )
+    chunks = iter_jsonl(db, filters) if format == "jsonl" else iter_csv(db, filters)
+    
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'}
+    )
+
+
+@router.patch("/products/bulk", response_model=ProductBulkUpdateResponse, tags=["Products"])
+def bulk_update_products_endpoint(
+    bulk: ProductBulkUpdate,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Массово изменить цены, остатки и активность товаров одной транзакцией (только администраторы)"""
+    if not bulk.items and bulk.price_adjustment is None:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+    if len(bulk.items) > settings.PRODUCT_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many items: maximum is {settings.PRODUCT_BULK_MAX_ITEMS}"
+        )
+    
+    requested_ids = [item.id for item in bulk.items]
+    if len(set(requested_ids)) != len(requested_ids):
+        raise HTTPException(status_code=400, detail="Duplicate product ids")
+    
+    adjustment = bulk.price_adjustment
+    if adjustment is not None and not db.query(Category.id).filter(Category.id == adjustment.category_id).first():
+        raise HTTPException(status_code=404, detail="Category not found")
+    
+    updated_ids = bulk_update_products(db, [item.model_dump(exclude_none=True) for item in bulk.items])
+    if adjustment is not None:
+        updated_ids += adjust_category_prices(db, adjustment.category_id, adjustment.percent)
+    db.commit()
+    
+    updated_ids = sorted(set(updated_ids))
+    product_cache.delete_many(updated_ids)
+    
+    updated = set(updated_ids)
+    return {
+        "updated_ids": updated_ids,
+        "not_found": [product_id for product_id in requested_ids if product_id not in updated],
+    }
+
+
+@router.put("/products/{product_id}", response_model=ProductResponse, tags=["Products"])
+def update_product(
+    product_id: int,
+    product_update: ProductUpdate,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Обновить товар (только администраторы)"""
+    product = db.query(Product).filter(Product.id == product_id).first()
+    if product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    update_data = product_update.model_dump(exclude_unset=True)
+    
+    if 'category_id' in update_data and update_data['category_id']:
+        category = db.query(Category).filter(Category.id == update_data['category_id']).first()
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+    
+    if update_data.get('sku') and db.query(Product.id).filter(
+        Product.sku == update_data['sku'], Product.id != product_id
+    ).first():
+        raise HTTPException(status_code=400, detail="Product SKU already exists")
+    
+    for field, value in update_data.items():
+        setattr(product, field, value)
+    if SIMILARITY_FIELDS.intersection(update_data):
+        enqueue_similarity_refresh(db, product_id)
+    
+    db.commit()
+    db.refresh(product)
+    product_cache.delete(product_id)
+    return product
+
+
+@router.delete("/products/{product_id}", tags=["Products"])
+def delete_product(
+    product_id: int,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Удалить товар (только администраторы)"""
+    product = db.query(Product).filter(Product.id == product_id).first()
+    if product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    order_items_count = db.query(OrderItem).filter(OrderItem.product_id == product_id).count()
+    if order_items_count > 0:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Cannot delete product: it is used in {order_items_count} order(s). Deactivate it instead."
+        )
+    
+    db.delete(product)
+    db.commit()
+    product_cache.delete(product_id)
+    return {"message": "Product deleted successfully"}
+
+
+@router.get("/admin/orders", tags=["Admin"])
+def get_admin_orders(
+    status_filter: Optional[str] = Query(
+        None, alias="status", pattern=ORDER_STATUS_PATTERN, description="Статус заказа"
+    ),
+    date_from: Optional[date] = Query(None, description="Заказы начиная с дня (UTC)"),
+    date_to: Optional[date] = Query(None, description="Заказы по день включительно (UTC)"),
+    user_id: Optional[int] = Query(None, description="ID покупателя"),
+    min_total: Optional[Decimal] = Query(None, ge=0, description="Минимальная сумма заказа"),
+    max_total: Optional[Decimal] = Query(None, ge=0, description="Максимальная сумма заказа"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (next_cursor)"),
+    page_size: int = Query(50, ge=1, le=200, description="Элементов на странице"),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Список заказов с фильтрами (только администраторы).
+    Keyset-пагинация по (created_at, id) без OFFSET и подсчета total:
+    строки читаются из покрывающих индексов orders.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    
+    filters = order_admin_filters(status_filter, date_from, date_to, user_id, min_total, max_total)
+    if cursor is not None:
+        try:
+            created_at, order_id = decode_cursor(cursor)
+            created_at = datetime.fromisoformat(created_at)
+            order_id = int(order_id)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        filters.append(order_keyset_filter(created_at, order_id))
+    
+    items = fetch_admin_orders(db, filters, page_size + 1)
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor((items[-1].created_at, items[-1].id))
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.patch("/admin/orders/status", response_model=OrderStatusBulkUpdateResponse, tags=["Admin"])
+def bulk_update_order_status(
+    bulk: OrderStatusBulkUpdate,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Массово перевести заказы в статус одной транзакцией (только администраторы).
+    Заказы, для которых переход недопустим (например, delivered -> pending),
+    не изменяются и возвращаются в rejected.
+    """
+    if len(bulk.order_ids) > settings.ORDER_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many orders: maximum is {settings.ORDER_BULK_MAX_ITEMS}"
+        )
+    if len(set(bulk.order_ids)) != len(bulk.order_ids):
+        raise HTTPException(status_code=400, detail="Duplicate order ids")
+    
+    target = OrderStatus[bulk.status.upper()]
+    updated_ids, rejected = bulk_transition_orders(db, bulk.order_ids, target)
+    if target == OrderStatus.CANCELLED:
+        record_orders_cancelled(db, updated_ids)
+    db.commit()
+    
+    updated = set(updated_ids)
+    return {
+        "updated_ids": sorted(updated_ids),
+        "rejected": [
+            {"id": order_id, "status": current.value}
+            for order_id, current in sorted(rejected.items())
+        ],
+        "not_found": [
+            order_id for order_id in bulk.order_ids
+            if order_id not in updated and order_id not in rejected
+        ],
+    }
+
+
+def sales_period(
+    date_from: Optional[date] = Query(None, description="Начало периода (по умолчанию 30 дней назад)"),
+    date_to: Optional[date] = Query(None, description="Конец периода включительно (по умолчанию сегодня, UTC)")
+) -> Tuple[date, date]:
+    """Период отчета с проверкой границ"""
+    date_to = date_to or datetime.now(timezone.utc).date()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    return date_from, date_to
+
+
+@router.get("/analytics/sales/daily", response_model=List[SalesDailyResponse], tags=["Analytics"])
+def get_daily_sales(
+    period: Tuple[date, date] = Depends(sales_period),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Выручка, число заказов и проданные единицы по дням (только администраторы)"""
+    return daily_sales(db, *period)
+
+
+@router.get("/analytics/sales/categories", response_model=List[SalesCategoryResponse], tags=["Analytics"])
+def get_category_sales(
+    period: Tuple[date, date] = Depends(sales_period),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Выручка и проданные единицы по категориям за период (только администраторы)"""
+    return category_sales(db, *period)
+
+
+@router.get("/analytics/sales/products", response_model=List[SalesProductResponse], tags=["Analytics"])
+def get_product_sales(
+    period: Tuple[date, date] = Depends(sales_period),
+    category_id: Optional[int] = Query(None, description="Только товары категории"),
+    limit: int = Query(20, ge=1, le=100, description="Количество товаров"),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Топ товаров по выручке за период (только администраторы)"""
+    return product_sales(db, *period, category_id=category_id, limit=limit)
@@ -0,0 +1,191 @@
+"""
+Регистрация, вход и профили пользователей; управление пользователями для администраторов
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.orm import Session, undefer
+
+from app.auth import (
+    get_password_hash, verify_password, authenticate_user, create_access_token,
+    get_current_active_user, get_current_admin_user
+)
+from app.config import settings
+from app.database import get_db
+from app.models import User
+from app.queries import user_search_filters, user_keyset_filter
+from app.schemas import (
+    PaginationParams, UserRegister, Token, UserUpdate, UserResponse, PasswordChange, AdminUserUpdate
+)
+from app.utils import paginate, create_paginated_response, encode_cursor, decode_cursor
+
+router = APIRouter()
+
+
+@router.post("/auth/register", response_model=UserResponse, status_code=201, tags=["Authentication"])
+def register(user_data: UserRegister, db: Session = Depends(get_db)):
+    """Регистрация нового пользователя"""
+    db_user = db.query(User).filter(User.email == user_data.email).first()
+    if db_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    
+    user_dict = user_data.model_dump()
+    user_dict['hashed_password'] = get_password_hash(user_dict.pop('password'))
+    
+    new_user = User(**user_dict)
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+    return new_user
+
+
+@router.post("/auth/login", response_model=Token, tags=["Authentication"])
+def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db)
+):
+    """Вход и получение токена доступа"""
+    user = authenticate_user(db, form_data.username, form_data.password)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.email}, expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router.get("/auth/me", response_model=UserResponse, tags=["Authentication"])
+async def read_users_me(current_user: User = Depends(get_current_active_user)):
+    """Получить информацию о текущем пользователе"""
+    return current_user
+
+
+@router.get("/users/me", response_model=UserResponse, tags=["Users"])
+async def get_my_profile(current_user: User = Depends(get_current_active_user)):
+    """Получить мой профиль"""
+    return current_user
+
+
+@router.put("/users/me", response_model=UserResponse, tags=["Users"])
+async def update_my_profile(
+    user_update: UserUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Обновить мой профиль"""
+    update_data = user_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(current_user, field, value)
+    
+    db.commit()
+    db.refresh(current_user)
+    return current_user
+
+
+@router.post("/users/me/change-password", tags=["Users"])
+async def change_password(
+    password_change: PasswordChange,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Изменить пароль пользователя (требуется аутентификация)"""
+    if not verify_password(password_change.current_password, current_user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Current password is incorrect"
+        )
+    
+    current_user.hashed_password = get_password_hash(password_change.new_password)
+    db.commit()
+    
+    return {"message": "Password changed successfully"}
+
+
+@router.get("/users", tags=["Users"])
+def get_users(
+    email: Optional[str] = Query(None, max_length=100, description="Начало email"),
+    name: Optional[str] = Query(None, max_length=100, description="Часть имени"),
+    is_active: Optional[int] = Query(None, ge=0, le=1, description="Фильтр по активности"),
+    is_admin: Optional[int] = Query(None, ge=0, le=1, description="Фильтр по роли администратора"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (next_cursor)"),
+    page: Optional[int] = Query(None, ge=1, description="Номер страницы: постраничный режим с total вместо курсора"),
+    page_size: int = Query(20, ge=1, le=100, description="Элементов на странице"),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Поиск пользователей (только администраторы).
+    Keyset-пагинация по (created_at, id) без OFFSET и подсчета total:
+    следующая страница запрашивается с cursor=next_cursor. Постраничный
+    режим с OFFSET и total включается только явным параметром page.
+    """
+    if cursor is not None and page is not None:
+        raise HTTPException(status_code=400, detail="Use either cursor or page")
+    
+    filters = user_search_filters(email, name, is_active, is_admin)
+    query = (
+        db.query(User)
+        .options(undefer(User.address))
+        .filter(*filters)
+        .order_by(User.created_at.desc(), User.id.desc())
+    )
+    
+    if page is not None:
+        users, meta = paginate(query, PaginationParams(page=page, page_size=page_size))
+        return create_paginated_response([UserResponse.model_validate(user) for user in users], meta)
+    
+    if cursor is not None:
+        try:
+            created_at, user_id = decode_cursor(cursor)
+            created_at = datetime.fromisoformat(created_at)
+            user_id = int(user_id)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(user_keyset_filter(created_at, user_id))
+    
+    users = query.limit(page_size + 1).all()
+    next_cursor = None
+    if len(users) > page_size:
+        users = users[:page_size]
+        next_cursor = encode_cursor((users[-1].created_at, users[-1].id))
+    return {"items": [UserResponse.model_validate(user) for user in users], "next_cursor": next_cursor}
+
+
+@router.put("/users/{user_id}", response_model=UserResponse, tags=["Users"])
+def update_user(
+    user_id: int,
+    user_update: AdminUserUpdate,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Обновить пользователя (только администраторы)"""
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    update_data = user_update.model_dump(exclude_unset=True)
+    
+    if current_user.id == user_id and 'is_admin' in update_data:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You cannot change your own admin status"
+        )
+    
+    for field, value in update_data.items():
+        setattr(user, field, value)
+    
+    db.commit()
+    db.refresh(user)
+    return user
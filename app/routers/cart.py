@@ -0,0 +1,126 @@
+"""
+Корзина текущего пользователя
+"""
+
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.auth import get_current_active_user
+from app.database import get_db
+from app.models import User, Product, CartItem
+from app.queries import cart_item_load_options
+from app.schemas import CartItemCreate, CartItemUpdate, CartItemResponse, CartResponse
+
+router = APIRouter()
+
+
+@router.post("/cart/items", response_model=CartItemResponse, status_code=201, tags=["Shopping Cart"])
+async def add_to_cart(
+    item: CartItemCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Добавить товар в мою корзину (требуется аутентификация)"""
+    product = db.query(Product).filter(Product.id == item.product_id).first()
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    if product.stock < item.quantity:
+        raise HTTPException(status_code=400, detail="Insufficient stock")
+    
+    cart_item = db.query(CartItem).filter(
+        CartItem.user_id == current_user.id,
+        CartItem.product_id == item.product_id
+    ).first()
+    
+    if cart_item:
+        cart_item.quantity += item.quantity
+        if product.stock < cart_item.quantity:
+            raise HTTPException(status_code=400, detail="Insufficient stock")
+    else:
+        cart_item = CartItem(user_id=current_user.id, **item.model_dump())
+        db.add(cart_item)
+    
+    try:
+        db.commit()
+    except IntegrityError:
+        # Параллельный запрос уже добавил этот товар (уникальный индекс user_id, product_id)
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Cart item was added concurrently, retry the request")
+    db.refresh(cart_item)
+    return cart_item
+
+
+@router.get("/cart", response_model=CartResponse, tags=["Shopping Cart"])
+async def get_my_cart(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Получить мою корзину (требуется аутентификация)"""
+    cart_items = db.query(CartItem).options(*cart_item_load_options()).filter(
+        CartItem.user_id == current_user.id
+    ).all()
+    
+    total = Decimal('0.00')
+    for item in cart_items:
+        total += item.product.price * item.quantity
+    
+    return {"items": cart_items, "total": total}
+
+
+@router.put("/cart/items/{item_id}", response_model=CartItemResponse, tags=["Shopping Cart"])
+async def update_cart_item(
+    item_id: int,
+    item_update: CartItemUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Обновить количество товара в корзине (требуется аутентификация)"""
+    cart_item = db.query(CartItem).filter(
+        CartItem.id == item_id,
+        CartItem.user_id == current_user.id
+    ).first()
+    
+    if not cart_item:
+        raise HTTPException(status_code=404, detail="Cart item not found")
+    
+    if cart_item.product.stock < item_update.quantity:
+        raise HTTPException(status_code=400, detail="Insufficient stock")
+    
+    cart_item.quantity = item_update.quantity
+    db.commit()
+    db.refresh(cart_item)
+    return cart_item
+
+
+@router.delete("/cart/items/{item_id}", tags=["Shopping Cart"])
+async def remove_from_cart(
+    item_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Удалить товар из моей корзины (требуется аутентификация)"""
+    cart_item = db.query(CartItem).filter(
+        CartItem.id == item_id,
+        CartItem.user_id == current_user.id
+    ).first()
+    
+    if not cart_item:
+        raise HTTPException(status_code=404, detail="Cart item not found")
+    
+    db.delete(cart_item)
+    db.commit()
+    return {"message": "Item removed from cart"}
+
+
+@router.delete("/cart", tags=["Shopping Cart"])
+async def clear_my_cart(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Очистить все товары из моей корзины (требуется аутентификация)"""
+    db.query(CartItem).filter(CartItem.user_id == current_user.id).delete()
+    db.commit()
+    return {"message": "Cart cleared"}
@@ -0,0 +1,319 @@
+"""
+Публичное чтение каталога: категории, товары, рейтинги и рекомендации.
+
+Роутер не изменяет данные, поэтому узлы с DEPLOY_ROLE=catalog могут работать
+с репликой только для чтения.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.auth import get_optional_admin_user
+from app.cache import product_cache, category_cache
+from app.config import settings
+from app.database import get_db
+from app.models import User, Category, Product
+from app.queries import (
+    category_load_options, product_load_options, product_list_filters, count_products, fetch_products
+)
+from app.rankings import get_ranking
+from app.recommendations import get_recommendations
+from app.schemas import (
+    PaginationParams, CategoryResponse, ProductResponse,
+    ProductBatchRequest, ProductBatchResponse, ProductRankingResponse, ProductRecommendationResponse,
+    PRODUCT_FIELDS, PRODUCT_SIDELOAD_FIELDS, get_product_fields_model
+)
+from app.utils import (
+    paginate, build_pagination_meta, create_paginated_response, parse_id_list, parse_fields, parse_include
+)
+
+router = APIRouter()
+
+
+@router.get("/categories/", tags=["Categories"])
+def get_categories(
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(20, ge=1, le=100, description="Элементов на странице"),
+    db: Session = Depends(get_db)
+):
+    """Получить все категории с пагинацией (публичный)"""
+    pagination = PaginationParams(page=page, page_size=page_size)
+    query = db.query(Category).options(*category_load_options())
+    
+    items, meta = paginate(query, pagination)
+    
+    return create_paginated_response(items, meta)
+
+
+@router.get("/categories/{category_id}", response_model=CategoryResponse, tags=["Categories"])
+def get_category(category_id: int, db: Session = Depends(get_db)):
+    """Получить конкретную категорию по ID (публичный)"""
+    category = db.query(Category).filter(Category.id == category_id).first()
+    if category is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return category
+
+
+def parse_product_fields(fields: Optional[str], sideload_category: bool = False) -> Optional[Tuple[str, ...]]:
+    """
+    Разбирает параметр fields= для товаров, None означает полный набор полей.
+    При вынесении категорий в included вложенная категория заменяется на category_id.
+    """
+    if fields is None and not sideload_category:
+        return None
+    try:
+        if not sideload_category:
+            return parse_fields(fields, PRODUCT_FIELDS)
+        requested = PRODUCT_SIDELOAD_FIELDS if fields is None else [
+            field for field in fields.split(",") if field.strip() != "category"
+        ]
+        return parse_fields(",".join(requested), PRODUCT_SIDELOAD_FIELDS, required=("id", "category_id"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def get_categories_by_ids(db: Session, category_ids: List[int]) -> Dict[int, CategoryResponse]:
+    """Получает категории по ID через кэш категорий, промахи загружаются одним запросом IN"""
+    found = category_cache.get_many(category_ids)
+    
+    to_load = [category_id for category_id in category_ids if category_id not in found]
+    if to_load:
+        categories = db.query(Category).options(*category_load_options()).filter(
+            Category.id.in_(to_load)
+        ).all()
+        loaded = {category.id: CategoryResponse.model_validate(category) for category in categories}
+        category_cache.set_many(loaded)
+        found.update(loaded)
+    
+    return found
+
+
+PRODUCT_FIELDS_QUERY = Query(
+    None,
+    description="Поля товара через запятую, например id,name,price,image_url (по умолчанию все)"
+)
+
+
+@router.get("/products/", tags=["Products"])
+async def get_products(
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(20, ge=1, le=100, description="Элементов на странице"),
+    category_id: Optional[int] = Query(None, description="Фильтр по ID категории"),
+    search: Optional[str] = Query(None, description="Поиск в названиях товаров"),
+    min_price: Optional[float] = Query(None, ge=0, description="Минимальная цена"),
+    max_price: Optional[float] = Query(None, ge=0, description="Максимальная цена"),
+    in_stock: Optional[bool] = Query(None, description="Фильтр по наличию на складе"),
+    include_inactive: Optional[bool] = Query(None, description="Включить неактивные товары (только для администраторов)"),
+    fields: Optional[str] = PRODUCT_FIELDS_QUERY,
+    include: Optional[str] = Query(
+        None,
+        description="Вынести связанные сущности в блок included без дублирования: category"
+    ),
+    admin_user: Optional[User] = Depends(get_optional_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Получить все товары с пагинацией и фильтрами"""
+    pagination = PaginationParams(page=page, page_size=page_size)
+    try:
+        includes = parse_include(include, ("category",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    product_fields = parse_product_fields(fields, sideload_category="category" in includes)
+    filters = product_list_filters(
+        category_id=category_id,
+        search=search,
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+        include_inactive=bool(include_inactive and admin_user)
+    )
+    
+    if admin_user is None:
+        # Анонимное чтение каталога: Core select без ORM-объектов и identity map
+        meta = build_pagination_meta(count_products(db, filters), pagination)
+        items = fetch_products(
+            db, filters, product_fields or PRODUCT_FIELDS,
+            order_by=Product.id.desc(), offset=pagination.skip, limit=pagination.limit
+        )
+    else:
+        query = db.query(Product).options(*product_load_options(product_fields or PRODUCT_FIELDS))
+        query = query.filter(*filters).order_by(Product.id.desc())
+        
+        items, meta = paginate(query, pagination)
+        fields_model = ProductResponse if product_fields is None else get_product_fields_model(product_fields)
+        items = [fields_model.model_validate(item) for item in items]
+    
+    included = None
+    if "category" in includes:
+        category_ids = sorted({item.category_id for item in items if item.category_id is not None})
+        included = {"categories": get_categories_by_ids(db, category_ids)}
+    
+    return create_paginated_response(items, meta, included)
+
+
+def get_products_by_ids(
+    db: Session,
+    product_ids: List[int],
+    fields: Optional[Tuple[str, ...]] = None
+) -> Tuple[list, List[int]]:
+    """
+    Получает товары по списку ID через кэш товаров.
+    Все промахи кэша загружаются одним запросом WHERE id IN (...).
+    Кэш хранит полное представление товара; при заданном fields попадания
+    сужаются без повторной валидации, а промахи читаются только нужными колонками.
+    Возвращает найденные товары в порядке запроса и список отсутствующих ID.
+    """
+    found = product_cache.get_many(product_ids)
+    if fields is not None:
+        fields_model = get_product_fields_model(fields)
+        found = {
+            product_id: fields_model.model_construct(**{field: getattr(product, field) for field in fields})
+            for product_id, product in found.items()
+        }
+    
+    to_load = [product_id for product_id in product_ids if product_id not in found]
+    if to_load:
+        products = fetch_products(db, [Product.id.in_(to_load)], fields or PRODUCT_FIELDS)
+        loaded = {product.id: product for product in products}
+        if fields is None:
+            product_cache.set_many(loaded)
+        found.update(loaded)
+    
+    items = [found[product_id] for product_id in product_ids if product_id in found]
+    missing = [product_id for product_id in product_ids if product_id not in found]
+    return items, missing
+
+
+def _get_products_batch(product_ids: List[int], fields: Optional[str], db: Session):
+    """Общая логика пакетного получения товаров"""
+    product_ids = list(dict.fromkeys(product_ids))
+    if len(product_ids) > settings.PRODUCT_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many product ids: maximum is {settings.PRODUCT_BATCH_MAX_SIZE}"
+        )
+    
+    product_fields = parse_product_fields(fields)
+    items, missing = get_products_by_ids(db, product_ids, product_fields)
+    if product_fields is not None:
+        return JSONResponse(jsonable_encoder({"items": items, "missing": missing}))
+    return {"items": items, "missing": missing}
+
+
+def _get_product_ranking(kind: str, category_id: Optional[int], limit: int, response: Response, db: Session) -> dict:
+    """Общая логика чтения предрассчитанного рейтинга товаров"""
+    product_ids = get_ranking(db, kind, category_id)
+    items, _ = get_products_by_ids(db, product_ids)
+    response.headers["Cache-Control"] = f"public, max-age={settings.RANKING_CACHE_TTL}"
+    return {
+        "kind": kind,
+        "category_id": category_id,
+        "items": [item for item in items if item.is_active == 1][:limit],
+    }
+
+
+@router.get("/products/bestsellers", response_model=ProductRankingResponse, tags=["Products"])
+def get_bestsellers(
+    response: Response,
+    category_id: Optional[int] = Query(None, description="Рейтинг внутри категории"),
+    limit: int = Query(10, ge=1, le=50, description="Количество товаров"),
+    db: Session = Depends(get_db)
+):
+    """Хиты продаж: продажи с медленным затуханием (публичный)"""
+    return _get_product_ranking("bestsellers", category_id, limit, response, db)
+
+
+@router.get("/products/trending", response_model=ProductRankingResponse, tags=["Products"])
+def get_trending(
+    response: Response,
+    category_id: Optional[int] = Query(None, description="Рейтинг внутри категории"),
+    limit: int = Query(10, ge=1, le=50, description="Количество товаров"),
+    db: Session = Depends(get_db)
+):
+    """Набирающие популярность товары: продажи последних дней (публичный)"""
+    return _get_product_ranking("trending", category_id, limit, response, db)
+
+
+@router.get("/products/batch", response_model=ProductBatchResponse, tags=["Products"])
+def get_products_batch(
+    ids: str = Query(..., description="ID товаров через запятую, например 3,1,2"),
+    fields: Optional[str] = PRODUCT_FIELDS_QUERY,
+    db: Session = Depends(get_db)
+):
+    """Получить несколько товаров по списку ID одним запросом (публичный)"""
+    try:
+        product_ids = parse_id_list(ids)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid product ids")
+    if not product_ids:
+        raise HTTPException(status_code=400, detail="No product ids provided")
+    
+    return _get_products_batch(product_ids, fields, db)
+
+
+@router.post("/products/batch", response_model=ProductBatchResponse, tags=["Products"])
+def get_products_batch_post(
+    batch: ProductBatchRequest,
+    fields: Optional[str] = PRODUCT_FIELDS_QUERY,
+    db: Session = Depends(get_db)
+):
+    """Получить несколько товаров по длинному списку ID в теле запроса (публичный)"""
+    return _get_products_batch(batch.ids, fields, db)
+
+
+@router.get("/products/{product_id}", response_model=ProductResponse, tags=["Products"])
+def get_product(
+    product_id: int,
+    fields: Optional[str] = PRODUCT_FIELDS_QUERY,
+    db: Session = Depends(get_db)
+):
+    """Получить конкретный товар по ID (публичный)"""
+    product_fields = parse_product_fields(fields)
+    items, _ = get_products_by_ids(db, [product_id], product_fields)
+    if not items:
+        raise HTTPException(status_code=404, detail="Product not found")
+    if product_fields is not None:
+        return JSONResponse(jsonable_encoder(items[0]))
+    return items[0]
+
+
+@router.get("/products/{product_id}/also-bought", response_model=ProductRecommendationResponse, tags=["Products"])
+def get_also_bought(
+    product_id: int,
+    limit: int = Query(10, ge=1, le=20, description="Количество товаров"),
+    db: Session = Depends(get_db)
+):
+    """С этим товаром покупают: предрассчитанные соседи по совместным покупкам (публичный)"""
+    product_ids = get_recommendations(db, "also_bought", product_id)
+    if not product_ids and not get_products_by_ids(db, [product_id])[0]:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    items, _ = get_products_by_ids(db, product_ids)
+    return {
+        "product_id": product_id,
+        "kind": "also_bought",
+        "items": [item for item in items if item.is_active == 1][:limit],
+    }
+
+
+@router.get("/products/{product_id}/similar", response_model=ProductRecommendationResponse, tags=["Products"])
+def get_similar_products(
+    product_id: int,
+    limit: int = Query(10, ge=1, le=20, description="Количество товаров"),
+    db: Session = Depends(get_db)
+):
+    """Похожие товары: предрассчитанные соседи по названию, описанию и категории (публичный)"""
+    product_ids = get_recommendations(db, "similar", product_id)
+    if not product_ids and not get_products_by_ids(db, [product_id])[0]:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    items, _ = get_products_by_ids(db, product_ids)
+    return {
+        "product_id": product_id,
+        "kind": "similar",
+        "items": [item for item in items if item.is_active == 1][:limit],
+    }
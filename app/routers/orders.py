@@ -0,0 +1,152 @@
+"""
+Оформление и просмотр заказов текущего пользователя
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, joinedload
+
+from app.analytics import sales_day, record_order_sales, record_order_status_change
+from app.auth import get_current_active_user
+from app.cache import product_cache
+from app.database import get_db
+from app.models import User, CartItem, Order, OrderItem, OrderStatus
+from app.queries import order_load_options, count_user_orders, fetch_order_summaries
+from app.rankings import record_product_sales
+from app.schemas import PaginationParams, OrderCreate, OrderUpdate, OrderResponse
+from app.utils import paginate, build_pagination_meta, create_paginated_response
+
+router = APIRouter()
+
+
+@router.post("/orders", response_model=OrderResponse, status_code=201, tags=["Orders"])
+async def create_order(
+    order_data: OrderCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Создать заказ из моей корзины (требуется аутентификация)"""
+    cart_items = db.query(CartItem).options(joinedload(CartItem.product)).filter(
+        CartItem.user_id == current_user.id
+    ).all()
+    if not cart_items:
+        raise HTTPException(status_code=400, detail="Cart is empty")
+    
+    total_amount = Decimal('0.00')
+    for cart_item in cart_items:
+        product = cart_item.product
+        if product.stock < cart_item.quantity:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Insufficient stock for product: {product.name}"
+            )
+        total_amount += product.price * cart_item.quantity
+    
+    # Время задается явно: по нему же заказ попадает в дневную сводку продаж
+    new_order = Order(
+        user_id=current_user.id,
+        total_amount=total_amount,
+        status=OrderStatus.PENDING,
+        created_at=datetime.now(timezone.utc),
+        **order_data.model_dump()
+    )
+    db.add(new_order)
+    db.flush()
+    
+    # Позиции одной вставкой (executemany), а не INSERT на каждую
+    db.execute(insert(OrderItem), [
+        {
+            "order_id": new_order.id,
+            "product_id": cart_item.product_id,
+            "quantity": cart_item.quantity,
+            "price": cart_item.product.price,
+        }
+        for cart_item in cart_items
+    ])
+    for cart_item in cart_items:
+        cart_item.product.stock -= cart_item.quantity
+    
+    ordered_product_ids = [cart_item.product_id for cart_item in cart_items]
+    record_order_sales(db, sales_day(new_order.created_at), [
+        (cart_item.product_id, cart_item.product.category_id, cart_item.quantity, cart_item.product.price)
+        for cart_item in cart_items
+    ])
+    record_product_sales(db, [(cart_item.product_id, cart_item.quantity) for cart_item in cart_items])
+    db.query(CartItem).filter(CartItem.user_id == current_user.id).delete()
+    
+    db.commit()
+    product_cache.delete_many(ordered_product_ids)
+    # Позиции с товарами загружаются вместе с заказом, а не отдельным запросом на каждую
+    return db.query(Order).filter(Order.id == new_order.id).options(*order_load_options()).one()
+
+
+@router.get("/orders", tags=["Orders"])
+async def get_my_orders(
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(20, ge=1, le=100, description="Элементов на странице"),
+    view: str = Query(
+        "full",
+        pattern="^(full|summary)$",
+        description="full - заказы с позициями и товарами, summary - краткие карточки без позиций"
+    ),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Получить все мои заказы с пагинацией (требуется аутентификация)"""
+    pagination = PaginationParams(page=page, page_size=page_size)
+    if view == "summary":
+        items = fetch_order_summaries(db, current_user.id, pagination.skip, pagination.limit)
+        meta = build_pagination_meta(count_user_orders(db, current_user.id), pagination)
+        return create_paginated_response(items, meta)
+    
+    query = db.query(Order).filter(Order.user_id == current_user.id).order_by(Order.created_at.desc(), Order.id.desc())
+    query = query.options(*order_load_options())
+    
+    items, meta = paginate(query, pagination)
+    
+    return create_paginated_response(items, meta)
+
+
+@router.get("/orders/{order_id}", response_model=OrderResponse, tags=["Orders"])
+async def get_my_order(
+    order_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Получить детали конкретного заказа (требуется аутентификация)"""
+    order = db.query(Order).filter(
+        Order.id == order_id,
+        Order.user_id == current_user.id
+    ).options(*order_load_options()).first()
+    
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    return order
+
+
+@router.put("/orders/{order_id}", response_model=OrderResponse, tags=["Orders"])
+async def update_my_order_status(
+    order_id: int,
+    order_update: OrderUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Обновить статус заказа (требуется аутентификация)"""
+    order = db.query(Order).filter(
+        Order.id == order_id,
+        Order.user_id == current_user.id
+    ).first()
+    
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    previous_status = order.status
+    order.status = OrderStatus[order_update.status.upper()]
+    record_order_status_change(db, order, previous_status)
+    db.commit()
+    db.refresh(order)
+    return order
@@ -0,0 +1,129 @@
+"""
+Отзывы на товары
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.auth import get_current_active_user
+from app.database import get_db
+from app.models import User, Product, Review
+from app.queries import review_list_load_options
+from app.schemas import PaginationParams, ReviewCreate, ReviewUpdate, ReviewResponse, ProductReviewResponse
+from app.utils import paginate, create_paginated_response
+
+router = APIRouter()
+
+
+@router.post("/reviews", response_model=ReviewResponse, status_code=201, tags=["Reviews"])
+async def create_review(
+    review: ReviewCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Создать отзыв на товар (требуется аутентификация)"""
+    product = db.query(Product).filter(Product.id == review.product_id).first()
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    existing_review = db.query(Review).filter(
+        Review.user_id == current_user.id,
+        Review.product_id == review.product_id
+    ).first()
+    
+    if existing_review:
+        raise HTTPException(status_code=400, detail="You already reviewed this product")
+    
+    new_review = Review(user_id=current_user.id, **review.model_dump())
+    db.add(new_review)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="You already reviewed this product")
+    db.refresh(new_review)
+    return new_review
+
+
+@router.get("/reviews/product/{product_id}", tags=["Reviews"])
+def get_product_reviews(
+    product_id: int,
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(20, ge=1, le=100, description="Элементов на странице"),
+    db: Session = Depends(get_db)
+):
+    """Получить все отзывы на товар с пагинацией (публичный)"""
+    product_exists = db.query(Product.id).filter(Product.id == product_id).first()
+    if not product_exists:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    pagination = PaginationParams(page=page, page_size=page_size)
+    query = db.query(Review).filter(Review.product_id == product_id).order_by(Review.created_at.desc())
+    query = query.options(*review_list_load_options())
+    
+    items, meta = paginate(query, pagination)
+    items = [ProductReviewResponse.model_validate(item) for item in items]
+    
+    return create_paginated_response(items, meta)
+
+
+@router.get("/reviews/my", tags=["Reviews"])
+async def get_my_reviews(
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(20, ge=1, le=100, description="Элементов на странице"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Получить все мои отзывы с пагинацией (требуется аутентификация)"""
+    pagination = PaginationParams(page=page, page_size=page_size)
+    query = db.query(Review).filter(Review.user_id == current_user.id).order_by(Review.created_at.desc())
+    
+    items, meta = paginate(query, pagination)
+    
+    return create_paginated_response(items, meta)
+
+
+@router.put("/reviews/{review_id}", response_model=ReviewResponse, tags=["Reviews"])
+async def update_my_review(
+    review_id: int,
+    review_update: ReviewUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Обновить мой отзыв (требуется аутентификация)"""
+    review = db.query(Review).filter(
+        Review.id == review_id,
+        Review.user_id == current_user.id
+    ).first()
+    
+    if not review:
+        raise HTTPException(status_code=404, detail="Review not found")
+    
+    update_data = review_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(review, field, value)
+    
+    db.commit()
+    db.refresh(review)
+    return review
+
+
+@router.delete("/reviews/{review_id}", tags=["Reviews"])
+async def delete_my_review(
+    review_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Удалить мой отзыв (требуется аутентификация)"""
+    review = db.query(Review).filter(
+        Review.id == review_id,
+        Review.user_id == current_user.id
+    ).first()
+    
+    if not review:
+        raise HTTPException(status_code=404, detail="Review not found")
+    
+    db.delete(review)
+    db.commit()
+    return {"message": "Review deleted successfully"}
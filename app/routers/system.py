@@ -0,0 +1,49 @@
+"""
+Служебные эндпоинты: корень, проверка живости и готовности экземпляра, метрики
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_db
+from app.metrics import render_metrics
+from app.migrate import readiness_gate
+
+router = APIRouter()
+
+
+@router.get("/")
+def read_root():
+    """Корневой эндпоинт"""
+    return {
+        "message": "Welcome to the E-Commerce API",
+        "status": "running",
+        "version": "3.0.0",
+        "docs": "/docs",
+        "authentication": "enabled"
+    }
+
+
+@router.get("/health")
+def health_check():
+    """Эндпоинт проверки состояния"""
+    return {"status": "healthy"}
+
+
+@router.get("/ready")
+def readiness_check(db: Session = Depends(get_db)):
+    """Готовность принимать трафик: схема БД в версии head (503, пока идут миграции)"""
+    if not readiness_gate.check(db.connection()):
+        return JSONResponse(status_code=503, content={"status": "waiting for migrations"})
+    return {"status": "ready"}
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Метрики в формате Prometheus"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not found")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -26,6 +26,19 @@ from .schemas import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
+    ProductBatchRequest,
+    ProductBatchResponse,
+    PRODUCT_FIELDS,
+    PRODUCT_SIDELOAD_FIELDS,
+    get_product_fields_model,
+    ProductRankingResponse,
+    ProductRecommendationResponse,
+    ProductImportError,
+    ProductImportResponse,
+    ProductBulkItem,
+    ProductPriceAdjustment,
+    ProductBulkUpdate,
+    ProductBulkUpdateResponse,
     # Cart
     CartItemCreate,
     CartItemUpdate,
@@ -34,12 +47,24 @@ from .schemas import (
     # Orders
     OrderCreate,
     OrderUpdate,
+    ORDER_STATUS_PATTERN,
     OrderResponse,
+    OrderSummaryResponse,
+    AdminOrderResponse,
+    OrderStatusBulkUpdate,
+    OrderStatusRejected,
+    OrderStatusBulkUpdateResponse,
     OrderItemResponse,
     # Reviews
     ReviewCreate,
     ReviewUpdate,
-    ReviewResponse
+    ReviewResponse,
+    ReviewAuthorResponse,
+    ProductReviewResponse,
+    # Analytics
+    SalesDailyResponse,
+    SalesCategoryResponse,
+    SalesProductResponse
 )
 
 __all__ = [
@@ -61,16 +86,40 @@ __all__ = [
     "ProductCreate",
     "ProductUpdate",
     "ProductResponse",
+    "ProductBatchRequest",
+    "ProductBatchResponse",
+    "PRODUCT_FIELDS",
+    "PRODUCT_SIDELOAD_FIELDS",
+    "get_product_fields_model",
+    "ProductRankingResponse",
+    "ProductRecommendationResponse",
+    "ProductImportError",
+    "ProductImportResponse",
+    "ProductBulkItem",
+    "ProductPriceAdjustment",
+    "ProductBulkUpdate",
+    "ProductBulkUpdateResponse",
     "CartItemCreate",
     "CartItemUpdate",
     "CartItemResponse",
     "CartResponse",
     "OrderCreate",
     "OrderUpdate",
+    "ORDER_STATUS_PATTERN",
     "OrderResponse",
+    "OrderSummaryResponse",
+    "AdminOrderResponse",
+    "OrderStatusBulkUpdate",
+    "OrderStatusRejected",
+    "OrderStatusBulkUpdateResponse",
     "OrderItemResponse",
     "ReviewCreate",
     "ReviewUpdate",
-    "ReviewResponse"
+    "ReviewResponse",
+    "ReviewAuthorResponse",
+    "ProductReviewResponse",
+    "SalesDailyResponse",
+    "SalesCategoryResponse",
+    "SalesProductResponse"
 ]
 
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, Field, condecimal, ConfigDict
-from datetime import datetime
-from typing import Optional, List, Generic, TypeVar
+from pydantic import BaseModel, EmailStr, Field, condecimal, ConfigDict, create_model, model_validator
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional, List, Generic, TypeVar, Tuple, Type
 from decimal import Decimal
 
 T = TypeVar('T')
@@ -134,6 +135,7 @@ class CategoryResponse(BaseModel):
 
 class ProductCreate(BaseModel):
     """Схема для создания товара"""
+    sku: Optional[str] = Field(None, min_length=1, max_length=64)
     name: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = None
     price: condecimal(max_digits=10, decimal_places=2, gt=0)
@@ -145,6 +147,7 @@ class ProductCreate(BaseModel):
 
 class ProductUpdate(BaseModel):
     """Схема для обновления товара"""
+    sku: Optional[str] = Field(None, min_length=1, max_length=64)
     name: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = None
     price: Optional[condecimal(max_digits=10, decimal_places=2, gt=0)] = None
@@ -157,6 +160,7 @@ class ProductUpdate(BaseModel):
 class ProductResponse(BaseModel):
     """Схема ответа с товаром"""
     id: int
+    sku: Optional[str] = None
     name: str
     description: Optional[str] = None
     price: Decimal
@@ -171,6 +175,117 @@ class ProductResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+PRODUCT_FIELDS: Tuple[str, ...] = tuple(ProductResponse.model_fields)
+
+# Полный набор полей при вынесении категорий в included (include=category)
+PRODUCT_SIDELOAD_FIELDS: Tuple[str, ...] = tuple(field for field in PRODUCT_FIELDS if field != "category")
+
+# Наборов fields= 2^11, построить все при импорте слишком дорого (~0.7 мс на схему).
+# Схема создается при первом запросе с новым набором, клиенты используют единицы
+# наборов; предел не дает произвольным fields= раздувать память процесса.
+PRODUCT_FIELDS_MODEL_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=PRODUCT_FIELDS_MODEL_CACHE_SIZE)
+def get_product_fields_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Возвращает схему ответа товара, суженную до набора полей.
+    Схемы создаются один раз на каждый набор полей и переиспользуются,
+    схема для PRODUCT_SIDELOAD_FIELDS строится при импорте.
+    
+    Аргументы:
+        fields: Нормализованный кортеж полей из PRODUCT_FIELDS
+    """
+    definitions = {
+        name: (ProductResponse.model_fields[name].annotation, ProductResponse.model_fields[name])
+        for name in fields
+    }
+    return create_model(
+        "ProductResponse_" + "_".join(fields),
+        __config__=ConfigDict(from_attributes=True),
+        **definitions
+    )
+
+
+get_product_fields_model(PRODUCT_SIDELOAD_FIELDS)
+
+
+class ProductBatchRequest(BaseModel):
+    """Схема запроса пакетного получения товаров"""
+    ids: List[int] = Field(..., min_length=1, description="ID товаров в нужном порядке")
+
+
+class ProductBatchResponse(BaseModel):
+    """Схема ответа пакетного получения товаров"""
+    items: List[ProductResponse]
+    missing: List[int] = Field(default_factory=list, description="ID товаров, которые не найдены")
+
+
+class ProductRankingResponse(BaseModel):
+    """Схема рейтинга товаров (хиты продаж, набирающие популярность)"""
+    kind: str
+    category_id: Optional[int] = None
+    items: List[ProductResponse]
+
+
+class ProductRecommendationResponse(BaseModel):
+    """Схема рекомендаций к товару"""
+    product_id: int
+    kind: str
+    items: List[ProductResponse]
+
+
+class ProductImportError(BaseModel):
+    """Ошибка в строке импорта товаров"""
+    row: int = Field(..., description="Номер строки данных (с 1, без заголовка CSV)")
+    errors: List[str]
+
+
+class ProductImportResponse(BaseModel):
+    """Схема отчета об импорте товаров"""
+    processed: int = Field(..., description="Прочитано строк")
+    imported: int = Field(..., description="Вставлено или обновлено товаров")
+    failed: int = Field(..., description="Строк с ошибками")
+    errors: List[ProductImportError] = Field(default_factory=list, description="Ошибки по строкам (первые N)")
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+class ProductBulkItem(BaseModel):
+    """Изменение одного товара в массовом обновлении"""
+    id: int
+    price: Optional[condecimal(max_digits=10, decimal_places=2, gt=0)] = None
+    stock: Optional[int] = Field(None, ge=0)
+    is_active: Optional[int] = Field(None, ge=0, le=1)
+    
+    @model_validator(mode="after")
+    def check_has_changes(self) -> "ProductBulkItem":
+        """Запись без изменяемых полей не обновила бы товар"""
+        if self.price is None and self.stock is None and self.is_active is None:
+            raise ValueError("At least one of price, stock or is_active is required")
+        return self
+
+
+class ProductPriceAdjustment(BaseModel):
+    """Относительное изменение цен товаров категории"""
+    category_id: int
+    percent: condecimal(max_digits=6, decimal_places=2, gt=-100, le=1000) = Field(
+        ..., description="Изменение цены в процентах, например -10 для скидки 10%"
+    )
+
+
+class ProductBulkUpdate(BaseModel):
+    """Схема массового обновления цен, остатков и активности товаров"""
+    items: List[ProductBulkItem] = Field(default_factory=list)
+    price_adjustment: Optional[ProductPriceAdjustment] = None
+
+
+class ProductBulkUpdateResponse(BaseModel):
+    """Схема ответа массового обновления товаров"""
+    updated_ids: List[int]
+    not_found: List[int] = Field(default_factory=list)
+
+
 class CartItemCreate(BaseModel):
     """Схема для добавления товара в корзину"""
     product_id: int
@@ -225,9 +340,12 @@ class OrderCreate(BaseModel):
     notes: Optional[str] = None
 
 
+ORDER_STATUS_PATTERN = "^(pending|confirmed|shipped|delivered|cancelled)$"
+
+
 class OrderUpdate(BaseModel):
     """Схема для обновления статуса заказа"""
-    status: str = Field(..., pattern="^(pending|confirmed|shipped|delivered|cancelled)$")
+    status: str = Field(..., pattern=ORDER_STATUS_PATTERN)
 
 
 class OrderResponse(BaseModel):
@@ -246,6 +364,47 @@ class OrderResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class OrderSummaryResponse(BaseModel):
+    """Схема краткой карточки заказа для истории заказов"""
+    id: int
+    status: str
+    total_amount: Decimal
+    created_at: Optional[datetime] = None
+    items_count: int
+    units: int
+    first_product_id: Optional[int] = None
+    first_product_name: Optional[str] = None
+    first_product_image_url: Optional[str] = None
+
+
+class AdminOrderResponse(BaseModel):
+    """Схема строки списка заказов для администратора"""
+    id: int
+    user_id: int
+    status: str
+    total_amount: Decimal
+    created_at: Optional[datetime] = None
+
+
+class OrderStatusBulkUpdate(BaseModel):
+    """Схема массовой смены статуса заказов"""
+    order_ids: List[int] = Field(..., min_length=1)
+    status: str = Field(..., pattern=ORDER_STATUS_PATTERN)
+
+
+class OrderStatusRejected(BaseModel):
+    """Заказ, статус которого нельзя перевести в целевой"""
+    id: int
+    status: str
+
+
+class OrderStatusBulkUpdateResponse(BaseModel):
+    """Схема ответа массовой смены статуса заказов"""
+    updated_ids: List[int]
+    rejected: List[OrderStatusRejected] = Field(default_factory=list)
+    not_found: List[int] = Field(default_factory=list)
+
+
 class ReviewCreate(BaseModel):
     """Схема для создания отзыва"""
     product_id: int
@@ -272,3 +431,52 @@ class ReviewResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+
+
+class ReviewAuthorResponse(BaseModel):
+    """Схема автора отзыва в публичных списках"""
+    id: int
+    name: str
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductReviewResponse(BaseModel):
+    """Схема отзыва в публичном списке отзывов на товар"""
+    id: int
+    user_id: int
+    product_id: int
+    rating: int
+    comment: Optional[str] = None
+    user: ReviewAuthorResponse
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SalesDailyResponse(BaseModel):
+    """Схема дневной сводки продаж"""
+    day: date
+    orders_count: int
+    units: int
+    revenue: Decimal
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SalesCategoryResponse(BaseModel):
+    """Схема продаж категории за период"""
+    category_id: Optional[int] = None
+    category_name: Optional[str] = None
+    units: int
+    revenue: Decimal
+
+
+class SalesProductResponse(BaseModel):
+    """Схема продаж товара за период"""
+    product_id: int
+    name: str
+    orders_count: int
+    units: int
+    revenue: Decimal
@@ -0,0 +1,177 @@
+"""
+Production-сервер: gunicorn с воркерами uvicorn.
+
+Число воркеров считается по квоте CPU контейнера (cgroup v2/v1) и
+привязке процесса к ядрам, а не по числу ядер хоста. Бюджет соединений
+с БД экземпляра (SERVE_DB_CONNECTIONS) делится между воркерами. Приложение
+импортируется в мастере до fork (preload): импорт не обращается к БД,
+а пул каждого воркера после fork начинается с чистого листа. Воркеры
+перезапускаются после SERVE_MAX_REQUESTS запросов со случайным разбросом,
+чтобы не уходить на перезапуск одновременно. Метрики Prometheus воркеров
+собираются через общий каталог PROMETHEUS_MULTIPROC_DIR (app/metrics.py).
+
+Сигналы мастеру: TERM - плавная остановка (SERVE_GRACEFUL_TIMEOUT),
+HUP - плавный перезапуск воркеров. HUP ничего не перечитывает: приложение
+загружено в мастере (preload), а число воркеров и размер пула посчитаны
+при старте, поэтому новые воркеры получают прежние код и настройки.
+Новый код и настройки применяются без простоя так: USR2 запускает новый
+мастер (заново выполняет python -m app.serve на тех же сокетах), после
+запуска его воркеров старому мастеру отправляется TERM.
+
+Запуск: python -m app.serve [--workers N] [--bind HOST:PORT] [--print-config]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+from gunicorn.app.base import BaseApplication
+
+from app.config import settings
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+WORKER_CLASS = "uvicorn.workers.UvicornWorker"
+
+
+def cpu_limit(cgroup_root: Path = CGROUP_ROOT) -> float:
+    """
+    Доступные процессу ядра: минимум из квоты cgroup и привязки к CPU
+
+    Аргументы:
+        cgroup_root: Корень файловой системы cgroup
+
+    Возвращает:
+        Число ядер, может быть дробным при квоте вида 1.5 CPU
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = float(len(os.sched_getaffinity(0)))
+    else:
+        cpus = float(os.cpu_count() or 1)
+
+    quota = None
+    cpu_max = cgroup_root / "cpu.max"
+    cfs_quota = cgroup_root / "cpu" / "cpu.cfs_quota_us"
+    try:
+        if cpu_max.exists():
+            limit, period = cpu_max.read_text().split()[:2]
+            if limit != "max":
+                quota = int(limit) / int(period)
+        elif cfs_quota.exists():
+            limit = int(cfs_quota.read_text())
+            if limit > 0:
+                quota = limit / int((cgroup_root / "cpu" / "cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        quota = None
+
+    return min(cpus, quota) if quota else cpus
+
+
+def worker_count(cpus: float, workers: Optional[int] = None) -> int:
+    """Число воркеров: явное значение или SERVE_WORKERS_PER_CORE на ядро, не больше SERVE_MAX_WORKERS"""
+    workers = workers or settings.SERVE_WORKERS
+    if workers:
+        return workers
+    return max(1, min(math.ceil(cpus * settings.SERVE_WORKERS_PER_CORE), settings.SERVE_MAX_WORKERS))
+
+
+def pool_limits(workers: int) -> Tuple[int, int]:
+    """
+    Размер пула воркера из бюджета соединений экземпляра
+
+    Бюджет SERVE_DB_CONNECTIONS делится поровну; доля постоянных соединений
+    сохраняет соотношение DB_POOL_SIZE / DB_MAX_OVERFLOW.
+
+    Возвращает:
+        (pool_size, max_overflow) одного воркера
+    """
+    per_worker = max(1, settings.SERVE_DB_CONNECTIONS // workers)
+    share = settings.DB_POOL_SIZE / (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    pool_size = max(1, int(per_worker * share))
+    return pool_size, max(0, per_worker - pool_size)
+
+
+def _on_starting(server) -> None:
+    # USR2 по умолчанию выполняет python app/serve.py: так пакет app не импортируется
+    server.START_CTX["args"] = [sys.executable, "-m", "app.serve", *sys.argv[1:]]
+
+
+def _post_fork(server, worker) -> None:
+    # Соединения, унаследованные от мастера, не используются воркером и не закрываются им
+    from app.database import engine
+    engine.dispose(close=False)
+
+
+def _child_exit(server, worker) -> None:
+    # Живые gauge ушедшего воркера больше не суммируются в /metrics
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def gunicorn_options(workers: int, bind: Optional[str] = None) -> dict:
+    """Настройки gunicorn для заданного числа воркеров"""
+    return {
+        "bind": bind or settings.SERVE_BIND,
+        "workers": workers,
+        "worker_class": WORKER_CLASS,
+        "preload_app": True,
+        "max_requests": settings.SERVE_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVE_MAX_REQUESTS_JITTER,
+        "timeout": settings.SERVE_TIMEOUT,
+        "graceful_timeout": settings.SERVE_GRACEFUL_TIMEOUT,
+        "keepalive": settings.SERVE_KEEPALIVE,
+        "accesslog": None,
+        "errorlog": "-",
+        "on_starting": _on_starting,
+        "post_fork": _post_fork,
+        "child_exit": _child_exit,
+    }
+
+
+class Server(BaseApplication):
+    """Gunicorn с настройками из словаря вместо командной строки"""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, help="Число воркеров вместо расчета по CPU")
+    parser.add_argument("--bind", help="Адрес HOST:PORT (по умолчанию SERVE_BIND)")
+    parser.add_argument("--print-config", action="store_true", help="Показать расчет и выйти")
+    args = parser.parse_args()
+
+    cpus = cpu_limit()
+    workers = worker_count(cpus, args.workers)
+    # Движок создается при импорте приложения в мастере, поэтому размер пула задается до него
+    settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW = pool_limits(workers)
+    options = gunicorn_options(workers, args.bind)
+
+    if args.print_config:
+        report = {key: value for key, value in options.items() if not callable(value)}
+        report.update(cpus=cpus, db_pool_size=settings.DB_POOL_SIZE, db_max_overflow=settings.DB_MAX_OVERFLOW)
+        print(json.dumps(report, indent=2))
+        return
+
+    # Метрики воркеров складываются в общий каталог; задается до импорта приложения
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="eshop-metrics-"))
+    Server(options).run()
+
+
+if __name__ == "__main__":
+    main()
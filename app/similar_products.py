@@ -0,0 +1,282 @@
+"""
+Офлайн-задача "похожие товары" по содержимому карточки (TF-IDF).
+
+Документ товара - токены названия (с весом SIMILAR_NAME_WEIGHT), описания
+и псевдотокен категории. Векторы TF-IDF (сублинейный tf, L2-нормировка)
+хранятся в разреженном CSR-виде на NumPy-массивах, плюс инвертированный
+индекс по термам. Косинусная близость считается блоками строк: блок
+разреженных запросов умножается на весь каталог через инвертированный
+индекс, результат - плотная матрица блок x каталог ограниченного размера
+(SIMILAR_BLOCK_CELLS), из которой берутся top-K соседей.
+
+create_product/update_product ставят товар в очередь product_similarity_queue.
+Инкрементальный запуск пересчитывает списки измененных товаров и товаров,
+чьи списки на них ссылаются, а в остальные списки добавляет измененные
+товары, если они попали в top-K. Первый запуск и --full считают весь каталог.
+"""
+
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import and_, delete, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Product, ProductRecommendation, ProductSimilarityQueue
+from app.recommendations import get_job_state, mark_job_run, replace_recommendations
+
+JOB_NAME = "similar_products"
+KIND = "similar"
+
+# Сколько лучших соседей измененного товара проверяется на попадание в чужие списки
+REVERSE_CANDIDATES_FACTOR = 4
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Слова в нижнем регистре без однобуквенных и чисел"""
+    if not text:
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1 and not token.isdigit()]
+
+
+def document_terms(name: str, description: Optional[str], category_id: Optional[int]) -> Counter:
+    """Частоты термов документа товара"""
+    terms = Counter()
+    for token in tokenize(name):
+        terms[token] += settings.SIMILAR_NAME_WEIGHT
+    terms.update(tokenize(description))
+    if category_id is not None:
+        terms[f"__category_{category_id}"] += 1
+    return terms
+
+
+class TfidfMatrix:
+    """
+    Нормированные TF-IDF векторы каталога.
+
+    Строки хранятся в CSR (indptr, indices, data), столбцы - в виде
+    инвертированного индекса (term_indptr, term_rows, term_data).
+    """
+
+    def __init__(self, product_ids: Sequence[int], documents: List[Counter]):
+        self.product_ids = np.asarray(product_ids, dtype=np.int64)
+        self.row_of = {int(product_id): row for row, product_id in enumerate(self.product_ids)}
+        size = len(documents)
+
+        vocabulary: Dict[str, int] = {}
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        indices, counts = [], []
+        for row, terms in enumerate(documents):
+            for term, count in terms.items():
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+            indptr[row + 1] = len(indices)
+        indices = np.asarray(indices, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.float64)
+
+        # Слишком частые термы (стоп-слова каталога) не различают товары
+        df = np.bincount(indices, minlength=len(vocabulary)).astype(np.float64)
+        idf = np.log((1 + size) / (1 + df)) + 1
+        idf[df > max(settings.SIMILAR_MAX_DF * size, 1)] = 0
+        category_terms = [index for term, index in vocabulary.items() if term.startswith("__category_")]
+        idf[category_terms] *= settings.SIMILAR_CATEGORY_WEIGHT
+
+        data = (1 + np.log(counts)) * idf[indices]
+        rows = np.repeat(np.arange(size), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=size))
+        norms[norms == 0] = 1
+        data /= norms[rows]
+
+        nonzero = data > 0
+        self.indptr = np.r_[0, np.cumsum(np.bincount(rows[nonzero], minlength=size))]
+        self.indices = indices[nonzero]
+        self.data = data[nonzero]
+        rows = rows[nonzero]
+
+        order = np.argsort(self.indices, kind="stable")
+        self.term_indptr = np.r_[0, np.cumsum(np.bincount(self.indices, minlength=len(vocabulary)))]
+        self.term_rows = rows[order]
+        self.term_data = self.data[order]
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+    def similarity_block(self, rows: np.ndarray) -> np.ndarray:
+        """Косинусная близость строк rows со всем каталогом: матрица len(rows) x len(self)"""
+        size = len(self)
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        entries = _ranges(starts, lengths)
+        local = np.repeat(np.arange(len(rows)), lengths)
+        terms = self.indices[entries]
+        weights = self.data[entries]
+
+        posting_starts = self.term_indptr[terms]
+        posting_lengths = self.term_indptr[terms + 1] - posting_starts
+        postings = _ranges(posting_starts, posting_lengths)
+        source = np.repeat(np.arange(len(terms)), posting_lengths)
+
+        scores = np.bincount(
+            local[source] * size + self.term_rows[postings],
+            weights=weights[source] * self.term_data[postings],
+            minlength=len(rows) * size
+        )
+        return scores.reshape(len(rows), size)
+
+
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Склеенные диапазоны [start, start + length) без цикла Python"""
+    total = int(lengths.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets
+
+
+def top_k_rows(scores: np.ndarray, rows: np.ndarray, k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Top-k столбцов каждой строки блока по убыванию оценки, без самого товара и нулей"""
+    scores[np.arange(len(rows)), rows] = 0
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return [(np.empty(0, dtype=np.int64), np.empty(0)) for _ in rows]
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+    return [(columns[values > 0], values[values > 0]) for columns, values in zip(candidates, candidate_scores)]
+
+
+def load_matrix(db: Session) -> TfidfMatrix:
+    """Строит TF-IDF векторы активных товаров, читая каталог пачками"""
+    product_ids, documents = [], []
+    result = db.execute(
+        select(Product.id, Product.name, Product.description, Product.category_id)
+        .where(Product.is_active == 1)
+        .order_by(Product.id)
+        .execution_options(yield_per=1000)
+    )
+    for product_id, name, description, category_id in result:
+        product_ids.append(product_id)
+        documents.append(document_terms(name, description, category_id))
+    return TfidfMatrix(product_ids, documents)
+
+
+def compute_neighbours(
+    matrix: TfidfMatrix,
+    rows: Iterable[int],
+    top_k: int
+) -> Iterable[Tuple[int, np.ndarray, np.ndarray]]:
+    """Соседи строк блоками по SIMILAR_BLOCK_CELLS ячеек: (строка, строки соседей, оценки)"""
+    rows = np.asarray(sorted(rows), dtype=np.int64)
+    block_size = max(1, settings.SIMILAR_BLOCK_CELLS // max(len(matrix), 1))
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        scores = matrix.similarity_block(block)
+        for row, (columns, values) in zip(block.tolist(), top_k_rows(scores, block, top_k)):
+            yield row, columns, values
+
+
+def _referencing_products(db: Session, product_ids: Set[int]) -> Set[int]:
+    """Товары, в чьих списках похожих есть хотя бы один из product_ids"""
+    referencing = set()
+    ids = sorted(product_ids)
+    for start in range(0, len(ids), 1000):
+        referencing.update(db.execute(
+            select(ProductRecommendation.product_id).where(
+                ProductRecommendation.kind == KIND,
+                ProductRecommendation.recommended_id.in_(ids[start:start + 1000])
+            )
+        ).scalars())
+    return referencing
+
+
+def _merge_into_lists(db: Session, candidates: Dict[int, List[Tuple[int, float]]], top_k: int) -> int:
+    """Добавляет измененные товары в существующие списки, если они проходят в top-K"""
+    written = 0
+    product_ids = sorted(candidates)
+    for start in range(0, len(product_ids), 500):
+        batch = product_ids[start:start + 500]
+        current = defaultdict(list)
+        for product_id, recommended_id, score in db.execute(
+            select(ProductRecommendation.product_id, ProductRecommendation.recommended_id, ProductRecommendation.score)
+            .where(ProductRecommendation.kind == KIND, ProductRecommendation.product_id.in_(batch))
+            .order_by(ProductRecommendation.product_id, ProductRecommendation.position)
+        ):
+            current[product_id].append((recommended_id, score))
+
+        updated = {}
+        for product_id in batch:
+            existing = current[product_id]
+            merged = sorted(existing + candidates[product_id], key=lambda item: (-item[1], item[0]))[:top_k]
+            if merged != existing:
+                updated[product_id] = merged
+        written += replace_recommendations(db, KIND, updated)
+    return written
+
+
+def build_similar_products(db: Session, full: bool = False) -> dict:
+    """
+    Пересчитывает похожие товары для измененных товаров (или всего каталога)
+
+    Аргументы:
+        db: Сессия БД
+        full: Пересчитать списки всех товаров
+
+    Возвращает:
+        Отчет: catalog, queued, refreshed, merged, rows_written
+    """
+    top_k = settings.RECOMMENDATION_TOP_K
+    state = get_job_state(db, JOB_NAME)
+    queued = db.execute(select(ProductSimilarityQueue.product_id, ProductSimilarityQueue.queued_at)).all()
+    full = full or state.last_run_at is None
+
+    matrix = load_matrix(db)
+    touched = {product_id for product_id, _ in queued if product_id in matrix.row_of}
+    if full:
+        refresh = set(matrix.row_of)
+    else:
+        refresh = touched | (_referencing_products(db, {product_id for product_id, _ in queued}) & set(matrix.row_of))
+
+    written = 0
+    reverse: Dict[int, List[Tuple[int, float]]] = defaultdict(list)
+    neighbours: Dict[int, List[Tuple[int, float]]] = {}
+    ids = matrix.product_ids
+    reverse_k = top_k * REVERSE_CANDIDATES_FACTOR
+
+    for row, columns, values in compute_neighbours(matrix, (matrix.row_of[p] for p in refresh), reverse_k):
+        product_id = int(ids[row])
+        ranked = list(zip(ids[columns].tolist(), values.tolist()))
+        neighbours[product_id] = ranked[:top_k]
+        if product_id in touched and not full:
+            for other_id, score in ranked:
+                if other_id not in refresh:
+                    reverse[other_id].append((product_id, score))
+        if len(neighbours) >= 500:
+            written += replace_recommendations(db, KIND, neighbours)
+            db.commit()
+            neighbours = {}
+    written += replace_recommendations(db, KIND, neighbours)
+
+    merged = 0
+    if reverse:
+        merged = len(reverse)
+        written += _merge_into_lists(db, reverse, top_k)
+
+    # Из очереди удаляются только записи, не обновленные во время пересчета
+    for product_id, queued_at in queued:
+        db.execute(delete(ProductSimilarityQueue).where(and_(
+            ProductSimilarityQueue.product_id == product_id,
+            ProductSimilarityQueue.queued_at == queued_at
+        )))
+    mark_job_run(state)
+    db.commit()
+    return {
+        "catalog": len(matrix),
+        "queued": len(queued),
+        "refreshed": len(refresh),
+        "merged": merged,
+        "rows_written": written,
+    }
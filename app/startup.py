@@ -0,0 +1,193 @@
+"""
+Запуск экземпляра приложения по фазам.
+
+Импорт app.main не обращается к БД. Все действия с базой выполняются
+в lifespan, по очереди:
+    schema     - проверка, что схема в версии head Alembic (вместо create_all);
+    pool       - прогрев пула: заранее открываются DB_POOL_WARMUP соединений;
+    bootstrap  - создание первого администратора (кроме ролей только для чтения);
+    caches     - заполнение кэша категорий и общих рейтингов.
+После этого экземпляр отмечается готовым и /ready отвечает 200.
+Длительность каждой фазы пишется в лог и сохраняется в отчете запуска.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.auth import get_password_hash
+from app.cache import category_cache
+from app.config import settings
+from app.migrate import readiness_gate, schema_is_current
+from app.models import Category, User
+from app.queries import category_load_options
+from app.rankings import RANKING_KINDS, get_ranking
+from app.routers import is_read_only_role
+from app.schemas import CategoryResponse
+
+# Логгер uvicorn: сообщения запуска видны без отдельной настройки логирования
+logger = logging.getLogger("uvicorn.error")
+
+SCHEMA_CHECK_MODES = ("require", "warn", "off")
+
+
+class StartupTimings(dict):
+    """Длительность фаз запуска в миллисекундах, в порядке выполнения"""
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self[name] = (time.perf_counter() - started) * 1000
+            logger.info("Startup phase %s: %.1f ms", name, self[name])
+
+    @property
+    def total(self) -> float:
+        return sum(self.values())
+
+
+def verify_schema(engine: Engine, mode: str) -> bool:
+    """
+    Сверяет версию схемы с head Alembic
+
+    Аргументы:
+        engine: Движок БД
+        mode: require - остановить запуск, warn - только предупредить, off - не проверять
+
+    Возвращает:
+        True, если схема в версии head
+
+    Исключения:
+        RuntimeError: Схема отстает от head в режиме require
+    """
+    if mode not in SCHEMA_CHECK_MODES:
+        raise ValueError(f"STARTUP_SCHEMA_CHECK must be one of: {', '.join(SCHEMA_CHECK_MODES)}")
+    if mode == "off":
+        return False
+    with engine.connect() as connection:
+        current = schema_is_current(connection)
+    if not current:
+        message = "Database schema is not at Alembic head, run `python -m app.migrate`"
+        if mode == "require":
+            raise RuntimeError(message)
+        logger.warning(message)
+    return current
+
+
+def warm_pool(engine: Engine, connections: int) -> int:
+    """
+    Открывает connections соединений одновременно и возвращает их в пул
+
+    Количество ограничено постоянным размером пула: соединения сверх него
+    пул закрыл бы сразу после возврата.
+
+    Возвращает:
+        Число открытых соединений
+    """
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        connections = min(connections, size())
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def bootstrap_admin(db: Session) -> None:
+    """Создает первого администратора из переменных окружения, если администраторов нет"""
+    if db.execute(select(User.id).where(User.is_admin == 1).limit(1)).first():
+        logger.info("Administrators already exist, skipping first admin bootstrap")
+        return
+    if not (settings.FIRST_ADMIN_EMAIL and settings.FIRST_ADMIN_PASSWORD):
+        logger.info("FIRST_ADMIN_EMAIL is not set, skipping first admin bootstrap")
+        return
+
+    existing_user = db.query(User).filter(User.email == settings.FIRST_ADMIN_EMAIL).first()
+    if existing_user:
+        existing_user.is_admin = 1
+        db.commit()
+        logger.info("Existing user promoted to administrator: %s", settings.FIRST_ADMIN_EMAIL)
+        return
+
+    db.add(User(
+        email=settings.FIRST_ADMIN_EMAIL,
+        name=settings.FIRST_ADMIN_NAME or "Administrator",
+        hashed_password=get_password_hash(settings.FIRST_ADMIN_PASSWORD),
+        is_admin=1,
+    ))
+    db.commit()
+    logger.info("First administrator created: %s", settings.FIRST_ADMIN_EMAIL)
+
+
+def prime_caches(db: Session) -> Dict[str, int]:
+    """
+    Заполняет кэш категорий и общие рейтинги до первого запроса
+
+    Возвращает:
+        Число загруженных записей по кэшам
+    """
+    categories = db.query(Category).options(*category_load_options()).order_by(Category.id).limit(
+        settings.CATEGORY_CACHE_MAX_ENTRIES
+    ).all()
+    category_cache.set_many({category.id: CategoryResponse.model_validate(category) for category in categories})
+    for kind in RANKING_KINDS:
+        get_ranking(db, kind)
+    return {"categories": len(categories), "rankings": len(RANKING_KINDS)}
+
+
+def run_startup(engine: Engine, session_factory: Callable[[], Session]) -> StartupTimings:
+    """
+    Выполняет фазы запуска и отмечает экземпляр готовым
+
+    Ошибки проверки схемы и прогрева пула останавливают запуск. Создание
+    администратора и заполнение кэшей не критичны: ошибка пишется в лог.
+
+    Возвращает:
+        Длительность фаз в миллисекундах
+    """
+    timings = StartupTimings()
+    with timings.phase("schema"):
+        schema_current = verify_schema(engine, settings.STARTUP_SCHEMA_CHECK)
+
+    with timings.phase("pool"):
+        warm_pool(engine, settings.DB_POOL_WARMUP)
+
+    db = session_factory()
+    try:
+        with timings.phase("bootstrap"):
+            if is_read_only_role(settings.DEPLOY_ROLE):
+                logger.info("Read-only deploy role, skipping first admin bootstrap")
+            else:
+                try:
+                    bootstrap_admin(db)
+                except Exception:
+                    db.rollback()
+                    logger.exception("First admin bootstrap failed")
+
+        with timings.phase("caches"):
+            if settings.STARTUP_PRIME_CACHES:
+                try:
+                    prime_caches(db)
+                except Exception:
+                    db.rollback()
+                    logger.exception("Cache priming failed")
+    finally:
+        db.close()
+
+    # Без проверки схемы готовность определит /ready при первом обращении
+    readiness_gate.ready = schema_current
+    logger.info("Startup finished in %.1f ms", timings.total)
+    return timings
@@ -2,8 +2,12 @@
 Вспомогательные функции для приложения
 """
 
-from typing import List, TypeVar
-from sqlalchemy.orm import Query
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Sequence, Set, Tuple, TypeVar
+from sqlalchemy import Table
+from sqlalchemy.orm import Query, Session
 from app.schemas import PaginationParams, PaginationMeta
 
 T = TypeVar('T')
@@ -24,10 +28,25 @@ def paginate(
         Кортеж (элементы, метаданные_пагинации)
     """
     total = query.count()
-    total_pages = (total + pagination.page_size - 1) // pagination.page_size
     items = query.offset(pagination.skip).limit(pagination.limit).all()
     
-    meta = PaginationMeta(
+    return items, build_pagination_meta(total, pagination)
+
+
+def build_pagination_meta(total: int, pagination: PaginationParams) -> PaginationMeta:
+    """
+    Строит метаданные пагинации по общему числу элементов
+    
+    Аргументы:
+        total: Общее количество элементов
+        pagination: Параметры пагинации
+        
+    Возвращает:
+        Метаданные пагинации
+    """
+    total_pages = (total + pagination.page_size - 1) // pagination.page_size
+    
+    return PaginationMeta(
         total=total,
         page=pagination.page,
         page_size=pagination.page_size,
@@ -35,13 +54,12 @@ def paginate(
         has_next=pagination.page < total_pages,
         has_previous=pagination.page > 1
     )
-    
-    return items, meta
 
 
 def create_paginated_response(
     items: List[T],
-    pagination_meta: PaginationMeta
+    pagination_meta: PaginationMeta,
+    included: Optional[dict] = None
 ) -> dict:
     """
     Создает словарь пагинированного ответа
@@ -49,12 +67,136 @@ def create_paginated_response(
     Аргументы:
         items: Список элементов
         pagination_meta: Метаданные пагинации
+        included: Связанные сущности, вынесенные из элементов (необязательно)
         
     Возвращает:
         Словарь с элементами и метаданными пагинации
     """
-    return {
+    response = {
         "items": items,
         "pagination": pagination_meta
     }
+    if included is not None:
+        response["included"] = included
+    return response
+
 
+
+def parse_id_list(raw: str) -> List[int]:
+    """
+    Разбирает список ID, переданный строкой через запятую
+    
+    Аргументы:
+        raw: Строка вида "3,1,2"
+        
+    Возвращает:
+        Список ID без повторов в исходном порядке
+        
+    Исключения:
+        ValueError: если строка содержит нечисловые значения
+    """
+    ids = [int(part) for part in raw.split(",") if part.strip()]
+    return list(dict.fromkeys(ids))
+
+
+def parse_fields(raw: str, allowed: Sequence[str], required: Sequence[str] = ("id",)) -> Tuple[str, ...]:
+    """
+    Разбирает параметр fields= для разреженных наборов полей
+    
+    Аргументы:
+        raw: Строка вида "name,price,image_url"
+        allowed: Допустимые поля в порядке их объявления в схеме
+        required: Поля, которые включаются всегда
+        
+    Возвращает:
+        Кортеж полей в порядке объявления в схеме
+        
+    Исключения:
+        ValueError: если запрошено неизвестное поле
+    """
+    requested = {part.strip() for part in raw.split(",") if part.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    
+    requested.update(required)
+    return tuple(field for field in allowed if field in requested)
+
+
+def parse_include(raw: Optional[str], allowed: Sequence[str]) -> Set[str]:
+    """
+    Разбирает параметр include= для вынесения связанных сущностей в блок included
+    
+    Исключения:
+        ValueError: если запрошена неизвестная связь
+    """
+    if not raw:
+        return set()
+    requested = {part.strip() for part in raw.split(",") if part.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(sorted(unknown))}")
+    return requested
+
+
+def dialect_insert(db: Session, table: Table):
+    """
+    Возвращает insert() текущего диалекта БД с поддержкой ON CONFLICT
+    
+    Аргументы:
+        db: Сессия, по подключению которой определяется диалект
+        table: Таблица для вставки
+        
+    Исключения:
+        NotImplementedError: если диалект не поддерживает upsert
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upsert is not supported for dialect {dialect}")
+    return insert(table)
+
+
+def escape_like(value: str, escape: str = "\\") -> str:
+    """Экранирует спецсимволы LIKE (%, _ и символ экранирования) в пользовательском вводе"""
+    return (
+        value.replace(escape, escape * 2)
+        .replace("%", escape + "%")
+        .replace("_", escape + "_")
+    )
+
+
+def encode_cursor(values: Sequence) -> str:
+    """
+    Кодирует значения ключа сортировки последнего элемента в непрозрачный курсор
+    
+    Аргументы:
+        values: Значения ключа, например (created_at, id)
+        
+    Возвращает:
+        Строка base64 для параметра cursor следующего запроса
+    """
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(raw: str) -> list:
+    """
+    Декодирует курсор, созданный encode_cursor
+    
+    Исключения:
+        ValueError: если курсор поврежден
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
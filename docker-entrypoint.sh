@@ -7,8 +7,9 @@ until PGPASSWORD=$POSTGRES_PASSWORD psql -h "$POSTGRES_HOST" -U "$POSTGRES_USER"
   sleep 1
 done
 
+# Мигрирует один экземпляр под advisory lock, остальные ждут схему head
 echo "PostgreSQL is up - running migrations"
-alembic upgrade head
+python -m app.migrate
 
 echo "Starting application"
 exec "$@"
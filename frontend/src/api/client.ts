@@ -65,6 +65,17 @@ export const productsAPI = {
   
   getProduct: (id: number) => apiClient.get(`/products/${id}`),
   
+  getProductsBatch: (ids: number[]) =>
+    ids.length > 50
+      ? apiClient.post('/products/batch', { ids })
+      : apiClient.get('/products/batch', { params: { ids: ids.join(',') } }),
+  
+  getBestsellers: (params?: { category_id?: number; limit?: number }) =>
+    apiClient.get('/products/bestsellers', { params }),
+  
+  getTrending: (params?: { category_id?: number; limit?: number }) =>
+    apiClient.get('/products/trending', { params }),
+  
   createProduct: (data: {
     name: string
     description?: string
@@ -121,7 +132,7 @@ export const cartAPI = {
 
 // Orders API
 export const ordersAPI = {
-  getOrders: (params?: { page?: number; page_size?: number }) =>
+  getOrders: (params?: { page?: number; page_size?: number; view?: 'full' | 'summary' }) =>
     apiClient.get('/orders', { params }),
   
   getOrder: (id: number) => apiClient.get(`/orders/${id}`),
@@ -163,7 +174,15 @@ export const userAPI = {
   changePassword: (data: { current_password: string; new_password: string }) =>
     apiClient.post('/users/me/change-password', data),
   
-  getUsers: (params?: { page?: number; page_size?: number }) =>
+  getUsers: (params?: {
+    page?: number
+    page_size?: number
+    email?: string
+    name?: string
+    is_active?: number
+    is_admin?: number
+    cursor?: string
+  }) =>
     apiClient.get('/users', { params }),
   
   updateUser: (id: number, data: {
@@ -26,41 +26,53 @@ const AdminUsers = () => {
     is_admin: '0',
   })
   const [message, setMessage] = useState<{ type: 'success' | 'error'; text: string } | null>(null)
-  const [pagination, setPagination] = useState({
-    total: 0,
-    page: 1,
-    page_size: 20,
-    total_pages: 1,
-    has_next: false,
-    has_previous: false,
-  })
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const pageSize = 20
+
+  const [search, setSearch] = useState({ email: '', name: '' })
+  const [searchDraft, setSearchDraft] = useState({ email: '', name: '' })
 
-  const loadUsers = useCallback(async () => {
-    setLoading(true)
+  // Keyset-пагинация: следующая порция запрашивается по next_cursor и дописывается в список
+  const loadUsers = useCallback(async (cursor?: string) => {
+    if (cursor) {
+      setLoadingMore(true)
+    } else {
+      setLoading(true)
+    }
     try {
       const response = await userAPI.getUsers({ 
-        page: pagination.page,
-        page_size: pagination.page_size
+        page_size: pageSize,
+        cursor,
+        email: search.email || undefined,
+        name: search.name || undefined,
       })
-      setUsers(response.data.items || [])
-      if (response.data.pagination) {
-        setPagination(response.data.pagination)
-      }
+      const items: User[] = response.data.items || []
+      setUsers(prev => (cursor ? [...prev, ...items] : items))
+      setNextCursor(response.data.next_cursor || null)
     } catch (error) {
       console.error('Failed to load users:', error)
       setMessage({ type: 'error', text: 'Не удалось загрузить пользователей' })
       setTimeout(() => setMessage(null), 5000)
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
-  }, [pagination.page, pagination.page_size])
+  }, [search])
 
   useEffect(() => {
     loadUsers()
   }, [loadUsers])
 
-  const handlePageChange = (newPage: number) => {
-    setPagination(prev => ({ ...prev, page: newPage }))
+  const handleLoadMore = () => {
+    if (nextCursor) {
+      loadUsers(nextCursor)
+    }
+  }
+
+  const handleSearch = (e: React.FormEvent) => {
+    e.preventDefault()
+    setSearch(searchDraft)
   }
 
   const handleEdit = (user: User) => {
@@ -228,6 +240,29 @@ const AdminUsers = () => {
         </div>
       )}
 
+      <form onSubmit={handleSearch} className="flex flex-col md:flex-row gap-4 mb-6">
+        <input
+          type="text"
+          value={searchDraft.email}
+          onChange={(e) => setSearchDraft({ ...searchDraft, email: e.target.value })}
+          placeholder="Email начинается с..."
+          className="flex-1 px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+        />
+        <input
+          type="text"
+          value={searchDraft.name}
+          onChange={(e) => setSearchDraft({ ...searchDraft, name: e.target.value })}
+          placeholder="Имя содержит..."
+          className="flex-1 px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+        />
+        <button
+          type="submit"
+          className="bg-blue-600 text-white px-6 py-2 rounded hover:bg-blue-700"
+        >
+          Найти
+        </button>
+      </form>
+
       <div className="bg-white rounded-lg shadow-md overflow-hidden">
         <table className="min-w-full divide-y divide-gray-200">
           <thead className="bg-gray-50">
@@ -311,24 +346,14 @@ const AdminUsers = () => {
         )}
       </div>
 
-      {pagination.total_pages > 1 && (
-        <div className="flex justify-center items-center space-x-2 mt-8">
-          <button
-            onClick={() => handlePageChange(pagination.page - 1)}
-            disabled={!pagination.has_previous}
-            className="px-4 py-2 border rounded disabled:opacity-50 disabled:cursor-not-allowed hover:bg-gray-50"
-          >
-            Назад
-          </button>
-          <span className="px-4">
-            Страница {pagination.page} из {pagination.total_pages} (Всего: {pagination.total})
-          </span>
+      {nextCursor && (
+        <div className="flex justify-center mt-8">
           <button
-            onClick={() => handlePageChange(pagination.page + 1)}
-            disabled={!pagination.has_next}
+            onClick={handleLoadMore}
+            disabled={loadingMore}
             className="px-4 py-2 border rounded disabled:opacity-50 disabled:cursor-not-allowed hover:bg-gray-50"
           >
-            Вперед
+            {loadingMore ? 'Загрузка...' : 'Показать еще'}
           </button>
         </div>
       )}
@@ -1,6 +1,71 @@
+import { useState, useEffect } from 'react'
 import { Link } from 'react-router-dom'
+import { productsAPI } from '../api/client'
+
+interface Product {
+  id: number
+  name: string
+  price: string
+  image_url?: string
+}
+
+const ProductRow = ({ title, products }: { title: string; products: Product[] }) => {
+  if (products.length === 0) return null
+
+  return (
+    <section className="mt-12 text-left">
+      <h2 className="text-2xl font-bold text-gray-800 mb-4">{title}</h2>
+      <div className="grid grid-cols-2 md:grid-cols-4 lg:grid-cols-5 gap-4">
+        {products.map((product) => (
+          <Link
+            key={product.id}
+            to={`/products/${product.id}`}
+            className="bg-white rounded-lg shadow-md overflow-hidden hover:shadow-lg transition-shadow"
+          >
+            {product.image_url ? (
+              <img
+                src={product.image_url}
+                alt={product.name}
+                className="w-full h-32 object-cover"
+              />
+            ) : (
+              <div className="w-full h-32 bg-gray-200 flex items-center justify-center">
+                <span className="text-gray-400 text-sm">Нет изображения</span>
+              </div>
+            )}
+            <div className="p-3">
+              <h3 className="font-semibold text-sm mb-1 line-clamp-2">{product.name}</h3>
+              <span className="text-blue-600 font-bold">
+                {parseFloat(product.price).toFixed(2)} ₽
+              </span>
+            </div>
+          </Link>
+        ))}
+      </div>
+    </section>
+  )
+}
 
 const Home = () => {
+  const [bestsellers, setBestsellers] = useState<Product[]>([])
+  const [trending, setTrending] = useState<Product[]>([])
+
+  useEffect(() => {
+    const loadRankings = async () => {
+      try {
+        const [bestsellersResponse, trendingResponse] = await Promise.all([
+          productsAPI.getBestsellers({ limit: 10 }),
+          productsAPI.getTrending({ limit: 10 }),
+        ])
+        setBestsellers(bestsellersResponse.data.items || [])
+        setTrending(trendingResponse.data.items || [])
+      } catch (error) {
+        console.error('Failed to load rankings:', error)
+      }
+    }
+    loadRankings()
+  }, [])
+
   return (
     <div className="text-center">
       <h1 className="text-4xl font-bold text-gray-800 mb-4">
@@ -17,9 +82,11 @@ const Home = () => {
           Просмотреть товары
         </Link>
       </div>
+
+      <ProductRow title="Сейчас популярно" products={trending} />
+      <ProductRow title="Хиты продаж" products={bestsellers} />
     </div>
   )
 }
 
 export default Home
-
@@ -0,0 +1,120 @@
+"""
+Бенчмарк чтения каталога: ORM-путь против Core-пути (app.queries.fetch_products)
+Измеряет строки в секунду и пиковую память (tracemalloc) на странице списка товаров
+
+Запуск: python scripts/bench_catalog_read.py [--products 5000] [--page-size 100] [--rounds 50]
+  --database-url URL - читать из существующей БД вместо временной SQLite
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Category, Product
+from app.schemas import ProductResponse
+from app.queries import product_load_options, product_list_filters, fetch_products
+
+
+def seed(db, products_count: int):
+    categories = [Category(name=f"Category {i}", description="Описание категории") for i in range(5)]
+    db.add_all(categories)
+    db.flush()
+    db.add_all(
+        Product(
+            name=f"Product {i}",
+            description="Описание товара. " * 20,
+            price=Decimal("99.99"),
+            stock=10,
+            category_id=categories[i % len(categories)].id,
+            image_url=f"https://cdn.example.com/images/{i}.jpg",
+            is_active=1,
+        )
+        for i in range(products_count)
+    )
+    db.commit()
+
+
+def read_orm(session_factory, page_size: int, offset: int) -> int:
+    db = session_factory()
+    try:
+        products = (
+            db.query(Product)
+            .options(*product_load_options())
+            .filter(*product_list_filters())
+            .order_by(Product.id.desc())
+            .offset(offset)
+            .limit(page_size)
+            .all()
+        )
+        items = [ProductResponse.model_validate(product) for product in products]
+        return len(items)
+    finally:
+        db.close()
+
+
+def read_core(session_factory, page_size: int, offset: int) -> int:
+    db = session_factory()
+    try:
+        items = fetch_products(
+            db, product_list_filters(), order_by=Product.id.desc(), offset=offset, limit=page_size
+        )
+        return len(items)
+    finally:
+        db.close()
+
+
+def run(name, reader, session_factory, page_size: int, rounds: int, total: int):
+    reader(session_factory, page_size, 0)
+
+    rows = 0
+    started = time.perf_counter()
+    for i in range(rounds):
+        rows += reader(session_factory, page_size, (i * page_size) % max(total - page_size, 1))
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    reader(session_factory, page_size, 0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<6} {rows / elapsed:>12,.0f} rows/s {peak / 1024:>10,.1f} KiB peak per page")
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--database-url", help="Существующая БД с данными каталога")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    if not args.database_url:
+        db = session_factory()
+        seed(db, args.products)
+        db.close()
+
+    print(f"page_size={args.page_size} rounds={args.rounds}")
+    orm_rate = run("orm", read_orm, session_factory, args.page_size, args.rounds, args.products)
+    core_rate = run("core", read_core, session_factory, args.page_size, args.rounds, args.products)
+    print(f"speedup: {core_rate / orm_rate:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
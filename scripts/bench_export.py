@@ -0,0 +1,73 @@
+"""
+Бенчмарк потоковой выгрузки каталога (app/exporter.py)
+Измеряет строки в секунду для CSV и JSON Lines
+
+Запуск: python scripts/bench_export.py [--products 100000]
+  --database-url URL - выгружать из существующей БД вместо временной SQLite
+"""
+
+import argparse
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, insert, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Category, Product
+from app.exporter import iter_csv, iter_jsonl
+from app.queries import product_list_filters
+
+
+def seed(db, products_count: int):
+    db.execute(insert(Category.__table__), [{"name": f"Category {i}"} for i in range(5)])
+    db.execute(
+        insert(Product.__table__),
+        [
+            {
+                "sku": f"SKU-{i}",
+                "name": f"Product {i}",
+                "description": "Описание товара",
+                "price": Decimal("99.99"),
+                "stock": 10,
+                "category_id": i % 5 + 1,
+                "is_active": 1,
+            }
+            for i in range(products_count)
+        ],
+    )
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--database-url", help="Существующая БД с данными каталога")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    db = session_factory()
+    if not args.database_url:
+        seed(db, args.products)
+    total = db.execute(select(func.count()).select_from(Product.__table__)).scalar_one()
+
+    for name, encoder in (("csv", iter_csv), ("jsonl", iter_jsonl)):
+        started = time.perf_counter()
+        size = sum(len(chunk) for chunk in encoder(db, product_list_filters(include_inactive=True)))
+        elapsed = time.perf_counter() - started
+        print(f"{name:<6} {total / elapsed:>12,.0f} rows/s {size / elapsed / 1024 / 1024:>8,.1f} MiB/s")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Бенчмарк накладных расходов метрик (app/metrics.py)
+Одно и то же приложение FastAPI вызывается напрямую через ASGI, без сети:
+с MetricsMiddleware и без него. Разница медиан на запрос сравнивается
+с бюджетом (50 мкс). Отдельно замеряется цена слушателей SQLAlchemy
+на один запрос к БД (SELECT 1 в SQLite в памяти).
+
+Запуск: python scripts/bench_metrics.py [--requests 5000] [--rounds 7] [--queries 20000] [--budget-us 50]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+from app import metrics
+from app.cache import product_cache
+
+
+def build_app() -> FastAPI:
+    application = FastAPI()
+
+    @application.get("/products/{product_id}")
+    async def read_product(product_id: int):
+        product_cache.get(product_id)
+        return {"id": product_id, "name": "Product", "price": 10.0}
+
+    return application
+
+
+async def run_requests(application, count: int) -> float:
+    """Время count запросов GET /products/{id}, секунды"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for i in range(count):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": f"/products/{i % 100}", "raw_path": b"", "root_path": "",
+            "query_string": b"", "headers": [(b"host", b"testserver")], "client": ("127.0.0.1", 1),
+            "server": ("testserver", 80),
+        }
+        await application(scope, receive, send)
+    return time.perf_counter() - started
+
+
+def measure_requests(count: int, rounds: int) -> tuple:
+    """Медианы времени на запрос без метрик и с метриками, мкс"""
+    plain = build_app()
+    instrumented = metrics.MetricsMiddleware(build_app())
+    samples = {"plain": [], "metrics": []}
+
+    async def scenario():
+        await run_requests(plain, count // 10)
+        await run_requests(instrumented, count // 10)
+        for _ in range(rounds):
+            samples["plain"].append(await run_requests(plain, count) / count * 1e6)
+            samples["metrics"].append(await run_requests(instrumented, count) / count * 1e6)
+
+    asyncio.run(scenario())
+    return statistics.median(samples["plain"]), statistics.median(samples["metrics"])
+
+
+def measure_queries(count: int) -> tuple:
+    """Время одного SELECT 1 без слушателей метрик и с ними, мкс"""
+    engine = create_engine("sqlite://")
+    listeners = [
+        ("before_cursor_execute", metrics._before_cursor_execute),
+        ("after_cursor_execute", metrics._after_cursor_execute),
+    ]
+
+    def timed() -> float:
+        with engine.connect() as connection:
+            statement = text("SELECT 1")
+            started = time.perf_counter()
+            for _ in range(count):
+                connection.execute(statement)
+            return (time.perf_counter() - started) / count * 1e6
+
+    token = metrics.request_stats.set(metrics.RequestStats())
+    try:
+        with_listeners = timed()
+        for name, listener in listeners:
+            event.remove(Engine, name, listener)
+        without_listeners = timed()
+        for name, listener in listeners:
+            event.listen(Engine, name, listener)
+    finally:
+        metrics.request_stats.reset(token)
+        engine.dispose()
+    return without_listeners, with_listeners
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--budget-us", type=float, default=50.0, help="Бюджет накладных расходов на запрос, мкс")
+    args = parser.parse_args()
+
+    plain_us, metrics_us = measure_requests(args.requests, args.rounds)
+    overhead_us = metrics_us - plain_us
+    query_plain_us, query_metrics_us = measure_queries(args.queries)
+
+    print(f"requests={args.requests} rounds={args.rounds} queries={args.queries}")
+    print(f"{'request, no metrics':<24} {plain_us:>8.1f} us")
+    print(f"{'request, metrics':<24} {metrics_us:>8.1f} us")
+    print(f"{'middleware overhead':<24} {overhead_us:>8.1f} us (budget {args.budget_us:.0f} us)")
+    print(f"{'query, no listeners':<24} {query_plain_us:>8.1f} us")
+    print(f"{'query, listeners':<24} {query_metrics_us:>8.1f} us")
+    print(f"{'listener overhead':<24} {query_metrics_us - query_plain_us:>8.1f} us per query")
+    if overhead_us > args.budget_us:
+        print("FAIL: middleware overhead exceeds budget")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Нагрузочный тест масштабирования production-сервера (app/serve.py) по числу воркеров
+Для каждого числа воркеров поднимает `python -m app.serve` на локальном порту,
+нагружает его процессами-клиентами с keep-alive и выводит запросы в секунду,
+ускорение относительно одного воркера и эффективность (ускорение / воркеры).
+
+Клиенты работают на той же машине: для чистого замера ядер должно быть больше,
+чем воркеров, либо ограничьте сервер через taskset/квоту контейнера.
+
+Запуск: python scripts/bench_scaling.py [--workers 1,2,4] [--clients 16] [--duration 10] [--path /health]
+  --no-db - не обращаться к БД при запуске воркеров (для путей без БД, например /health)
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.serve import cpu_limit
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def client(port: int, path: str, duration: float, results) -> None:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    done = errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            if response.status == 200:
+                done += 1
+            else:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    connection.close()
+    results.put((done, errors))
+
+
+def wait_ready(port: int, path: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", path)
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Server on port {port} did not answer {path} within {timeout}s")
+
+
+def run(workers: int, args, env) -> float:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--workers", str(workers), "--bind", f"127.0.0.1:{args.port}"],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_ready(args.port, args.path, timeout=30)
+        # Прогрев: все воркеры приняли соединения
+        time.sleep(1)
+
+        results = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=client, args=(args.port, args.path, args.duration, results))
+            for _ in range(args.clients)
+        ]
+        for process in clients:
+            process.start()
+        totals = [results.get() for _ in clients]
+        for process in clients:
+            process.join()
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    done = sum(item[0] for item in totals)
+    errors = sum(item[1] for item in totals)
+    if errors:
+        print(f"  {errors} failed requests with {workers} workers")
+    return done / args.duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", help="Числа воркеров через запятую (по умолчанию 1, 2, 4 ... до числа ядер)")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-db", action="store_true")
+    args = parser.parse_args()
+
+    if args.workers:
+        counts = [int(value) for value in args.workers.split(",")]
+    else:
+        cores = max(1, int(cpu_limit()))
+        counts = sorted({min(2 ** power, cores) for power in range(cores.bit_length() + 1)})
+
+    env = dict(os.environ)
+    if args.no_db:
+        env.update(STARTUP_SCHEMA_CHECK="off", DB_POOL_WARMUP="0", STARTUP_PRIME_CACHES="false")
+
+    print(f"path={args.path} clients={args.clients} duration={args.duration}s cpus={cpu_limit():g}")
+    print(f"{'workers':>8} {'req/s':>12} {'speedup':>8} {'efficiency':>11}")
+    baseline = None
+    for workers in counts:
+        rate = run(workers, args, env)
+        baseline = baseline or rate / workers
+        speedup = rate / baseline
+        print(f"{workers:>8} {rate:>12,.0f} {speedup:>7.2f}x {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Бенчмарк запуска экземпляра: время импорта app.main и фаз lifespan (app/startup.py)
+Импорт замеряется в отдельных процессах; фазы - на БД в версии head
+с заполненным каталогом категорий, каждый раунд с новым пулом и пустыми кэшами.
+Для сравнения выводится время create_all, который раньше выполнялся при импорте.
+
+Запуск: python scripts/bench_startup.py [--imports 5] [--rounds 10] [--categories 200] [--warmup 5]
+  --database-url URL - БД в версии head вместо временной SQLite
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.cache import category_cache, ranking_cache
+from app.config import settings
+from app.migrate import alembic_config, migrate, readiness_gate
+from app.models import Base, Category
+from app.startup import run_startup
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def measure_import(runs: int) -> float:
+    """Медиана времени импорта app.main в новом интерпретаторе, мс"""
+    code = "import time; started = time.perf_counter(); import app.main; print(time.perf_counter() - started)"
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]) * 1000)
+    return statistics.median(samples)
+
+
+def seed(engine, categories_count: int):
+    db = sessionmaker(bind=engine)()
+    try:
+        db.add_all(Category(name=f"Category {i}", description="Описание категории") for i in range(categories_count))
+        db.commit()
+    finally:
+        db.close()
+
+
+def measure_phases(database_url: str, rounds: int) -> dict:
+    """Медианы фаз запуска по раундам, мс"""
+    samples = {}
+    for _ in range(rounds):
+        engine = create_engine(database_url)
+        category_cache.clear()
+        ranking_cache.clear()
+        readiness_gate.reset()
+        try:
+            timings = run_startup(engine, sessionmaker(bind=engine))
+        finally:
+            engine.dispose()
+        for phase, value in timings.items():
+            samples.setdefault(phase, []).append(value)
+    return {phase: statistics.median(values) for phase, values in samples.items()}
+
+
+def measure_create_all(database_url: str, rounds: int) -> float:
+    """Медиана времени create_all на уже созданной схеме (прежний импорт), мс"""
+    samples = []
+    for _ in range(rounds):
+        engine = create_engine(database_url)
+        try:
+            started = time.perf_counter()
+            Base.metadata.create_all(bind=engine)
+            samples.append((time.perf_counter() - started) * 1000)
+        finally:
+            engine.dispose()
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--imports", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--categories", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5, help="Соединений для прогрева пула")
+    parser.add_argument("--database-url", help="Существующая БД в версии head")
+    args = parser.parse_args()
+
+    settings.STARTUP_SCHEMA_CHECK = "require"
+    settings.STARTUP_PRIME_CACHES = True
+    settings.DB_POOL_WARMUP = args.warmup
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite:///{Path(directory) / 'startup.db'}"
+        if not args.database_url:
+            engine = create_engine(database_url)
+            migrate(engine, alembic_config(with_ini=False))
+            seed(engine, args.categories)
+            engine.dispose()
+
+        import_ms = measure_import(args.imports)
+        phases = measure_phases(database_url, args.rounds)
+        create_all_ms = measure_create_all(database_url, args.rounds)
+
+    print(f"imports={args.imports} rounds={args.rounds} warmup={args.warmup}")
+    print(f"{'import app.main':<18} {import_ms:>10.1f} ms")
+    for phase, value in phases.items():
+        print(f"{phase:<18} {value:>10.1f} ms")
+    print(f"{'startup total':<18} {sum(phases.values()):>10.1f} ms")
+    print(f"{'create_all (old)':<18} {create_all_ms:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Построение рекомендаций "с этим товаром покупают" по совместным покупкам
+Обрабатывает только заказы, созданные после прошлого запуска
+
+Запуск: python scripts/build_also_bought.py [--chunk-orders 5000] [--rebuild] [--refresh-all]
+  --rebuild      - сбросить накопленные счетчики и обработать всю историю заново
+  --refresh-all  - пересчитать соседей всех товаров, а не только затронутых новыми заказами
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.also_bought import build_also_bought
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-orders", type=int, help="Заказов в одной пачке")
+    parser.add_argument("--rebuild", action="store_true", help="Обработать всю историю заново")
+    parser.add_argument("--refresh-all", action="store_true", help="Пересчитать соседей всех товаров")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        report = build_also_bought(
+            db,
+            chunk_orders=args.chunk_orders,
+            reset=args.rebuild,
+            refresh_all=args.refresh_all or args.rebuild
+        )
+        elapsed = time.perf_counter() - started
+        print(
+            f"Processed {report['orders']} order(s), {report['baskets']} basket(s); "
+            f"refreshed {report['products_refreshed']} product(s), {report['rows_written']} row(s) "
+            f"in {elapsed:.2f}s"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Построение списков похожих товаров по названию, описанию и категории (TF-IDF)
+Пересчитывает только товары, созданные или измененные после прошлого запуска
+
+Запуск: python scripts/build_similar_products.py [--full]
+  --full  - пересчитать похожие товары для всего каталога
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.similar_products import build_similar_products
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Пересчитать весь каталог")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        report = build_similar_products(db, full=args.full)
+        elapsed = time.perf_counter() - started
+        print(
+            f"Catalog of {report['catalog']} product(s), {report['queued']} queued change(s); "
+            f"refreshed {report['refreshed']} list(s), merged into {report['merged']} list(s), "
+            f"{report['rows_written']} row(s) in {elapsed:.2f}s"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Подбор стоимости bcrypt (BCRYPT_ROUNDS) под целевое время хеширования на этом железе
+Запускайте на той же конфигурации CPU, что и production; результат задайте
+в окружении всех экземпляров: разные значения на узлах приводят к повторному
+пересчету хешей при входе.
+
+Запуск: python scripts/calibrate_bcrypt.py [--target-ms 250] [--min-rounds 10]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.auth import calibrate_bcrypt_rounds, get_password_hash
+from app.config import settings
+
+
+def measure(rounds: int) -> float:
+    started = time.perf_counter()
+    get_password_hash("calibration-password", rounds=rounds)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250, help="Целевое время одного хеширования")
+    parser.add_argument("--min-rounds", type=int, default=10, help="Нижняя граница стоимости")
+    args = parser.parse_args()
+
+    rounds = calibrate_bcrypt_rounds(args.target_ms, min_rounds=args.min_rounds)
+    print(f"current BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS}: {measure(settings.BCRYPT_ROUNDS):.0f} ms per hash")
+    print(f"calibrated for {args.target_ms:.0f} ms: {measure(rounds):.0f} ms per hash")
+    print(f"BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+Нагрузочный тест магазина: сценарии покупателей на asyncio + httpx
+Сценарии выбираются по весам (--mix): просмотр каталога, поиск, вход,
+добавление в корзину, оформление заказа, отзыв. Закрытая модель
+(--concurrency виртуальных пользователей, каждый запускает сценарии подряд)
+или открытая (--rate сценариев в секунду с пуассоновскими интервалами,
+не дожидаясь ответов; не больше --concurrency сценариев одновременно,
+лишние считаются отброшенными). --ramp-up плавно наращивает число
+пользователей или частоту; в отчет попадают только запросы после разгона.
+
+Перед нагрузкой регистрируются --users покупателей (loadtest-<run>-N@example.com)
+и читается каталог. Сценарии меняют данные (корзины, заказы, отзывы,
+остатки товаров): запускайте на отдельной БД, например после make seed.
+Лимит частоты запросов отключите на сервере: RATE_LIMIT_ENABLED=false.
+
+Отчет в JSON: p50/p95/p99, пропускная способность и доля ошибок по
+эндпоинтам (шаблонам путей) и в целом, коммит и параметры запуска -
+чтобы сравнивать прогоны между коммитами при одном --seed.
+
+Запуск: python scripts/loadtest.py [--url http://localhost:8000] [--duration 60] [--concurrency 20]
+  [--rate 50] [--ramp-up 10] [--mix browse=40,search=20,login=5,cart=20,checkout=10,review=5]
+  [--users 20] [--seed 1] [--output loadtest.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DEFAULT_MIX = "browse=40,search=20,login=5,cart=20,checkout=10,review=5"
+
+PASSWORD = "loadtest-password"
+
+
+class Recorder:
+    """Длительности и статусы запросов по эндпоинтам"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.measuring_since: Optional[float] = None
+
+    def record(self, endpoint: str, started: float, seconds: float, status: str) -> None:
+        if self.measuring_since is None or started < self.measuring_since:
+            return
+        self.samples[endpoint].append(seconds)
+        self.statuses[endpoint][status] += 1
+
+
+class Shopper:
+    """Учетная запись покупателя и его состояние между сценариями"""
+
+    def __init__(self, email: str):
+        self.email = email
+        self.headers: Dict[str, str] = {}
+        self.reviewed: set = set()
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.product_ids: List[int] = []
+        self.category_ids: List[int] = []
+        self.search_terms: List[str] = []
+        self.shoppers: "asyncio.Queue[Shopper]" = asyncio.Queue()
+
+    async def request(self, endpoint: str, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        """Запрос с записью длительности под именем эндпоинта (шаблон пути)"""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.record(endpoint, started, time.perf_counter() - started, type(e).__name__)
+            return None
+        self.recorder.record(endpoint, started, time.perf_counter() - started, str(response.status_code))
+        return response
+
+    async def setup(self, users: int, run_id: str) -> None:
+        """Читает каталог и регистрирует покупателей"""
+        page = 1
+        while True:
+            response = await self.client.get("/products/", params={"page": page, "page_size": 100})
+            response.raise_for_status()
+            data = response.json()
+            for product in data["items"]:
+                if product["stock"] > 0:
+                    self.product_ids.append(product["id"])
+                self.search_terms.extend(word for word in product["name"].split() if len(word) >= 3)
+            if not data["pagination"]["has_next"]:
+                break
+            page += 1
+        response = await self.client.get("/categories/", params={"page_size": 100})
+        response.raise_for_status()
+        self.category_ids = [category["id"] for category in response.json()["items"]]
+        if not self.product_ids:
+            raise SystemExit("No products in stock: seed the database first (make seed)")
+
+        for index in range(users):
+            shopper = Shopper(f"loadtest-{run_id}-{index}@example.com")
+            response = await self.client.post("/auth/register", json={
+                "name": f"Load Test {index}", "email": shopper.email, "password": PASSWORD
+            })
+            if response.status_code != 201:
+                raise SystemExit(f"Registration failed: {response.status_code} {response.text}")
+            await self.login(shopper, record=False)
+            self.shoppers.put_nowait(shopper)
+
+    async def login(self, shopper: Shopper, record: bool = True) -> None:
+        data = {"username": shopper.email, "password": PASSWORD}
+        if record:
+            response = await self.request("POST /auth/login", "POST", "/auth/login", data=data)
+        else:
+            response = await self.client.post("/auth/login", data=data)
+        if response is not None and response.status_code == 200:
+            shopper.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    # Сценарии
+
+    async def browse(self) -> None:
+        """Аноним: список категорий, страница категории, карточка товара и похожие"""
+        await self.request("GET /categories/", "GET", "/categories/")
+        if self.category_ids:
+            await self.request("GET /products/?category_id", "GET", "/products/", params={
+                "category_id": self.rng.choice(self.category_ids), "page": self.rng.randint(1, 2)
+            })
+        product_id = self.rng.choice(self.product_ids)
+        await self.request("GET /products/{product_id}", "GET", f"/products/{product_id}")
+        await self.request("GET /reviews/product/{product_id}", "GET", f"/reviews/product/{product_id}")
+        await self.request("GET /products/{product_id}/similar", "GET", f"/products/{product_id}/similar")
+
+    async def search(self) -> None:
+        """Аноним: поиск по названию и фильтр по цене"""
+        term = self.rng.choice(self.search_terms) if self.search_terms else "a"
+        await self.request("GET /products/?search", "GET", "/products/", params={"search": term})
+        await self.request("GET /products/?search&max_price", "GET", "/products/", params={
+            "search": term, "max_price": self.rng.choice((50, 200, 1000)), "in_stock": "true"
+        })
+
+    async def login_scenario(self, shopper: Shopper) -> None:
+        """Повторный вход и профиль"""
+        await self.login(shopper)
+        await self.request("GET /auth/me", "GET", "/auth/me", headers=shopper.headers)
+
+    async def cart(self, shopper: Shopper) -> None:
+        """Товар в корзину, просмотр корзины, очистка"""
+        product_id = self.rng.choice(self.product_ids)
+        await self.request("GET /products/{product_id}", "GET", f"/products/{product_id}")
+        await self.request("POST /cart/items", "POST", "/cart/items", headers=shopper.headers, json={
+            "product_id": product_id, "quantity": 1
+        })
+        await self.request("GET /cart", "GET", "/cart", headers=shopper.headers)
+        await self.request("DELETE /cart", "DELETE", "/cart", headers=shopper.headers)
+
+    async def checkout(self, shopper: Shopper) -> None:
+        """Несколько товаров в корзину, заказ, список заказов"""
+        for product_id in self.rng.sample(self.product_ids, min(len(self.product_ids), self.rng.randint(1, 3))):
+            await self.request("POST /cart/items", "POST", "/cart/items", headers=shopper.headers, json={
+                "product_id": product_id, "quantity": 1
+            })
+        await self.request("POST /orders", "POST", "/orders", headers=shopper.headers, json={
+            "shipping_address": "1 Load Test St", "payment_method": "credit_card"
+        })
+        await self.request("GET /orders", "GET", "/orders", headers=shopper.headers, params={"view": "summary"})
+
+    async def review(self, shopper: Shopper) -> None:
+        """Отзыв на товар, который покупатель еще не оценивал"""
+        candidates = [product_id for product_id in self.product_ids if product_id not in shopper.reviewed]
+        if not candidates:
+            return
+        product_id = self.rng.choice(candidates)
+        shopper.reviewed.add(product_id)
+        await self.request("POST /reviews", "POST", "/reviews", headers=shopper.headers, json={
+            "product_id": product_id, "rating": self.rng.randint(1, 5), "comment": "Load test review"
+        })
+
+    async def run_scenario(self, name: str) -> None:
+        if name == "browse":
+            await self.browse()
+        elif name == "search":
+            await self.search()
+        else:
+            # Покупатель занят одним сценарием за раз: корзина не делится между сценариями
+            shopper = await self.shoppers.get()
+            try:
+                if name == "login":
+                    await self.login_scenario(shopper)
+                else:
+                    await getattr(self, name)(shopper)
+            finally:
+                self.shoppers.put_nowait(shopper)
+
+
+def parse_mix(raw: str) -> Dict[str, float]:
+    """Разбирает веса сценариев вида browse=40,cart=20"""
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in {"browse", "search", "login", "cart", "checkout", "review"}:
+            raise argparse.ArgumentTypeError(f"Unknown scenario: {name}")
+        mix[name] = float(weight)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("Scenario weights sum to zero")
+    return mix
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Перцентиль методом ближайшего ранга"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def summarize(samples: List[float], statuses: Dict[str, int], seconds: float) -> dict:
+    values = sorted(samples)
+    count = len(values)
+    errors = sum(n for status, n in statuses.items() if not (status.isdigit() and int(status) < 400))
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "throughput_rps": round(count / seconds, 2) if seconds else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def closed_loop(test: LoadTest, args, mix: Dict[str, float], deadline: float, counters: dict) -> None:
+    """--concurrency пользователей, запускаемых равномерно за --ramp-up"""
+    names, weights = list(mix), list(mix.values())
+
+    async def user(delay: float) -> None:
+        await asyncio.sleep(delay)
+        while time.perf_counter() < deadline:
+            counters["started"] += 1
+            await test.run_scenario(test.rng.choices(names, weights)[0])
+            counters["completed"] += 1
+
+    await asyncio.gather(*(user(args.ramp_up * i / args.concurrency) for i in range(args.concurrency)))
+
+
+async def open_loop(test: LoadTest, args, mix: Dict[str, float], deadline: float, counters: dict) -> None:
+    """Пуассоновский поток --rate сценариев в секунду; частота растет линейно за --ramp-up"""
+    names, weights = list(mix), list(mix.values())
+    semaphore = asyncio.Semaphore(args.concurrency)
+    tasks = set()
+    started_at = time.perf_counter()
+
+    async def scenario(name: str) -> None:
+        try:
+            await test.run_scenario(name)
+            counters["completed"] += 1
+        finally:
+            semaphore.release()
+
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        elapsed = now - started_at
+        rate = args.rate * min(1.0, elapsed / args.ramp_up) if args.ramp_up else args.rate
+        await asyncio.sleep(test.rng.expovariate(max(rate, args.rate / 100)))
+        name = test.rng.choices(names, weights)[0]
+        if semaphore.locked():
+            counters["dropped"] += 1
+            continue
+        await semaphore.acquire()
+        counters["started"] += 1
+        task = asyncio.create_task(scenario(name))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.wait(tasks)
+
+
+async def run(args) -> dict:
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    run_started = datetime.now(timezone.utc)
+    run_id = run_started.strftime("%Y%m%d%H%M%S")
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        test = LoadTest(client, recorder, rng)
+        await test.setup(args.users or args.concurrency, run_id)
+
+        counters = {"started": 0, "completed": 0, "dropped": 0}
+        started = time.perf_counter()
+        recorder.measuring_since = started + args.ramp_up
+        deadline = started + args.ramp_up + args.duration
+        if args.rate:
+            await open_loop(test, args, mix, deadline, counters)
+        else:
+            await closed_loop(test, args, mix, deadline, counters)
+        # Сценарии, начатые до срока, дорабатывают: окно замера - до последнего ответа
+        measured_seconds = time.perf_counter() - recorder.measuring_since
+
+    all_samples = [value for values in recorder.samples.values() for value in values]
+    all_statuses: Dict[str, int] = defaultdict(int)
+    for statuses in recorder.statuses.values():
+        for status, count in statuses.items():
+            all_statuses[status] += count
+
+    return {
+        "meta": {
+            "url": args.url,
+            "commit": git_commit(),
+            "started_at": run_started.isoformat(timespec="seconds"),
+            "mode": "open" if args.rate else "closed",
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "duration": args.duration,
+            "ramp_up": args.ramp_up,
+            "users": args.users or args.concurrency,
+            "seed": args.seed,
+            "mix": mix,
+            "measured_seconds": round(measured_seconds, 2),
+        },
+        "scenarios": counters,
+        "summary": summarize(all_samples, all_statuses, measured_seconds),
+        "endpoints": {
+            endpoint: summarize(recorder.samples[endpoint], recorder.statuses[endpoint], measured_seconds)
+            for endpoint in sorted(recorder.samples)
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=60, help="Секунд замера после разгона")
+    parser.add_argument("--concurrency", type=int, default=20, help="Пользователей (или предел сценариев при --rate)")
+    parser.add_argument("--rate", type=float, default=0, help="Сценариев в секунду: открытая модель")
+    parser.add_argument("--ramp-up", type=float, default=10, help="Секунд разгона, не входят в отчет")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Веса сценариев")
+    parser.add_argument("--users", type=int, default=0, help="Покупателей (по умолчанию --concurrency)")
+    parser.add_argument("--seed", type=int, default=1, help="Зерно выбора сценариев и товаров")
+    parser.add_argument("--timeout", type=float, default=30, help="Таймаут запроса, секунды")
+    parser.add_argument("--output", help="Файл отчета JSON (по умолчанию stdout)")
+    args = parser.parse_args()
+    try:
+        parse_mix(args.mix)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+        summary = report["summary"]
+        print(
+            f"{summary['requests']} requests, {summary['throughput_rps']} req/s, "
+            f"p50 {summary['p50_ms']} ms, p99 {summary['p99_ms']} ms, errors {summary['error_rate']:.2%}"
+        )
+        print(f"Report written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
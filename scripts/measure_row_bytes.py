@@ -0,0 +1,139 @@
+"""
+Скрипт для замера объема данных, читаемых из БД горячими эндпоинтами
+Сравнивает полную загрузку строк (все колонки и связи) с планами загрузки из app/queries.py
+
+Запуск: python scripts/measure_row_bytes.py [--demo 500]
+  --demo N  - использовать временную SQLite базу с N тестовыми товарами вместо настроенной БД
+"""
+
+import argparse
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, joinedload, undefer
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, User, Category, Product, CartItem, Review
+from app.queries import product_load_options, cart_item_load_options, review_list_load_options
+
+
+def value_size(value) -> int:
+    """Приблизительный размер значения колонки в байтах"""
+    if value is None:
+        return 0
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(str(value))
+
+
+def measure(db, query) -> tuple[int, int]:
+    """Выполняет скомпилированный запрос и возвращает (число строк, байт)"""
+    rows = db.connection().execute(query.statement).all()
+    return len(rows), sum(value_size(value) for row in rows for value in row)
+
+
+def seed_demo(db, products_count: int):
+    categories = [Category(name=f"Category {i}", description="Описание категории " * 20) for i in range(5)]
+    db.add_all(categories)
+    db.flush()
+
+    users = [
+        User(
+            name=f"User {i}",
+            email=f"user{i}@example.com",
+            hashed_password="$2b$12$" + "x" * 53,
+            address="ул. Примерная, д. 1, " * 10,
+        )
+        for i in range(20)
+    ]
+    db.add_all(users)
+    db.flush()
+
+    products = [
+        Product(
+            name=f"Product {i}",
+            description="Подробное описание товара. " * 60,
+            price=Decimal("99.99"),
+            stock=10,
+            category_id=categories[i % len(categories)].id,
+            image_url=f"https://cdn.example.com/images/{i}.jpg",
+            is_active=1,
+        )
+        for i in range(products_count)
+    ]
+    db.add_all(products)
+    db.flush()
+
+    db.add_all(Review(user_id=user.id, product_id=products[0].id, rating=5, comment="Отлично") for user in users)
+    db.add_all(CartItem(user_id=users[0].id, product_id=product.id, quantity=1) for product in products[:20])
+    db.commit()
+    return users[0].id, products[0].id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--demo", type=int, metavar="N", help="Временная SQLite база с N товарами")
+    parser.add_argument("--user-id", type=int, default=1, help="Пользователь для замера корзины")
+    parser.add_argument("--product-id", type=int, default=1, help="Товар для замера отзывов")
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.demo:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        user_id, product_id = seed_demo(db, args.demo)
+    else:
+        from app.database import SessionLocal
+        db = SessionLocal()
+        user_id, product_id = args.user_id, args.product_id
+
+    page = args.page_size
+    cases = [
+        (
+            "GET /products/",
+            db.query(Product).options(undefer("*"), joinedload(Product.category).undefer("*")).limit(page),
+            db.query(Product).options(*product_load_options()).limit(page),
+        ),
+        (
+            "GET /products/?fields=name,price,image_url",
+            db.query(Product).options(undefer("*"), joinedload(Product.category).undefer("*")).limit(page),
+            db.query(Product).options(*product_load_options(("id", "name", "price", "image_url"))).limit(page),
+        ),
+        (
+            "GET /reviews/product/{id}",
+            db.query(Review).filter(Review.product_id == product_id).options(
+                joinedload(Review.user).undefer("*")
+            ).limit(page),
+            db.query(Review).filter(Review.product_id == product_id).options(*review_list_load_options()).limit(page),
+        ),
+        (
+            "GET /cart",
+            db.query(CartItem).filter(CartItem.user_id == user_id).options(
+                joinedload(CartItem.product).undefer("*"),
+                joinedload(CartItem.product).joinedload(Product.category).undefer("*"),
+                joinedload(CartItem.user).undefer("*"),
+            ),
+            db.query(CartItem).filter(CartItem.user_id == user_id).options(*cart_item_load_options()),
+        ),
+    ]
+
+    print(f"{'endpoint':<45} {'variant':<8} {'rows':>6} {'bytes':>10} {'bytes/row':>10}")
+    try:
+        for endpoint, full_query, planned_query in cases:
+            for variant, query in (("full", full_query), ("planned", planned_query)):
+                rows, size = measure(db, query)
+                per_row = size // rows if rows else 0
+                print(f"{endpoint:<45} {variant:<8} {rows:>6} {size:>10} {per_row:>10}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Пересчет рейтингов товаров (хиты продаж и набирающие популярность)
+Затухающие счетчики product_popularity приводятся к текущему моменту,
+топ-N (общий и по категориям) записывается в product_rankings
+
+Запуск: python scripts/refresh_rankings.py [--size 50]
+  Рассчитан на запуск по расписанию, например раз в 5-15 минут из cron
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.rankings import refresh_rankings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, help="Длина каждого списка (по умолчанию RANKING_SIZE)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        written = refresh_rankings(db, size=args.size)
+        elapsed = time.perf_counter() - started
+        for kind, count in written.items():
+            print(f"{kind}: {count} ranked position(s)")
+        print(f"Done in {elapsed:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
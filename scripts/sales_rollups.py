@@ -0,0 +1,54 @@
+"""
+Обслуживание rollup-таблиц продаж (sales_daily, sales_daily_product)
+
+  backfill - пересчитать сводки из orders/order_items (после миграции или для исправления)
+  check    - сверить сводки с исходными таблицами, код выхода 1 при расхождениях
+
+Запуск: python scripts/sales_rollups.py backfill|check [--from 2024-01-01] [--to 2024-12-31]
+  По умолчанию период - от первого до последнего заказа
+"""
+
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.analytics import backfill_sales, check_sales_consistency, order_date_bounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("backfill", "check"))
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="Первый день периода")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Последний день периода")
+    parser.add_argument("--chunk-days", type=int, default=31, help="Дней на одну транзакцию пересчета")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        first_day, last_day = order_date_bounds(db)
+        date_from = args.date_from or first_day
+        date_to = args.date_to or last_day
+        if date_from is None or date_to is None:
+            print("No orders found, nothing to do")
+            return 0
+
+        if args.command == "backfill":
+            days = backfill_sales(db, date_from, date_to, chunk_days=args.chunk_days)
+            print(f"Backfilled {days} day(s) with sales between {date_from} and {date_to}")
+            return 0
+
+        mismatches = check_sales_consistency(db, date_from, date_to)
+        for mismatch in mismatches:
+            print(f"{mismatch['day']}: expected {mismatch['expected']}, rollup {mismatch['actual']}")
+        print(f"Checked {date_from}..{date_to}: {len(mismatches)} mismatching day(s)")
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
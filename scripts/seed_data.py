@@ -32,11 +32,13 @@ def seed_database():
         db.commit()
         print(f"Created {len(categories)} categories")
         
+        # У демо-пользователей общий пароль: хеш bcrypt считается один раз
+        password_hash = get_password_hash("password123")
         users = [
             User(
                 name="Иван Иванов",
                 email="ivan@example.com",
-                hashed_password=get_password_hash("password123"),
+                hashed_password=password_hash,
                 phone="+79001234567",
                 address="ул. Ленина, д. 10, Москва, 101000",
                 is_admin=1
@@ -44,7 +46,7 @@ def seed_database():
             User(
                 name="Мария Петрова",
                 email="maria@example.com",
-                hashed_password=get_password_hash("password123"),
+                hashed_password=password_hash,
                 phone="+79001234568",
                 address="пр. Невский, д. 25, Санкт-Петербург, 191186",
                 is_admin=0
@@ -52,7 +54,7 @@ def seed_database():
             User(
                 name="Алексей Сидоров",
                 email="alexey@example.com",
-                hashed_password=get_password_hash("password123"),
+                hashed_password=password_hash,
                 phone="+79001234569",
                 address="ул. Красная, д. 5, Казань, 420000",
                 is_admin=0
@@ -2,15 +2,32 @@
 Конфигурация тестов и фикстуры
 """
 
+from functools import partial
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app import database
 from app.main import app
 from app.database import Base, get_db
 from app.auth import get_password_hash
+from app.cache import product_cache, category_cache, ranking_cache, recommendation_cache
+from app.config import settings
+from app.ratelimit import rate_limiter
+from tests.querycount import QueryCounter
+
+# Тестовая БД создается через create_all без alembic_version: проверка схемы
+# при запуске отключена, lifespan работает с тестовой БД (фикстура app_database)
+settings.STARTUP_SCHEMA_CHECK = "off"
+settings.DB_POOL_WARMUP = 0
+settings.STARTUP_PRIME_CACHES = False
+# Администратор из .env не попадает в тестовую БД при запуске клиента
+settings.FIRST_ADMIN_EMAIL = None
+# Минимальная стоимость bcrypt: хеширование паролей не доминирует во времени тестов
+settings.BCRYPT_ROUNDS = 4
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
@@ -22,9 +39,31 @@ engine = create_engine(
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Одна форма SQL-запроса, выполненная столько раз за HTTP-запрос, считается N+1
+MAX_STATEMENT_REPEATS = 5
+
+
+class QueryCheckingClient(TestClient):
+    """TestClient, который считает SQL-запросы каждого HTTP-запроса и падает на N+1"""
+
+    max_repeats = MAX_STATEMENT_REPEATS
+    last_queries = None
+
+    def request(self, *args, **kwargs):
+        with QueryCounter(engine) as queries:
+            response = super().request(*args, **kwargs)
+        self.last_queries = queries
+        queries.assert_budget(max_repeats=self.max_repeats)
+        return response
+
 
 @pytest.fixture(scope="function")
 def db():
+    product_cache.clear()
+    category_cache.clear()
+    ranking_cache.clear()
+    recommendation_cache.clear()
+    rate_limiter.reset()
     Base.metadata.create_all(bind=engine)
     db = TestingSessionLocal()
     try:
@@ -34,8 +73,15 @@ def db():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def app_database(monkeypatch):
+    """Фазы запуска в lifespan обращаются к тестовой БД, а не к DATABASE_URL"""
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "SessionLocal", TestingSessionLocal)
+
+
 @pytest.fixture(scope="function")
-def client(db):
+def client(db, app_database):
     def override_get_db():
         try:
             yield db
@@ -43,11 +89,17 @@ def client(db):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
+    with QueryCheckingClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def count_queries():
+    """Счетчик запросов к тестовой БД: with count_queries() as queries: ..."""
+    return partial(QueryCounter, engine)
+
+
 @pytest.fixture
 def test_user_data():
     return {
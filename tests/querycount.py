@@ -0,0 +1,99 @@
+"""
+Подсчет SQL-запросов в тестах: бюджеты запросов эндпоинтов и поиск N+1.
+
+QueryCounter слушает before_cursor_execute (всех движков или одного) и
+собирает выполненные запросы. Форма запроса - текст SQL без значений:
+параметры, литералы и списки IN (?, ?, ?) сводятся к "?", поэтому запросы
+N+1, различающиеся только ID, имеют одну форму.
+
+    with QueryCounter() as queries:
+        client.get("/cart")
+    queries.assert_budget(3, max_repeats=3)
+"""
+
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_PARAMETER = re.compile(r"%\(\w+\)s|:\w+|\$\d+|%s")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_POSTCOMPILE = re.compile(r"\(?__\[POSTCOMPILE_\w+\]\)?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Текст запроса без значений: параметры, литералы и списки IN заменены на ?"""
+    shape = _STRING.sub("?", statement)
+    shape = _PARAMETER.sub("?", shape)
+    shape = _POSTCOMPILE.sub("(?)", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Запросов больше бюджета или одна форма запроса повторяется слишком часто"""
+
+
+class QueryCounter:
+    """
+    Контекстный менеджер, собирающий SQL-запросы
+
+    Аргументы:
+        engine: Движок, запросы которого считаются (по умолчанию все движки)
+    """
+
+    def __init__(self, engine: Optional[Engine] = None):
+        self.target = engine if engine is not None else Engine
+        self.statements: List[str] = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.target, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.target, "before_cursor_execute", self._before_cursor_execute)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        """Забывает собранные запросы"""
+        self.statements.clear()
+
+    def shapes(self) -> Counter:
+        """Форма запроса -> число выполнений"""
+        return Counter(statement_shape(statement) for statement in self.statements)
+
+    def repeated(self, max_repeats: int) -> List[Tuple[str, int]]:
+        """Формы, выполненные max_repeats раз и больше"""
+        return [(shape, count) for shape, count in self.shapes().most_common() if count >= max_repeats]
+
+    def assert_budget(self, budget: Optional[int] = None, max_repeats: Optional[int] = None) -> None:
+        """
+        Проверяет число запросов и повторы форм
+
+        Аргументы:
+            budget: Наибольшее допустимое число запросов
+            max_repeats: Сколько выполнений одной формы уже считается N+1
+
+        Исключения:
+            QueryBudgetExceeded: Бюджет превышен или найден повтор
+        """
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append(f"{self.count} queries, budget {budget}")
+        if max_repeats is not None:
+            problems.extend(f"{count}x {shape}" for shape, count in self.repeated(max_repeats))
+        if problems:
+            executed = "\n".join(f"  {statement_shape(statement)}" for statement in self.statements)
+            raise QueryBudgetExceeded("; ".join(problems) + f"\nexecuted:\n{executed}")
@@ -0,0 +1,151 @@
+"""
+Тесты административных эндпоинтов заказов
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi import status
+
+
+@pytest.fixture
+def admin_orders(db, test_user, admin_user):
+    from app.models import Order, OrderStatus
+    
+    started = datetime(2026, 3, 1, 12, 0, 0)
+    orders = [
+        Order(
+            user_id=user.id,
+            total_amount=Decimal(total),
+            status=order_status,
+            shipping_address="123 Test St",
+            created_at=started + timedelta(days=index),
+        )
+        for index, (user, total, order_status) in enumerate([
+            (test_user, "10.00", OrderStatus.PENDING),
+            (test_user, "250.00", OrderStatus.CONFIRMED),
+            (admin_user, "75.50", OrderStatus.CONFIRMED),
+            (test_user, "40.00", OrderStatus.SHIPPED),
+            (admin_user, "999.99", OrderStatus.DELIVERED),
+        ])
+    ]
+    db.add_all(orders)
+    db.commit()
+    return orders
+
+
+class TestAdminOrderList:
+    
+    def test_list_newest_first(self, client, admin_headers, admin_orders):
+        """Test orders are listed newest first with summary columns only"""
+        response = client.get("/admin/orders", headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [order["id"] for order in data["items"]] == [order.id for order in reversed(admin_orders)]
+        assert set(data["items"][0]) == {"id", "user_id", "status", "total_amount", "created_at"}
+        assert data["next_cursor"] is None
+    
+    def test_filters(self, client, admin_headers, admin_orders, test_user):
+        """Test status, user, amount and date filters combine"""
+        def ids(**params):
+            response = client.get("/admin/orders", params=params, headers=admin_headers)
+            assert response.status_code == status.HTTP_200_OK
+            return [order["id"] for order in response.json()["items"]]
+        
+        pending, confirmed, confirmed_admin, shipped, delivered = admin_orders
+        assert ids(status="confirmed") == [confirmed_admin.id, confirmed.id]
+        assert ids(status="confirmed", user_id=test_user.id) == [confirmed.id]
+        assert ids(min_total="50", max_total="300") == [confirmed_admin.id, confirmed.id]
+        assert ids(date_from="2026-03-02", date_to="2026-03-04") == [shipped.id, confirmed_admin.id, confirmed.id]
+    
+    def test_keyset_pagination(self, client, admin_headers, admin_orders):
+        """Test cursor pages cover all orders without overlap"""
+        seen, cursor = [], None
+        while True:
+            params = {"page_size": 2}
+            if cursor:
+                params["cursor"] = cursor
+            data = client.get("/admin/orders", params=params, headers=admin_headers).json()
+            seen += [order["id"] for order in data["items"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert seen == [order.id for order in reversed(admin_orders)]
+    
+    def test_invalid_cursor(self, client, admin_headers):
+        """Test malformed cursor is rejected"""
+        response = client.get("/admin/orders", params={"cursor": "garbage"}, headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_list_as_regular_user(self, client, auth_headers):
+        """Test order listing requires admin"""
+        response = client.get("/admin/orders", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestBulkOrderStatus:
+    
+    def test_transition_guard(self, client, db, admin_headers, admin_orders):
+        """Test only orders with an allowed transition are updated"""
+        from app.models import Order, OrderStatus
+        
+        pending, confirmed, confirmed_admin, shipped, delivered = admin_orders
+        response = client.patch(
+            "/admin/orders/status",
+            json={"order_ids": [confirmed.id, confirmed_admin.id, pending.id, delivered.id, 99999], "status": "shipped"},
+            headers=admin_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["updated_ids"] == sorted([confirmed.id, confirmed_admin.id])
+        assert data["rejected"] == [
+            {"id": pending.id, "status": "pending"},
+            {"id": delivered.id, "status": "delivered"},
+        ]
+        assert data["not_found"] == [99999]
+        
+        db.expire_all()
+        assert db.get(Order, confirmed.id).status == OrderStatus.SHIPPED
+        assert db.get(Order, pending.id).status == OrderStatus.PENDING
+    
+    def test_cancelled_orders_leave_sales_rollups(self, client, db, test_products, auth_headers, admin_headers):
+        """Test bulk cancellation subtracts orders from daily rollups"""
+        from app.analytics import check_sales_consistency, order_date_bounds
+        
+        laptop, mouse, _ = test_products
+        order_ids = []
+        for product, quantity in ((laptop, 1), (mouse, 2), (mouse, 1)):
+            client.post("/cart/items", json={"product_id": product.id, "quantity": quantity}, headers=auth_headers)
+            order_ids.append(client.post("/orders", json={"shipping_address": "1 St"}, headers=auth_headers).json()["id"])
+        
+        response = client.patch(
+            "/admin/orders/status", json={"order_ids": order_ids[:2], "status": "cancelled"}, headers=admin_headers
+        )
+        
+        assert response.json()["updated_ids"] == sorted(order_ids[:2])
+        day = client.get("/analytics/sales/daily", headers=admin_headers).json()[0]
+        assert day["orders_count"] == 1
+        assert day["units"] == 1
+        assert check_sales_consistency(db, *order_date_bounds(db)) == []
+    
+    def test_duplicate_ids(self, client, admin_headers, admin_orders):
+        """Test duplicate order ids are rejected"""
+        order_id = admin_orders[0].id
+        response = client.patch(
+            "/admin/orders/status", json={"order_ids": [order_id, order_id], "status": "confirmed"}, headers=admin_headers
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_bulk_status_as_regular_user(self, client, auth_headers, admin_orders):
+        """Test bulk status change requires admin"""
+        response = client.patch(
+            "/admin/orders/status", json={"order_ids": [admin_orders[0].id], "status": "confirmed"}, headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
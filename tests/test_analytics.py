@@ -0,0 +1,141 @@
+"""
+Тесты аналитики продаж на rollup-таблицах
+"""
+
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from fastapi import status
+
+
+def place_order(client, headers, items):
+    for product_id, quantity in items:
+        client.post("/cart/items", json={"product_id": product_id, "quantity": quantity}, headers=headers)
+    response = client.post("/orders", json={"shipping_address": "123 Test St"}, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+
+class TestSalesAnalytics:
+    
+    def test_orders_update_daily_rollup(self, client, test_products, auth_headers, admin_headers):
+        """Test placed orders are added to the daily rollup"""
+        laptop, mouse, _ = test_products
+        place_order(client, auth_headers, [(laptop.id, 1), (mouse.id, 2)])
+        place_order(client, auth_headers, [(mouse.id, 1)])
+        
+        response = client.get("/analytics/sales/daily", headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        days = response.json()
+        assert len(days) == 1
+        assert days[0]["day"] == datetime.now(timezone.utc).date().isoformat()
+        assert days[0]["orders_count"] == 2
+        assert days[0]["units"] == 4
+        assert Decimal(days[0]["revenue"]) == Decimal("1389.96")
+    
+    def test_product_and_category_breakdown(self, client, test_products, test_category, auth_headers, admin_headers):
+        """Test per-product and per-category reports"""
+        laptop, mouse, _ = test_products
+        place_order(client, auth_headers, [(laptop.id, 1), (mouse.id, 2)])
+        place_order(client, auth_headers, [(mouse.id, 1)])
+        
+        products = client.get("/analytics/sales/products", headers=admin_headers).json()
+        assert [(p["name"], p["orders_count"], p["units"]) for p in products] == [
+            ("Laptop Pro", 1, 1),
+            ("Wireless Mouse", 2, 3),
+        ]
+        
+        categories = client.get("/analytics/sales/categories", headers=admin_headers).json()
+        assert len(categories) == 1
+        assert categories[0]["category_name"] == test_category.name
+        assert categories[0]["units"] == 4
+    
+    def test_cancellation_is_subtracted(self, client, test_products, auth_headers, admin_headers):
+        """Test cancelling an order removes it from the rollups and restoring adds it back"""
+        laptop, mouse, _ = test_products
+        place_order(client, auth_headers, [(mouse.id, 2)])
+        order = place_order(client, auth_headers, [(laptop.id, 1)])
+        
+        client.put(f"/orders/{order['id']}", json={"status": "cancelled"}, headers=auth_headers)
+        client.put(f"/orders/{order['id']}", json={"status": "cancelled"}, headers=auth_headers)
+        
+        day = client.get("/analytics/sales/daily", headers=admin_headers).json()[0]
+        assert day["orders_count"] == 1
+        assert day["units"] == 2
+        assert Decimal(day["revenue"]) == Decimal("59.98")
+        
+        client.put(f"/orders/{order['id']}", json={"status": "confirmed"}, headers=auth_headers)
+        
+        day = client.get("/analytics/sales/daily", headers=admin_headers).json()[0]
+        assert day["orders_count"] == 2
+        assert Decimal(day["revenue"]) == Decimal("1359.97")
+    
+    def test_backfill_and_consistency_check(self, client, db, test_products, auth_headers):
+        """Test backfill rebuilds rollups that match the order history"""
+        from app.analytics import backfill_sales, check_sales_consistency, order_date_bounds
+        from app.models import SalesDaily
+        
+        laptop, mouse, _ = test_products
+        place_order(client, auth_headers, [(laptop.id, 1), (mouse.id, 1)])
+        cancelled = place_order(client, auth_headers, [(mouse.id, 3)])
+        client.put(f"/orders/{cancelled['id']}", json={"status": "cancelled"}, headers=auth_headers)
+        
+        first_day, last_day = order_date_bounds(db)
+        assert check_sales_consistency(db, first_day, last_day) == []
+        
+        db.query(SalesDaily).delete()
+        db.commit()
+        assert len(check_sales_consistency(db, first_day, last_day)) == 1
+        
+        assert backfill_sales(db, first_day, last_day) == 1
+        assert check_sales_consistency(db, first_day, last_day) == []
+    
+    def test_backfill_order_near_midnight(self, client, db, test_products, auth_headers):
+        """Test backfill and the checker put an order just before UTC midnight on its UTC day"""
+        from datetime import date
+        from app.analytics import backfill_sales, check_sales_consistency, record_order_sales, sales_day
+        from app.models import Order, SalesDaily, SalesDailyProduct
+        
+        laptop, _, _ = test_products
+        order = place_order(client, auth_headers, [(laptop.id, 1)])
+        db.query(SalesDailyProduct).delete()
+        db.query(SalesDaily).delete()
+        late = datetime(2026, 3, 1, 23, 59, 30, tzinfo=timezone.utc)
+        db.get(Order, order["id"]).created_at = late
+        record_order_sales(db, sales_day(late), [(laptop.id, laptop.category_id, 1, laptop.price)])
+        db.commit()
+        
+        period = (date(2026, 2, 28), date(2026, 3, 2))
+        assert check_sales_consistency(db, *period) == []
+        backfill_sales(db, *period)
+        assert [row.day for row in db.query(SalesDaily)] == [date(2026, 3, 1)]
+        assert check_sales_consistency(db, *period) == []
+    
+    def test_source_aggregates_group_by_utc_day_in_postgresql(self):
+        """Test PostgreSQL source aggregates convert created_at to UTC before taking the date"""
+        from datetime import date
+        from types import SimpleNamespace
+        from sqlalchemy.dialects import postgresql
+        from app.analytics import _source_daily_select, _source_product_select
+        
+        dialect = postgresql.dialect()
+        db = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=dialect))
+        for build in (_source_daily_select, _source_product_select):
+            sql = str(build(db, date(2026, 3, 1), date(2026, 3, 1)).compile(dialect=dialect))
+            assert "GROUP BY date(timezone(" in sql
+    
+    def test_invalid_period(self, client, admin_headers):
+        """Test reversed date range is rejected"""
+        response = client.get(
+            "/analytics/sales/daily?date_from=2024-02-01&date_to=2024-01-01",
+            headers=admin_headers
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_analytics_as_regular_user(self, client, auth_headers):
+        """Test analytics require admin"""
+        response = client.get("/analytics/sales/daily", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
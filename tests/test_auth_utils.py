@@ -5,8 +5,9 @@
 import pytest
 from app.auth import (
     verify_password, get_password_hash, create_access_token,
-    authenticate_user
+    authenticate_user, hash_rounds, needs_rehash, calibrate_bcrypt_rounds
 )
+from app.config import settings
 
 
 class TestPasswordHashing:
@@ -46,6 +47,43 @@ class TestPasswordHashing:
         assert verify_password(password, invalid_hash) is False
 
 
+class TestPasswordCost:
+    
+    def test_hash_uses_configured_rounds(self):
+        assert hash_rounds(get_password_hash("secret-password")) == settings.BCRYPT_ROUNDS
+        assert hash_rounds(get_password_hash("secret-password", rounds=5)) == 5
+        assert hash_rounds("invalid_hash_string") is None
+    
+    def test_needs_rehash(self):
+        assert not needs_rehash(get_password_hash("secret-password"))
+        assert needs_rehash(get_password_hash("secret-password", rounds=5))
+        assert needs_rehash("invalid_hash_string")
+    
+    def test_calibrate_bcrypt_rounds(self):
+        assert calibrate_bcrypt_rounds(0.001, min_rounds=4) == 4
+        assert calibrate_bcrypt_rounds(10 ** 9, min_rounds=4, max_rounds=14) == 14
+        assert 4 <= calibrate_bcrypt_rounds(50, min_rounds=4) <= 31
+    
+    def test_login_rehashes_outdated_cost(self, db, test_user, test_user_data):
+        test_user.hashed_password = get_password_hash(test_user_data["password"], rounds=5)
+        db.commit()
+        
+        user = authenticate_user(db, test_user_data["email"], test_user_data["password"])
+        
+        db.refresh(user)
+        assert hash_rounds(user.hashed_password) == settings.BCRYPT_ROUNDS
+        assert verify_password(test_user_data["password"], user.hashed_password)
+    
+    def test_failed_login_keeps_hash(self, db, test_user):
+        old_hash = get_password_hash("testpassword123", rounds=5)
+        test_user.hashed_password = old_hash
+        db.commit()
+        
+        assert authenticate_user(db, test_user.email, "wrongpassword") is None
+        db.refresh(test_user)
+        assert test_user.hashed_password == old_hash
+
+
 class TestTokenCreation:
     
     def test_create_access_token_with_expires_delta(self):
@@ -221,3 +221,17 @@ class TestCart:
         cart_response = client.get("/cart", headers=headers2)
         assert len(cart_response.json()["items"]) == 0
 
+    
+    def test_cart_row_unique_per_product(self, db, test_user, test_product):
+        """Test the database keeps one cart row per user and product"""
+        from sqlalchemy.exc import IntegrityError
+        from app.models import CartItem
+        
+        db.add_all([
+            CartItem(user_id=test_user.id, product_id=test_product.id, quantity=1),
+            CartItem(user_id=test_user.id, product_id=test_product.id, quantity=2),
+        ])
+        
+        with pytest.raises(IntegrityError):
+            db.commit()
+        db.rollback()
@@ -0,0 +1,113 @@
+"""
+Тесты метрик Prometheus: HTTP-запросы по шаблонам маршрутов, запросы к БД, пул, кэши
+"""
+
+from fastapi import status
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.cache import product_cache
+from app.metrics import instrument_engine, request_stats, RequestStats
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestHttpMetrics:
+
+    def test_requests_labelled_by_route_template(self, client, test_product):
+        """Test request counters use the route template, not the raw path"""
+        labels = {"method": "GET", "route": "/products/{product_id}"}
+        before = sample("http_requests_total", status="200", **labels)
+        duration_before = sample("http_request_duration_seconds_count", **labels)
+
+        client.get(f"/products/{test_product.id}")
+        client.get(f"/products/{test_product.id}")
+
+        assert sample("http_requests_total", status="200", **labels) == before + 2
+        assert sample("http_request_duration_seconds_count", **labels) == duration_before + 2
+        assert sample("http_requests_total", method="GET", route=f"/products/{test_product.id}", status="200") == 0
+
+    def test_unmatched_paths_share_one_label(self, client):
+        """Test unknown paths and methods do not create new label values"""
+        before = sample("http_requests_total", method="GET", route="unmatched", status="404")
+
+        client.get("/no-such-page-1")
+        client.get("/no-such-page-2")
+
+        assert sample("http_requests_total", method="GET", route="unmatched", status="404") == before + 2
+        client.request("PROPFIND", "/products/")
+        assert sample("http_requests_total", method="OTHER", route="/products/", status="405") >= 1
+
+    def test_response_size_and_db_queries(self, client, test_product):
+        """Test response bytes and per-request query counts are observed"""
+        size_before = sample("http_response_size_bytes_sum", method="GET", route="/products/")
+        queries_before = sample("db_queries_per_request_sum", route="/products/")
+
+        response = client.get("/products/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sample("http_response_size_bytes_sum", method="GET", route="/products/") == (
+            size_before + len(response.content)
+        )
+        assert sample("db_queries_per_request_sum", route="/products/") > queries_before
+
+    def test_metrics_endpoint(self, client):
+        """Test /metrics serves the text exposition format and is not itself counted"""
+        response = client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "http_requests_total" in response.text
+        assert 'route="/metrics"' not in response.text
+
+    def test_cache_hits_and_misses(self, client, test_product):
+        """Test cache counters are exported after each request"""
+        product_cache.clear()
+        misses_before = sample("cache_misses_total", cache="product")
+        hits_before = sample("cache_hits_total", cache="product")
+
+        client.get(f"/products/{test_product.id}")
+        client.get(f"/products/{test_product.id}")
+
+        assert sample("cache_misses_total", cache="product") >= misses_before + 1
+        assert sample("cache_hits_total", cache="product") >= hits_before + 1
+
+
+class TestDatabaseMetrics:
+
+    def test_queries_counted_in_request_context(self):
+        """Test cursor events accumulate into the current request stats only"""
+        engine = create_engine("sqlite://")
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+        finally:
+            request_stats.reset(token)
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 3"))
+
+        assert stats.queries == 2
+        assert stats.query_seconds > 0
+
+    def test_pool_checkout_and_connection_churn(self):
+        """Test checkout wait and opened/closed connections are recorded"""
+        checkouts_before = sample("db_pool_checkout_wait_seconds_count")
+        opened_before = sample("db_connections_opened_total")
+        closed_before = sample("db_connections_closed_total")
+
+        engine = instrument_engine(create_engine("sqlite:///:memory:"))
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        engine.dispose()
+
+        assert sample("db_pool_checkout_wait_seconds_count") == checkouts_before + 2
+        assert sample("db_connections_opened_total") == opened_before + 1
+        assert sample("db_connections_closed_total") == closed_before + 1
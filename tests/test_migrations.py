@@ -0,0 +1,224 @@
+"""
+Тесты миграций Alembic: схема после upgrade head совпадает с моделями,
+запуск миграций при развертывании и проверка готовности
+"""
+
+import pytest
+from pathlib import Path
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import StaticPool
+from alembic import command
+from alembic.config import Config
+from alembic.util.exc import AutogenerateDiffsDetected
+from fastapi import status
+from sqlalchemy.exc import OperationalError
+
+ALEMBIC_DIR = Path(__file__).parent.parent / "alembic"
+
+
+@pytest.fixture
+def migration_connection():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+def alembic_config(connection) -> Config:
+    # Без alembic.ini: env.py не перенастраивает логирование тестов
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.attributes["connection"] = connection
+    return config
+
+
+class TestMigrations:
+    
+    def test_migrations_match_models(self, migration_connection):
+        """Test upgrade head produces exactly the schema described by the models"""
+        config = alembic_config(migration_connection)
+        command.upgrade(config, "head")
+        
+        try:
+            command.check(config)
+        except AutogenerateDiffsDetected as error:
+            pytest.fail(f"Models and migrations differ: {error}")
+    
+    def test_foreign_key_indexes(self, migration_connection):
+        """Test hot foreign keys are indexed and cart/review pairs are unique"""
+        command.upgrade(alembic_config(migration_connection), "head")
+        inspector = inspect(migration_connection)
+        
+        def indexes(table):
+            return {index["name"]: index for index in inspector.get_indexes(table)}
+        
+        assert indexes("cart_items")["uq_cart_items_user_product"]["unique"]
+        assert indexes("reviews")["uq_reviews_user_product"]["unique"]
+        assert indexes("order_items")["ix_order_items_order_id"]["column_names"] == ["order_id"]
+        assert indexes("order_items")["ix_order_items_product_id"]["column_names"] == ["product_id"]
+        assert "ix_orders_user_id_created_at" in indexes("orders")
+        assert "ix_reviews_product_id_created_at" in indexes("reviews")
+    
+    def test_upgrade_from_create_all_schema(self, migration_connection):
+        """Test deployments built by create_all before migrations existed reach the model schema"""
+        config = alembic_config(migration_connection)
+        # Схема create_all до появления sku: базовые таблицы без alembic_version и без sku
+        command.upgrade(config, "0001_baseline")
+        migration_connection.execute(text("DROP TABLE alembic_version"))
+        migration_connection.execute(text("DROP INDEX ix_products_sku"))
+        migration_connection.execute(text("ALTER TABLE products DROP COLUMN sku"))
+        migration_connection.execute(text(
+            "INSERT INTO products (name, price, stock, is_active) VALUES ('Chair', 10, 1, 1)"
+        ))
+        migration_connection.commit()
+        
+        command.upgrade(config, "head")
+        
+        try:
+            command.check(config)
+        except AutogenerateDiffsDetected as error:
+            pytest.fail(f"Models and migrations differ: {error}")
+        assert migration_connection.execute(text("SELECT name, sku FROM products")).all() == [("Chair", None)]
+    
+    def test_duplicates_merged_before_unique_indexes(self, migration_connection):
+        """Test duplicate cart lines are summed and older reviews are moved to a backup table"""
+        config = alembic_config(migration_connection)
+        command.upgrade(config, "0008_admin_order_indexes")
+        migration_connection.execute(text(
+            "INSERT INTO users (id, email, name, hashed_password, is_active, is_admin) "
+            "VALUES (1, 'a@example.com', 'A', 'x', 1, 0)"
+        ))
+        migration_connection.execute(text(
+            "INSERT INTO products (id, name, price, stock, is_active) VALUES (1, 'Chair', 10, 5, 1)"
+        ))
+        migration_connection.execute(text(
+            "INSERT INTO cart_items (id, user_id, product_id, quantity) VALUES (1, 1, 1, 2), (2, 1, 1, 3)"
+        ))
+        migration_connection.execute(text(
+            "INSERT INTO reviews (id, user_id, product_id, rating) VALUES (1, 1, 1, 2), (2, 1, 1, 5)"
+        ))
+        migration_connection.commit()
+        
+        command.upgrade(config, "head")
+        
+        assert migration_connection.execute(text("SELECT id, quantity FROM cart_items")).all() == [(1, 5)]
+        assert migration_connection.execute(text("SELECT id, rating FROM reviews")).all() == [(2, 5)]
+        assert migration_connection.execute(text("SELECT id, rating FROM reviews_dedupe_backup")).all() == [(1, 2)]
+        try:
+            command.check(config)
+        except AutogenerateDiffsDetected as error:
+            pytest.fail(f"Models and migrations differ: {error}")
+    
+    def test_downgrade_to_base(self, migration_connection):
+        """Test every migration can be rolled back"""
+        config = alembic_config(migration_connection)
+        command.upgrade(config, "head")
+        command.downgrade(config, "base")
+        
+        assert set(inspect(migration_connection).get_table_names()) == {"alembic_version"}
+
+
+class LockNotAvailable(Exception):
+    pgcode = "55P03"
+
+
+class UniqueViolation(Exception):
+    pgcode = "23505"
+
+
+class TestMigrationRunner:
+    
+    def test_migrate_to_head(self):
+        """Test the runner upgrades an empty database and reports the schema as current"""
+        from app.migrate import alembic_config as project_config, migrate, schema_is_current
+        
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        with engine.connect() as connection:
+            assert not schema_is_current(connection)
+        
+        assert migrate(engine, project_config(with_ini=False)) is True
+        
+        with engine.connect() as connection:
+            assert schema_is_current(connection)
+        engine.dispose()
+    
+    def test_lock_timeouts_are_retried(self):
+        """Test lock_timeout errors are retried after rolling back"""
+        from app.migrate import run_with_retries
+        
+        attempts, rollbacks = [], []
+        
+        def action():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise OperationalError("CREATE INDEX", {}, LockNotAvailable())
+        
+        run_with_retries(action, lambda: rollbacks.append(1), retries=3, delay=0)
+        
+        assert len(attempts) == 3
+        assert len(rollbacks) == 2
+    
+    def test_other_errors_are_not_retried(self):
+        """Test errors unrelated to locks fail immediately"""
+        from app.migrate import run_with_retries
+        
+        attempts = []
+        
+        def action():
+            attempts.append(1)
+            raise OperationalError("CREATE INDEX", {}, Exception("syntax error"))
+        
+        with pytest.raises(OperationalError):
+            run_with_retries(action, lambda: None, retries=3, delay=0)
+        assert len(attempts) == 1
+    
+    def test_unique_violations_retried_when_selected(self):
+        """Test a unique index build is retried on duplicates only when asked to"""
+        from sqlalchemy.exc import IntegrityError
+        from app.migrate import is_unique_violation, run_with_retries
+        
+        attempts, cleanups = [], []
+        
+        def action():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise IntegrityError("CREATE UNIQUE INDEX CONCURRENTLY", {}, UniqueViolation())
+        
+        with pytest.raises(IntegrityError):
+            run_with_retries(action, lambda: cleanups.append(1), retries=3, delay=0)
+        run_with_retries(action, lambda: cleanups.append(1), retries=3, delay=0, retry_on=is_unique_violation)
+        
+        assert len(attempts) == 3
+        assert len(cleanups) == 1
+    
+    def test_migration_engine_uses_primary_for_read_only_roles(self, monkeypatch):
+        """Test catalog nodes migrate through a read-write engine on the primary, not the replica"""
+        from app.config import settings
+        from app.migrate import migration_engine
+        
+        monkeypatch.setattr(settings, "DEPLOY_ROLE", "catalog")
+        monkeypatch.setattr(settings, "POSTGRES_READ_HOST", "replica.internal")
+        
+        engine = migration_engine()
+        
+        assert engine.url.host == settings.POSTGRES_HOST
+        assert "options" not in engine.dialect.create_connect_args(engine.url)[1]
+    
+    def test_readiness_waits_for_schema_head(self, client, db):
+        """Test /ready answers 503 until the schema is stamped at head"""
+        from app.migrate import readiness_gate
+        
+        readiness_gate.reset()
+        try:
+            assert client.get("/ready").status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            
+            command.stamp(alembic_config(db.connection()), "head")
+            db.commit()
+            
+            response = client.get("/ready")
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == {"status": "ready"}
+        finally:
+            readiness_gate.reset()
+            db.execute(text("DROP TABLE IF EXISTS alembic_version"))
+            db.commit()
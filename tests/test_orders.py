@@ -296,3 +296,57 @@ class TestOrders:
         assert "items" in orders_data
         assert len(orders_data["items"]) == 0
 
+
+
+class TestOrderSummaries:
+    
+    def place_order(self, client, auth_headers, lines):
+        for product, quantity in lines:
+            client.post("/cart/items", json={"product_id": product.id, "quantity": quantity}, headers=auth_headers)
+        response = client.post("/orders", json={"shipping_address": "123 Test St"}, headers=auth_headers)
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()
+    
+    def test_summary_view(self, client, test_products, auth_headers, db):
+        """Test summary cards carry counts and the first item without order_items"""
+        first, second = test_products[0], test_products[1]
+        first.image_url = "/static/first.png"
+        db.commit()
+        
+        older = self.place_order(client, auth_headers, [(first, 2), (second, 3)])
+        newer = self.place_order(client, auth_headers, [(second, 1)])
+        
+        response = client.get("/orders", params={"view": "summary"}, headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["pagination"]["total"] == 2
+        assert [order["id"] for order in data["items"]] == [newer["id"], older["id"]]
+        summary = data["items"][1]
+        assert "order_items" not in summary
+        assert summary["status"] == "pending"
+        assert Decimal(str(summary["total_amount"])) == Decimal(older["total_amount"])
+        assert summary["items_count"] == 2
+        assert summary["units"] == 5
+        assert summary["first_product_id"] == first.id
+        assert summary["first_product_name"] == first.name
+        assert summary["first_product_image_url"] == "/static/first.png"
+    
+    def test_summary_pagination(self, client, test_products, auth_headers):
+        """Test summary view pages like the full view"""
+        for product in (test_products[0], test_products[1], test_products[1]):
+            self.place_order(client, auth_headers, [(product, 1)])
+        
+        full = client.get("/orders", params={"page": 2, "page_size": 2}, headers=auth_headers).json()
+        summary = client.get(
+            "/orders", params={"page": 2, "page_size": 2, "view": "summary"}, headers=auth_headers
+        ).json()
+        
+        assert summary["pagination"] == full["pagination"]
+        assert [order["id"] for order in summary["items"]] == [order["id"] for order in full["items"]]
+    
+    def test_invalid_view(self, client, auth_headers):
+        """Test unknown view value is rejected"""
+        response = client.get("/orders", params={"view": "compact"}, headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -212,3 +212,493 @@ class TestProducts:
         assert "order" in response.json()["detail"].lower()
         assert "cannot delete" in response.json()["detail"].lower()
 
+
+
+class TestProductBatch:
+    
+    def test_get_products_batch_preserves_order(self, client, test_products):
+        """Test batch fetch returns products in requested order"""
+        ids = [test_products[2].id, test_products[0].id, test_products[1].id]
+        response = client.get(f"/products/batch?ids={','.join(map(str, ids))}")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [prod["id"] for prod in data["items"]] == ids
+        assert data["missing"] == []
+        assert data["items"][0]["category"]["name"] == "Electronics"
+    
+    def test_get_products_batch_reports_missing(self, client, test_product):
+        """Test batch fetch reports missing ids"""
+        response = client.get(f"/products/batch?ids=99999,{test_product.id},99999")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [prod["id"] for prod in data["items"]] == [test_product.id]
+        assert data["missing"] == [99999]
+    
+    def test_get_products_batch_post(self, client, test_products):
+        """Test batch fetch with ids in request body"""
+        ids = [test_products[1].id, test_products[0].id]
+        response = client.post("/products/batch", json={"ids": ids})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [prod["id"] for prod in response.json()["items"]] == ids
+    
+    def test_get_products_batch_invalid_ids(self, client):
+        """Test batch fetch with malformed id list"""
+        response = client.get("/products/batch?ids=1,abc")
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_get_products_batch_too_many_ids(self, client, monkeypatch):
+        """Test batch fetch rejects lists above the configured maximum"""
+        from app.config import settings
+        
+        monkeypatch.setattr(settings, "PRODUCT_BATCH_MAX_SIZE", 2)
+        response = client.post("/products/batch", json={"ids": [1, 2, 3]})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_product_cache_invalidated_on_update(self, client, test_product, admin_headers):
+        """Test cached product is refreshed after update"""
+        assert client.get(f"/products/{test_product.id}").json()["stock"] == 10
+        
+        client.put(f"/products/{test_product.id}", json={"stock": 3}, headers=admin_headers)
+        
+        response = client.get(f"/products/batch?ids={test_product.id}")
+        assert response.json()["items"][0]["stock"] == 3
+
+
+class TestProductSparseFields:
+    
+    def test_get_products_with_fields(self, client, test_products):
+        """Test product list narrowed to requested fields"""
+        response = client.get("/products/?fields=name,price,image_url")
+        
+        assert response.status_code == status.HTTP_200_OK
+        items = response.json()["items"]
+        assert len(items) == 3
+        assert set(items[0]) == {"id", "name", "price", "image_url"}
+    
+    def test_get_products_with_category_field(self, client, test_products):
+        """Test embedded category is loaded only when requested"""
+        response = client.get("/products/?fields=name,category")
+        
+        assert response.status_code == status.HTTP_200_OK
+        item = response.json()["items"][0]
+        assert set(item) == {"id", "name", "category"}
+        assert item["category"]["name"] == "Electronics"
+    
+    def test_get_product_with_fields(self, client, test_product):
+        """Test single product narrowed to requested fields, cached and uncached"""
+        for _ in range(2):
+            response = client.get(f"/products/{test_product.id}?fields=name,stock")
+            
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == {"id": test_product.id, "name": test_product.name, "stock": 10}
+            client.get(f"/products/{test_product.id}")
+    
+    def test_get_products_batch_with_fields(self, client, test_products):
+        """Test batch fetch narrowed to requested fields"""
+        ids = [test_products[1].id, test_products[0].id]
+        response = client.post("/products/batch?fields=price", json={"ids": ids + [99999]})
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [set(item) for item in data["items"]] == [{"id", "price"}, {"id", "price"}]
+        assert data["missing"] == [99999]
+    
+    def test_fields_model_reused_and_bounded(self):
+        """Test narrowed schemas are built once per field set and the cache is capped"""
+        from app.schemas import PRODUCT_SIDELOAD_FIELDS, get_product_fields_model
+        from app.schemas.schemas import PRODUCT_FIELDS_MODEL_CACHE_SIZE
+        
+        assert get_product_fields_model(("id", "name")) is get_product_fields_model(("id", "name"))
+        assert get_product_fields_model.cache_info().maxsize == PRODUCT_FIELDS_MODEL_CACHE_SIZE
+        hits = get_product_fields_model.cache_info().hits
+        get_product_fields_model(PRODUCT_SIDELOAD_FIELDS)
+        assert get_product_fields_model.cache_info().hits == hits + 1
+
+    def test_get_products_unknown_field(self, client):
+        """Test unknown field is rejected"""
+        response = client.get("/products/?fields=name,hashed_password")
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestProductSideloading:
+    
+    def test_get_products_include_category(self, client, db, test_products):
+        """Test categories are returned once in the included block"""
+        from app.models import Category, Product
+        from decimal import Decimal
+        
+        books = Category(name="Books", description="Paper")
+        db.add(books)
+        db.commit()
+        db.add(Product(name="Novel", price=Decimal("9.99"), stock=1, category_id=books.id, is_active=1))
+        db.add(Product(name="Loose item", price=Decimal("1.00"), stock=1, is_active=1))
+        db.commit()
+        
+        response = client.get("/products/?include=category")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data["items"]) == 5
+        assert all("category" not in item and "category_id" in item for item in data["items"])
+        assert "description" in data["items"][0]
+        categories = data["included"]["categories"]
+        assert set(categories) == {str(test_products[0].category_id), str(books.id)}
+        assert categories[str(books.id)]["name"] == "Books"
+    
+    def test_get_products_include_category_with_fields(self, client, test_products):
+        """Test sideloading combined with sparse fieldsets"""
+        response = client.get("/products/?include=category&fields=name,category")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert set(data["items"][0]) == {"id", "name", "category_id"}
+        assert len(data["included"]["categories"]) == 1
+    
+    def test_included_category_refreshed_after_update(self, client, test_products, admin_headers):
+        """Test cached category is invalidated on update"""
+        category_id = test_products[0].category_id
+        client.get("/products/?include=category")
+        client.put(f"/categories/{category_id}", json={"name": "Gadgets"}, headers=admin_headers)
+        
+        response = client.get("/products/?include=category")
+        assert response.json()["included"]["categories"][str(category_id)]["name"] == "Gadgets"
+    
+    def test_get_products_unknown_include(self, client):
+        """Test unknown include is rejected"""
+        response = client.get("/products/?include=reviews")
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestProductReadPaths:
+    
+    def test_anonymous_and_admin_lists_match(self, client, test_products, admin_headers):
+        """Test Core fast path and ORM path serialize products identically"""
+        anonymous = client.get("/products/").json()
+        admin = client.get("/products/", headers=admin_headers).json()
+        
+        assert anonymous == admin
+    
+    def test_include_inactive_only_for_admin(self, client, db, test_products, admin_headers):
+        """Test inactive products are visible only to admins"""
+        test_products[0].is_active = 0
+        db.commit()
+        
+        anonymous = client.get("/products/?include_inactive=true").json()
+        admin = client.get("/products/?include_inactive=true", headers=admin_headers).json()
+        
+        assert anonymous["pagination"]["total"] == 2
+        assert admin["pagination"]["total"] == 3
+
+
+class TestProductImport:
+    
+    def test_import_csv(self, client, test_category, admin_headers):
+        """Test CSV import resolves categories by name and reports bad rows"""
+        content = (
+            "sku,name,price,stock,category,description\n"
+            "SKU-1,Phone,199.99,5,Electronics,\"Line one\nline two\"\n"
+            "SKU-2,Cable,-1,5,Electronics,\n"
+            "SKU-3,Lamp,15.00,2,Unknown,\n"
+            ",No SKU item,3.50,1,,\n"
+        )
+        
+        response = client.post(
+            "/products/import",
+            files={"file": ("feed.csv", content, "text/csv")},
+            headers=admin_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        report = response.json()
+        assert report["processed"] == 4
+        assert report["imported"] == 2
+        assert report["failed"] == 2
+        assert [error["row"] for error in report["errors"]] == [2, 3]
+        
+        products = client.get("/products/?fields=sku,name,category_id,description").json()["items"]
+        phone = next(product for product in products if product["sku"] == "SKU-1")
+        assert phone["category_id"] == test_category.id
+        assert phone["description"] == "Line one\nline two"
+    
+    def test_import_jsonl_upserts_by_sku(self, client, test_category, admin_headers):
+        """Test JSON Lines import updates existing products by SKU"""
+        first = '{"sku": "A-1", "name": "Chair", "price": "10.00", "stock": 1}\n'
+        second = (
+            '{"sku": "A-1", "name": "Chair v2", "price": "12.50", "stock": 7}\n'
+            'not json\n'
+        )
+        client.post("/products/import", files={"file": ("a.jsonl", first)}, headers=admin_headers)
+        
+        response = client.post(
+            "/products/import?format=jsonl",
+            files={"file": ("feed.txt", second)},
+            headers=admin_headers
+        )
+        
+        report = response.json()
+        assert report["imported"] == 1
+        assert report["failed"] == 1
+        products = client.get("/products/").json()["items"]
+        assert len(products) == 1
+        assert products[0]["name"] == "Chair v2"
+        assert products[0]["stock"] == 7
+    
+    def test_import_partial_feed_keeps_other_columns(self, client, db, test_category, admin_headers):
+        """Test a feed without some columns does not wipe them or relist delisted products"""
+        from app.models import Product
+
+        product = Product(
+            sku="P-1", name="Sofa", description="Leather sofa", price=Decimal("500.00"), stock=1,
+            category_id=test_category.id, image_url="http://img/sofa.png", is_active=0
+        )
+        db.add(product)
+        db.commit()
+
+        content = "sku,name,price,stock\nP-1,Sofa XL,450.00,3\n"
+        response = client.post(
+            "/products/import",
+            files={"file": ("feed.csv", content, "text/csv")},
+            headers=admin_headers
+        )
+
+        assert response.json()["imported"] == 1
+        db.refresh(product)
+        assert (product.name, product.price, product.stock) == ("Sofa XL", Decimal("450.00"), 3)
+        assert product.description == "Leather sofa"
+        assert product.category_id == test_category.id
+        assert product.image_url == "http://img/sofa.png"
+        assert product.is_active == 0
+
+    def test_import_requires_admin(self, client, auth_headers):
+        """Test import is restricted to admins"""
+        response = client.post(
+            "/products/import",
+            files={"file": ("feed.csv", "name,price,stock\nX,1,1\n")},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    def test_create_product_duplicate_sku(self, client, admin_headers):
+        """Test SKU uniqueness on product creation"""
+        product = {"sku": "DUP", "name": "One", "price": 1, "stock": 1}
+        assert client.post("/products/", json=product, headers=admin_headers).status_code == 201
+        
+        response = client.post("/products/", json=product, headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestProductExport:
+    
+    def test_export_csv(self, client, test_products, admin_headers):
+        """Test CSV export includes category names and honours filters"""
+        import csv
+        import io
+        
+        response = client.get("/products/export?format=csv&in_stock=true", headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["name"] for row in rows] == ["Laptop Pro", "Wireless Mouse"]
+        assert rows[0]["category"] == "Electronics"
+    
+    def test_export_jsonl(self, client, test_products, admin_headers):
+        """Test JSON Lines export"""
+        import json
+        
+        response = client.get("/products/export?format=jsonl&search=mouse", headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 1
+        assert rows[0]["name"] == "Wireless Mouse"
+        assert rows[0]["price"] == "29.99"
+    
+    def test_export_import_round_trip(self, client, test_category, admin_headers):
+        """Test exported CSV can be imported back"""
+        product = {"sku": "RT-1", "name": "Desk", "price": 50, "stock": 2, "category_id": test_category.id}
+        client.post("/products/", json=product, headers=admin_headers)
+        exported = client.get("/products/export", headers=admin_headers).text
+        
+        response = client.post(
+            "/products/import",
+            files={"file": ("products.csv", exported)},
+            headers=admin_headers
+        )
+        
+        assert response.json()["imported"] == 1
+        assert response.json()["failed"] == 0
+        assert client.get("/products/").json()["pagination"]["total"] == 1
+    
+    def test_export_requires_admin(self, client, auth_headers):
+        """Test export is restricted to admins"""
+        response = client.get("/products/export", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestProductBulkUpdate:
+    
+    def test_bulk_update_mixed_fields(self, client, test_products, admin_headers):
+        """Test items with different field sets are applied in one request"""
+        laptop, mouse, hub = test_products
+        payload = {"items": [
+            {"id": laptop.id, "price": "1199.99"},
+            {"id": mouse.id, "stock": 7, "is_active": 0},
+            {"id": hub.id, "price": "45.00", "stock": 20},
+            {"id": 99999, "stock": 1},
+        ]}
+        
+        response = client.patch("/products/bulk", json=payload, headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["updated_ids"] == sorted([laptop.id, mouse.id, hub.id])
+        assert data["not_found"] == [99999]
+        
+        products = {p["id"]: p for p in client.get("/products/?include_inactive=true", headers=admin_headers).json()["items"]}
+        assert products[laptop.id]["price"] == "1199.99"
+        assert products[laptop.id]["stock"] == 5
+        assert products[mouse.id]["stock"] == 7
+        assert products[mouse.id]["is_active"] == 0
+        assert products[hub.id]["price"] == "45.00"
+        assert products[hub.id]["stock"] == 20
+    
+    def test_bulk_price_adjustment(self, client, test_products, test_category, admin_headers):
+        """Test percentage price change for a whole category"""
+        payload = {"price_adjustment": {"category_id": test_category.id, "percent": -10}}
+        
+        response = client.patch("/products/bulk", json=payload, headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["updated_ids"]) == 3
+        prices = {p["name"]: p["price"] for p in client.get("/products/").json()["items"]}
+        assert prices == {"Laptop Pro": "1169.99", "Wireless Mouse": "26.99", "USB-C Hub": "44.99"}
+    
+    def test_bulk_update_invalidates_cache(self, client, test_product, admin_headers):
+        """Test cached product reads see bulk changes"""
+        client.get(f"/products/{test_product.id}")
+        
+        client.patch(
+            "/products/bulk",
+            json={"items": [{"id": test_product.id, "stock": 3}]},
+            headers=admin_headers
+        )
+        
+        assert client.get(f"/products/{test_product.id}").json()["stock"] == 3
+    
+    def test_bulk_item_without_changes_rejected(self, client, test_product, admin_headers):
+        """Test an item naming an existing product without fields is a validation error, not not_found"""
+        payload = {"items": [{"id": test_product.id + 1000, "stock": 3}, {"id": test_product.id}]}
+        response = client.patch("/products/bulk", json=payload, headers=admin_headers)
+        
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][:3] == ["body", "items", 1]
+        
+        payload = {"items": [{"id": test_product.id, "price": None}]}
+        assert client.patch("/products/bulk", json=payload, headers=admin_headers).status_code == 422
+    
+    def test_bulk_update_validation(self, client, test_product, admin_headers):
+        """Test empty, duplicate and unknown category requests are rejected"""
+        assert client.patch("/products/bulk", json={}, headers=admin_headers).status_code == 400
+        
+        duplicate = {"items": [{"id": test_product.id, "stock": 1}, {"id": test_product.id, "stock": 2}]}
+        assert client.patch("/products/bulk", json=duplicate, headers=admin_headers).status_code == 400
+        
+        unknown = {"price_adjustment": {"category_id": 99999, "percent": 5}}
+        assert client.patch("/products/bulk", json=unknown, headers=admin_headers).status_code == 404
+    
+    def test_bulk_update_as_regular_user(self, client, test_product, auth_headers):
+        """Test bulk update requires admin"""
+        response = client.patch(
+            "/products/bulk",
+            json={"items": [{"id": test_product.id, "stock": 1}]},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestProductRankings:
+    
+    def test_rankings_from_orders(self, client, db, test_products, auth_headers):
+        """Test placed orders feed bestseller rankings after a refresh"""
+        from app.rankings import refresh_rankings
+        
+        laptop, mouse, _ = test_products
+        client.post("/cart/items", json={"product_id": mouse.id, "quantity": 3}, headers=auth_headers)
+        client.post("/cart/items", json={"product_id": laptop.id, "quantity": 1}, headers=auth_headers)
+        client.post("/orders", json={"shipping_address": "123 Test St"}, headers=auth_headers)
+        
+        assert client.get("/products/bestsellers").json()["items"] == []
+        refresh_rankings(db)
+        
+        response = client.get("/products/bestsellers")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["cache-control"].startswith("public")
+        assert [item["name"] for item in response.json()["items"]] == ["Wireless Mouse", "Laptop Pro"]
+    
+    def test_trending_favours_recent_sales(self, client, db, test_products):
+        """Test old sales decay faster in trending than in bestsellers"""
+        from app.rankings import record_product_sales, refresh_rankings
+        
+        laptop, mouse, _ = test_products
+        now = 1_800_000_000.0
+        record_product_sales(db, [(laptop.id, 10)], now=now - 30 * 86400)
+        record_product_sales(db, [(mouse.id, 4)], now=now)
+        db.commit()
+        refresh_rankings(db, now=now)
+        
+        bestsellers = client.get("/products/bestsellers").json()["items"]
+        trending = client.get("/products/trending").json()["items"]
+        assert [item["id"] for item in bestsellers] == [laptop.id, mouse.id]
+        assert [item["id"] for item in trending] == [mouse.id, laptop.id]
+    
+    def test_counters_decay_on_update(self, db, test_product):
+        """Test repeated sales decay the stored score before adding units"""
+        from app.config import settings
+        from app.models import ProductPopularity
+        from app.rankings import record_product_sales
+        
+        half_life = settings.TRENDING_HALF_LIFE_DAYS * 86400
+        record_product_sales(db, [(test_product.id, 2)], now=1_000.0)
+        record_product_sales(db, [(test_product.id, 1)], now=1_000.0 + half_life)
+        db.commit()
+        
+        popularity = db.get(ProductPopularity, test_product.id)
+        assert popularity.trending_score == pytest.approx(2.0)
+        assert popularity.units_sold == 3
+    
+    def test_category_ranking_and_limit(self, client, db, test_products, test_category):
+        """Test per-category lists, limit and inactive products"""
+        from app.models import Category, Product
+        from app.rankings import record_product_sales, refresh_rankings
+        from decimal import Decimal
+        
+        other = Category(name="Books")
+        db.add(other)
+        db.flush()
+        book = Product(name="Novel", price=Decimal("10.00"), stock=5, category_id=other.id, is_active=1)
+        hidden = Product(name="Hidden", price=Decimal("10.00"), stock=5, category_id=other.id, is_active=0)
+        db.add_all([book, hidden])
+        db.flush()
+        laptop, mouse, hub = test_products
+        record_product_sales(db, [(book.id, 9), (hidden.id, 50), (laptop.id, 5), (mouse.id, 3), (hub.id, 1)])
+        db.commit()
+        refresh_rankings(db)
+        
+        overall = client.get("/products/bestsellers?limit=2").json()["items"]
+        assert [item["name"] for item in overall] == ["Novel", "Laptop Pro"]
+        
+        response = client.get(f"/products/trending?category_id={test_category.id}")
+        assert response.json()["category_id"] == test_category.id
+        assert [item["name"] for item in response.json()["items"]] == ["Laptop Pro", "Wireless Mouse", "USB-C Hub"]
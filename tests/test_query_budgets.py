@@ -0,0 +1,142 @@
+"""
+Тесты бюджетов SQL-запросов эндпоинтов: число запросов не зависит от размера ответа
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.cache import product_cache, category_cache, ranking_cache, recommendation_cache
+from app.models import CartItem, Category, Order, OrderItem, OrderStatus, Product, Review, User
+from tests.querycount import QueryBudgetExceeded, QueryCounter, statement_shape
+
+# (метод, шаблон маршрута) -> наибольшее число запросов, включая проверку токена
+QUERY_BUDGETS = {
+    ("GET", "/products/"): 3,
+    ("GET", "/products/{product_id}"): 1,
+    ("GET", "/categories/"): 2,
+    ("GET", "/cart"): 2,
+    ("GET", "/orders"): 3,
+    ("GET", "/orders/{order_id}"): 2,
+    ("GET", "/reviews/product/{product_id}"): 3,
+    ("GET", "/reviews/my"): 3,
+    ("GET", "/admin/orders"): 2,
+    ("POST", "/orders"): 11,
+}
+
+ORDER_DATA = {"shipping_address": "1 Budget St", "payment_method": "credit_card"}
+
+
+def add_shopping_data(db, user, count):
+    """Добавляет count товаров в отдельных категориях, позиций корзины, заказов и отзывов"""
+    for _ in range(count):
+        category = Category(name=f"Category {db.query(Category).count()}")
+        product = Product(name="Product", price=Decimal("10.00"), stock=100, category=category, is_active=1)
+        reviewer = User(name="Reviewer", email=f"reviewer{db.query(User).count()}@example.com", hashed_password="x")
+        db.add_all([category, product, reviewer])
+        db.flush()
+        db.add(CartItem(user_id=user.id, product_id=product.id, quantity=1))
+        db.add(Review(user_id=reviewer.id, product_id=product.id, rating=5, comment="Good"))
+        db.add(Review(user_id=user.id, product_id=product.id, rating=4, comment="Fine"))
+    db.flush()
+
+    products = db.query(Product).all()
+    for _ in range(count):
+        order = Order(
+            user_id=user.id, total_amount=Decimal("10.00") * len(products),
+            status=OrderStatus.PENDING, shipping_address="1 Budget St"
+        )
+        order.order_items = [OrderItem(product_id=p.id, quantity=1, price=p.price) for p in products]
+        db.add(order)
+    db.commit()
+
+
+def clear_caches():
+    product_cache.clear()
+    category_cache.clear()
+    ranking_cache.clear()
+    recommendation_cache.clear()
+
+
+def measure(client, method, path, **kwargs):
+    """Запросы одного HTTP-запроса с холодными кэшами"""
+    clear_caches()
+    response = client.request(method, path, **kwargs)
+    assert response.status_code < 400, response.text
+    return client.last_queries
+
+
+class TestQueryBudgets:
+
+    @pytest.mark.parametrize("method, route", [key for key in QUERY_BUDGETS if key != ("POST", "/orders")])
+    def test_read_endpoints_within_budget(self, client, db, test_user, auth_headers, admin_headers, method, route):
+        """Test read endpoints stay within budget and do not grow with result size"""
+        headers = admin_headers if route.startswith("/admin") else auth_headers
+        counts = []
+        for count in (1, 6):
+            add_shopping_data(db, test_user, count)
+            path = route.format(
+                product_id=db.query(Product.id).first()[0],
+                order_id=db.query(Order.id).first()[0],
+            )
+            queries = measure(client, method, path, headers=headers)
+            queries.assert_budget(QUERY_BUDGETS[(method, route)], max_repeats=2)
+            counts.append(queries.count)
+
+        assert counts[0] == counts[1], f"{route}: {counts[0]} queries for 1 row, {counts[1]} for 7"
+
+    def test_checkout_within_budget(self, client, db, test_user, auth_headers):
+        """Test checkout issues the same number of queries for 1 and 6 cart lines"""
+        counts = []
+        for count in (1, 6):
+            db.query(CartItem).delete()
+            db.commit()
+            add_shopping_data(db, test_user, count)
+            queries = measure(client, "POST", "/orders", json=ORDER_DATA, headers=auth_headers)
+            queries.assert_budget(QUERY_BUDGETS[("POST", "/orders")], max_repeats=2)
+            counts.append(queries.count)
+
+        assert counts[0] == counts[1]
+
+
+class TestQueryCounter:
+
+    def test_statement_shape(self):
+        """Test values and IN lists are stripped from statement shapes"""
+        assert statement_shape("SELECT * FROM products WHERE id = 5 AND name = 'a''b'") == (
+            "SELECT * FROM products WHERE id = ? AND name = ?"
+        )
+        assert statement_shape("SELECT * FROM products\n WHERE id IN (?, ?, ?)") == (
+            "SELECT * FROM products WHERE id IN (?)"
+        )
+        assert statement_shape("SELECT * FROM products WHERE id = %(id_1)s") == (
+            "SELECT * FROM products WHERE id = ?"
+        )
+
+    def test_repeated_statement_fails(self, db, test_products, count_queries):
+        """Test lazy loading in a loop is reported as N+1"""
+        db.expire_all()
+        with count_queries() as queries:
+            for product in db.query(Product).all():
+                product.reviews
+
+        assert queries.count == 4
+        with pytest.raises(QueryBudgetExceeded, match="3x SELECT reviews"):
+            queries.assert_budget(max_repeats=3)
+        with pytest.raises(QueryBudgetExceeded, match="4 queries, budget 2"):
+            queries.assert_budget(2)
+        queries.assert_budget(4, max_repeats=4)
+
+    def test_client_fails_on_n_plus_one(self, client, test_product):
+        """Test the test client checks every request for repeated statements"""
+        client.max_repeats = 1
+        with pytest.raises(QueryBudgetExceeded):
+            client.get(f"/products/{test_product.id}")
+
+    def test_counter_only_sees_its_engine(self, db, test_product):
+        """Test a counter bound to another engine does not count test queries"""
+        from sqlalchemy import create_engine
+
+        with QueryCounter(create_engine("sqlite://")) as queries:
+            db.query(Product).all()
+        assert queries.count == 0
@@ -0,0 +1,116 @@
+"""
+Тесты ограничения частоты запросов: корзины токенов, ключи клиентов, политики маршрутов
+"""
+
+import asyncio
+
+import pytest
+from fastapi import status
+
+from app.config import settings
+from app.ratelimit import MemoryBackend, RateLimiter, client_ip, load_backend, route_policy
+
+
+@pytest.fixture
+def tight_limits(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_RATE", 0.001)
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 3)
+    monkeypatch.setattr(settings, "RATE_LIMIT_AUTH_RATE", 0.001)
+    monkeypatch.setattr(settings, "RATE_LIMIT_AUTH_BURST", 2)
+
+
+def login(client, password="wrongpassword", **headers):
+    return client.post("/auth/login", data={"username": "test@example.com", "password": password}, headers=headers)
+
+
+class TestRateLimit:
+
+    def test_login_attempts_limited(self, client, test_user, tight_limits):
+        """Test brute-forcing login is rejected with 429 and Retry-After"""
+        assert login(client).status_code == status.HTTP_401_UNAUTHORIZED
+        assert login(client).status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = login(client, password="testpassword123")
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["retry-after"]) >= 1
+        assert response.json() == {"detail": "Too many requests"}
+
+        # Корзина входа отдельная: чтение каталога не затронуто
+        assert client.get("/categories/").status_code == status.HTTP_200_OK
+
+    def test_route_costs(self, client, tight_limits):
+        """Test the product list with COUNT costs more than cached reads"""
+        assert client.get("/products/").status_code == status.HTTP_200_OK
+        assert client.get("/products/").status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        assert client.get("/categories/").status_code == status.HTTP_200_OK
+        assert client.get("/categories/").status_code == status.HTTP_200_OK
+        assert client.get("/categories/").status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        assert route_policy("POST", "/auth/login") == ("auth", 1)
+        assert route_policy("GET", "/products/42/similar") == ("default", 0.5)
+        assert route_policy("DELETE", "/cart") == ("default", 1.0)
+
+    def test_probes_not_limited(self, client, tight_limits):
+        """Test health probes are never rate limited"""
+        for _ in range(10):
+            assert client.get("/health").status_code == status.HTTP_200_OK
+
+    def test_authenticated_user_has_own_bucket(self, client, auth_headers, tight_limits):
+        """Test requests with a valid token are keyed by token subject, not IP"""
+        for _ in range(3):
+            client.get("/cart")
+        assert client.get("/cart").status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        assert client.get("/cart", headers=auth_headers).status_code == status.HTTP_200_OK
+
+    def test_forwarded_for_behind_trusted_proxy(self, client, test_user, tight_limits, monkeypatch):
+        """Test clients behind nginx are told apart by the address nginx appended"""
+        monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 1)
+        for _ in range(2):
+            login(client, **{"X-Forwarded-For": "1.2.3.4, 10.0.0.1"})
+
+        # Подмена левой части заголовка не дает новой корзины
+        assert login(client, **{"X-Forwarded-For": "5.6.7.8, 10.0.0.1"}).status_code == (
+            status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        assert login(client, **{"X-Forwarded-For": "10.0.0.2"}).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_client_ip(self, monkeypatch):
+        """Test X-Forwarded-For is ignored unless proxies are trusted"""
+        scope = {"client": ("172.18.0.5", 5000), "headers": [(b"x-forwarded-for", b"9.9.9.9, 1.2.3.4")]}
+
+        monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 0)
+        assert client_ip(scope) == "172.18.0.5"
+        monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 1)
+        assert client_ip(scope) == "1.2.3.4"
+        monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 2)
+        assert client_ip(scope) == "9.9.9.9"
+        assert client_ip({"client": ("172.18.0.5", 5000), "headers": []}) == "172.18.0.5"
+
+    def test_memory_backend_refill_and_eviction(self):
+        """Test buckets refill over time and the oldest bucket is evicted"""
+        backend = MemoryBackend(max_keys=2)
+
+        async def scenario():
+            assert await backend.take("a", 1, rate=1000, burst=1) == 0
+            assert await backend.take("a", 1, rate=0.5, burst=1) > 0
+            await asyncio.sleep(0.01)
+            assert await backend.take("a", 1, rate=1000, burst=1) == 0
+
+            await backend.take("b", 1, rate=0.001, burst=1)
+            await backend.take("c", 1, rate=0.001, burst=1)
+            assert await backend.take("a", 1, rate=0.001, burst=1) == 0
+
+        asyncio.run(scenario())
+
+    def test_pluggable_backend(self):
+        """Test the backend is loaded from a module:Class path"""
+        assert isinstance(load_backend("app.ratelimit:MemoryBackend"), MemoryBackend)
+
+        class RejectAll:
+            async def take(self, key, cost, rate, burst):
+                return 2.5
+
+        scope = {"type": "http", "method": "GET", "path": "/products/1", "client": ("127.0.0.1", 1), "headers": []}
+        assert asyncio.run(RateLimiter(RejectAll()).check(scope)) == 2.5
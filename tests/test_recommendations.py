@@ -0,0 +1,300 @@
+"""
+Тесты рекомендаций товаров
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from fastapi import status
+
+
+@pytest.fixture
+def catalog(db, test_category):
+    from app.models import Product
+    
+    products = [
+        Product(name=name, price=Decimal("10.00"), stock=100, category_id=test_category.id, is_active=1)
+        for name in ("Camera", "Memory Card", "Tripod", "Bag", "Lens")
+    ]
+    db.add_all(products)
+    db.commit()
+    return {product.name: product for product in products}
+
+
+def add_orders(db, user, baskets, age=timedelta(hours=1)):
+    from app.models import Order, OrderItem, OrderStatus
+    
+    orders = []
+    for basket in baskets:
+        order = Order(
+            user_id=user.id,
+            total_amount=Decimal("10.00") * len(basket),
+            status=OrderStatus.PENDING,
+            shipping_address="123 Test St",
+            created_at=datetime.now(timezone.utc) - age
+        )
+        orders.append(order)
+        db.add(order)
+        db.flush()
+        db.add_all(
+            OrderItem(order_id=order.id, product_id=product.id, quantity=1, price=Decimal("10.00"))
+            for product in basket
+        )
+    db.commit()
+    return orders
+
+
+class TestCooccurrenceCounting:
+    
+    def test_pairs_and_item_counts(self):
+        """Test pair counts are per basket and ignore repeated lines"""
+        from app.also_bought import count_cooccurrences
+        
+        orders = np.array([1, 1, 1, 2, 2, 2, 3])
+        products = np.array([3, 1, 1, 1, 3, 2, 1])
+        
+        items, item_counts, product_a, product_b, pair_counts, baskets = count_cooccurrences(orders, products, 10)
+        
+        assert baskets == 3
+        assert dict(zip(items.tolist(), item_counts.tolist())) == {1: 3, 2: 1, 3: 2}
+        pairs = {(a, b): c for a, b, c in zip(product_a.tolist(), product_b.tolist(), pair_counts.tolist())}
+        assert pairs == {(1, 3): 2, (1, 2): 1, (2, 3): 1}
+    
+    def test_large_baskets_are_skipped(self):
+        """Test baskets above the size cap do not produce pairs"""
+        from app.also_bought import count_cooccurrences
+        
+        orders = np.array([1, 1, 1, 2, 2])
+        products = np.array([1, 2, 3, 1, 2])
+        
+        items, _, product_a, product_b, pair_counts, baskets = count_cooccurrences(orders, products, 2)
+        
+        assert baskets == 1
+        assert items.tolist() == [1, 2]
+        assert list(zip(product_a.tolist(), product_b.tolist(), pair_counts.tolist())) == [(1, 2, 1)]
+
+
+class TestAlsoBought:
+    
+    def test_also_bought_ranked_by_lift(self, client, db, test_user, catalog):
+        """Test neighbours are ranked by lift and weak pairs are dropped"""
+        from app.also_bought import build_also_bought
+        
+        camera, card, tripod, bag = (catalog[name] for name in ("Camera", "Memory Card", "Tripod", "Bag"))
+        add_orders(db, test_user, [
+            [camera, card], [camera, card], [camera, tripod], [camera, tripod],
+            [tripod], [tripod], [bag, camera],
+        ])
+        
+        report = build_also_bought(db)
+        
+        assert report["orders"] == 7
+        response = client.get(f"/products/{camera.id}/also-bought")
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["name"] for item in response.json()["items"]] == ["Memory Card", "Tripod"]
+    
+    def test_incremental_run_processes_only_new_orders(self, client, db, test_user, catalog):
+        """Test a second run only reads orders created since the last run"""
+        from app.also_bought import build_also_bought
+        
+        camera, lens = catalog["Camera"], catalog["Lens"]
+        add_orders(db, test_user, [[camera, lens]])
+        build_also_bought(db)
+        assert client.get(f"/products/{camera.id}/also-bought").json()["items"] == []
+        
+        add_orders(db, test_user, [[camera, lens]])
+        report = build_also_bought(db)
+        
+        assert report["orders"] == 1
+        assert [item["name"] for item in client.get(f"/products/{lens.id}/also-bought").json()["items"]] == ["Camera"]
+        assert build_also_bought(db)["orders"] == 0
+    
+    def test_recent_orders_wait_for_next_run(self, db, test_user, catalog):
+        """Test the watermark stops before orders younger than the settle interval"""
+        from app.also_bought import JOB_NAME, build_also_bought
+        from app.recommendations import get_job_state
+        
+        camera, lens = catalog["Camera"], catalog["Lens"]
+        first, = add_orders(db, test_user, [[camera, lens]])
+        recent, = add_orders(db, test_user, [[camera, lens]], age=timedelta(0))
+        add_orders(db, test_user, [[camera, lens]])
+        
+        assert build_also_bought(db)["orders"] == 1
+        assert get_job_state(db, JOB_NAME).last_id == first.id
+        
+        recent.created_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.commit()
+        assert build_also_bought(db)["orders"] == 2
+    
+    def test_rebuild_matches_incremental(self, db, test_user, catalog):
+        """Test rebuilding from scratch gives the same counters as incremental runs"""
+        from app.also_bought import build_also_bought
+        from app.models import ProductPairCount
+        
+        camera, card, tripod = catalog["Camera"], catalog["Memory Card"], catalog["Tripod"]
+        add_orders(db, test_user, [[camera, card, tripod]])
+        build_also_bought(db, chunk_orders=1)
+        add_orders(db, test_user, [[camera, card]])
+        build_also_bought(db, chunk_orders=1)
+        incremental = {(p.product_a, p.product_b, p.count) for p in db.query(ProductPairCount)}
+        
+        build_also_bought(db, reset=True, refresh_all=True)
+        rebuilt = {(p.product_a, p.product_b, p.count) for p in db.query(ProductPairCount)}
+        
+        assert rebuilt == incremental
+    
+    def test_also_bought_unknown_product(self, client):
+        """Test recommendations for a missing product"""
+        response = client.get("/products/99999/also-bought")
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.fixture
+def text_catalog(db, test_category):
+    from app.models import Category, Product
+    
+    kitchen = Category(name="Kitchen", description="Kitchen goods")
+    db.add(kitchen)
+    db.flush()
+    products = [
+        Product(name=name, description=description, price=Decimal("10.00"), stock=100, category_id=category_id, is_active=1)
+        for name, description, category_id in (
+            ("Mirrorless Camera", "Mirrorless body with interchangeable lens mount", test_category.id),
+            ("Compact Camera", "Pocket camera with zoom lens", test_category.id),
+            ("Camera Lens", "Prime lens for mirrorless mount", test_category.id),
+            ("Ceramic Mug", "Ceramic mug for coffee", kitchen.id),
+            ("Tea Cup", "Porcelain cup for tea", kitchen.id),
+            ("Coffee Grinder", "Burr grinder for coffee beans", kitchen.id),
+        )
+    ]
+    db.add_all(products)
+    db.commit()
+    return {product.name: product for product in products}
+
+
+def similar_names(client, product):
+    response = client.get(f"/products/{product.id}/similar")
+    assert response.status_code == status.HTTP_200_OK
+    return [item["name"] for item in response.json()["items"]]
+
+
+class TestSimilarProducts:
+    
+    def test_block_similarity_matches_dense(self, db, text_catalog):
+        """Test blocked sparse similarity equals the dense cosine matrix"""
+        from app.similar_products import load_matrix
+        
+        matrix = load_matrix(db)
+        dense = np.zeros((len(matrix), int(matrix.indices.max()) + 1))
+        for row in range(len(matrix)):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            dense[row, matrix.indices[start:end]] = matrix.data[start:end]
+        
+        rows = np.array([1, 4])
+        np.testing.assert_allclose(matrix.similarity_block(rows), dense[rows] @ dense.T)
+        np.testing.assert_allclose(np.linalg.norm(dense, axis=1), 1.0)
+    
+    def test_similar_ranked_by_text_and_category(self, client, db, text_catalog):
+        """Test neighbours share words and category; the product itself is excluded"""
+        from app.similar_products import build_similar_products
+        
+        report = build_similar_products(db)
+        
+        assert report["refreshed"] == len(text_catalog)
+        names = similar_names(client, text_catalog["Mirrorless Camera"])
+        assert names[0] == "Camera Lens"
+        assert "Mirrorless Camera" not in names
+        assert set(names[:2]) == {"Camera Lens", "Compact Camera"}
+        assert similar_names(client, text_catalog["Ceramic Mug"])[0] == "Coffee Grinder"
+    
+    def test_incremental_refresh_after_update(self, client, db, admin_headers, text_catalog):
+        """Test an edited product is queued and only affected lists are recomputed"""
+        from app.models import ProductSimilarityQueue
+        from app.similar_products import build_similar_products
+        
+        build_similar_products(db)
+        assert db.query(ProductSimilarityQueue).count() == 0
+        
+        tea = text_catalog["Tea Cup"]
+        response = client.put(
+            f"/products/{tea.id}",
+            json={"name": "Tea Mug", "description": "Ceramic mug for tea"},
+            headers=admin_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert db.query(ProductSimilarityQueue.product_id).scalar() == tea.id
+        
+        report = build_similar_products(db)
+        
+        assert report["queued"] == 1
+        assert report["refreshed"] < len(text_catalog)
+        assert db.query(ProductSimilarityQueue).count() == 0
+        assert similar_names(client, tea)[0] == "Ceramic Mug"
+        assert similar_names(client, text_catalog["Ceramic Mug"])[0] == "Tea Mug"
+    
+    def test_price_update_is_not_queued(self, client, db, admin_headers, text_catalog):
+        """Test edits of fields outside the text do not queue a refresh"""
+        from app.models import ProductSimilarityQueue
+        
+        response = client.put(
+            f"/products/{text_catalog['Tea Cup'].id}", json={"price": 12.5}, headers=admin_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert db.query(ProductSimilarityQueue).count() == 0
+    
+    def test_created_product_is_queued(self, client, db, admin_headers, test_category):
+        """Test new products are queued for the similarity job"""
+        from app.models import ProductSimilarityQueue
+        
+        response = client.post(
+            "/products/",
+            json={"name": "Tripod", "price": 30.0, "stock": 5, "category_id": test_category.id},
+            headers=admin_headers
+        )
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert db.query(ProductSimilarityQueue.product_id).scalar() == response.json()["id"]
+    
+    def test_imported_products_are_queued(self, client, db, admin_headers, test_category):
+        """Test import queues new products and rows that change text fields, not price-only changes"""
+        from app.models import Product, ProductSimilarityQueue
+        
+        renamed, repriced = (
+            Product(sku=sku, name=name, price=Decimal("10.00"), stock=1, category_id=test_category.id, is_active=1)
+            for sku, name in (("S-1", "Teapot"), ("S-2", "Kettle"))
+        )
+        db.add_all([renamed, repriced])
+        db.commit()
+        
+        content = (
+            "sku,name,price,stock\nS-1,Glass Teapot,10.00,1\nS-2,Kettle,12.00,1\n"
+            "S-3,Tea Strainer,4.00,1\n,Tea Tray,8.00,1\n"
+        )
+        response = client.post(
+            "/products/import", files={"file": ("feed.csv", content, "text/csv")}, headers=admin_headers
+        )
+        
+        assert response.json()["imported"] == 4
+        created = {name: product_id for name, product_id in db.query(Product.name, Product.id)}
+        queued = {product_id for product_id, in db.query(ProductSimilarityQueue.product_id)}
+        assert queued == {renamed.id, created["Tea Strainer"], created["Tea Tray"]}
+    
+    def test_bulk_activity_change_is_queued(self, client, db, admin_headers, text_catalog):
+        """Test bulk updates queue products whose is_active changes"""
+        from app.models import ProductSimilarityQueue
+        
+        cup, mug = text_catalog["Tea Cup"], text_catalog["Ceramic Mug"]
+        payload = {"items": [{"id": cup.id, "is_active": 0}, {"id": mug.id, "price": 5.0}]}
+        response = client.patch("/products/bulk", json=payload, headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [product_id for product_id, in db.query(ProductSimilarityQueue.product_id)] == [cup.id]
+    
+    def test_similar_unknown_product(self, client):
+        """Test similar products for a missing product"""
+        response = client.get("/products/99999/similar")
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -115,6 +115,20 @@ class TestReviews:
         assert len(data["items"]) >= 1
         assert all(review["product_id"] == test_product.id for review in data["items"])
     
+    def test_get_product_reviews_exposes_only_author_name(self, client, test_product, auth_headers):
+        """Test that public review list does not leak private user columns"""
+        client.post(
+            "/reviews",
+            json={"product_id": test_product.id, "rating": 4, "comment": "Fine"},
+            headers=auth_headers
+        )
+        
+        response = client.get(f"/reviews/product/{test_product.id}")
+        
+        assert response.status_code == status.HTTP_200_OK
+        user = response.json()["items"][0]["user"]
+        assert set(user) == {"id", "name"}
+    
     def test_get_product_reviews_no_auth_required(self, client, test_product):
         """Test that getting product reviews doesn't require auth"""
         response = client.get(f"/reviews/product/{test_product.id}")
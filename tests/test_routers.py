@@ -0,0 +1,63 @@
+"""
+Тесты ролей развертывания: набор и порядок подключаемых роутеров
+"""
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.main import create_app
+from app.routers import ROUTERS, deploy_routers, is_read_only_role
+
+
+def route_keys(application):
+    return [(route.path, method) for route in application.routes for method in getattr(route, "methods", None) or ()]
+
+
+class TestDeployRoles:
+
+    def test_deploy_routers(self):
+        """Test roles resolve to routers in the fixed mounting order"""
+        assert deploy_routers("all") == ROUTERS
+        assert deploy_routers("catalog") == ("catalog",)
+        assert deploy_routers("reviews, catalog,admin") == ("admin", "catalog", "reviews")
+        with pytest.raises(ValueError):
+            deploy_routers("catalog,payments")
+        with pytest.raises(ValueError):
+            deploy_routers(" , ")
+
+    def test_read_only_roles(self):
+        """Test only catalog-only roles are treated as read-only"""
+        assert is_read_only_role("catalog")
+        assert not is_read_only_role("catalog,cart")
+        assert not is_read_only_role("all")
+
+    def test_catalog_role_mounts_only_catalog(self):
+        """Test a catalog node serves catalog reads and no write or account routes"""
+        routes = route_keys(create_app("catalog"))
+
+        assert ("/products/", "GET") in routes
+        assert ("/products/{product_id}", "GET") in routes
+        assert ("/categories/", "GET") in routes
+        assert ("/ready", "GET") in routes
+        assert ("/products/", "POST") not in routes
+        assert ("/products/{product_id}", "PUT") not in routes
+        assert ("/auth/login", "POST") not in routes
+        assert ("/cart", "GET") not in routes
+        assert ("/admin/orders", "GET") not in routes
+
+    def test_admin_routes_precede_catalog_item_route(self):
+        """Test static admin product paths are matched before /products/{product_id}"""
+        routes = route_keys(create_app("all"))
+        assert routes.index(("/products/export", "GET")) < routes.index(("/products/{product_id}", "GET"))
+
+    def test_catalog_node_serves_requests(self, db, test_product):
+        """Test a catalog-only application answers catalog requests and 404s the rest"""
+        application = create_app("catalog")
+        application.dependency_overrides[get_db] = lambda: db
+        with TestClient(application) as client:
+            response = client.get(f"/products/{test_product.id}")
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["name"] == test_product.name
+            assert client.get("/cart").status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,78 @@
+"""
+Тесты расчета конфигурации production-сервера: квота CPU, воркеры, пул соединений
+"""
+
+from app.config import settings
+from app.serve import cpu_limit, gunicorn_options, pool_limits, worker_count, WORKER_CLASS
+
+
+class TestServe:
+
+    def test_cpu_limit_reads_cgroup_v2_quota(self, tmp_path, monkeypatch):
+        """Test a fractional cgroup v2 quota limits the available cores"""
+        monkeypatch.setattr("os.sched_getaffinity", lambda pid: set(range(8)))
+        (tmp_path / "cpu.max").write_text("150000 100000\n")
+        assert cpu_limit(tmp_path) == 1.5
+
+        (tmp_path / "cpu.max").write_text("max 100000\n")
+        assert cpu_limit(tmp_path) == 8
+
+    def test_cpu_limit_reads_cgroup_v1_quota(self, tmp_path, monkeypatch):
+        """Test the cgroup v1 CFS quota is used when cpu.max is absent"""
+        monkeypatch.setattr("os.sched_getaffinity", lambda pid: set(range(2)))
+        (tmp_path / "cpu").mkdir()
+        (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("400000\n")
+        (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+        # Привязка к ядрам строже квоты
+        assert cpu_limit(tmp_path) == 2
+
+        (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+        assert cpu_limit(tmp_path) == 2
+
+    def test_worker_count(self, monkeypatch):
+        """Test workers follow the CPU quota unless set explicitly"""
+        monkeypatch.setattr(settings, "SERVE_WORKERS", None)
+        monkeypatch.setattr(settings, "SERVE_WORKERS_PER_CORE", 1.0)
+        monkeypatch.setattr(settings, "SERVE_MAX_WORKERS", 16)
+
+        assert worker_count(1.5) == 2
+        assert worker_count(0.25) == 1
+        assert worker_count(64) == 16
+        assert worker_count(4, workers=3) == 3
+
+        monkeypatch.setattr(settings, "SERVE_WORKERS", 5)
+        assert worker_count(4) == 5
+
+    def test_pool_limits_split_connection_budget(self, monkeypatch):
+        """Test the instance connection budget is divided across workers"""
+        monkeypatch.setattr(settings, "SERVE_DB_CONNECTIONS", 40)
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 15)
+
+        assert pool_limits(4) == (2, 8)
+        assert pool_limits(1) == (10, 30)
+        pool_size, max_overflow = pool_limits(64)
+        assert pool_size == 1 and max_overflow == 0
+
+    def test_gunicorn_options(self):
+        """Test workers are uvicorn workers, preloaded and recycled with jitter"""
+        options = gunicorn_options(3, "127.0.0.1:9000")
+
+        assert options["workers"] == 3
+        assert options["bind"] == "127.0.0.1:9000"
+        assert options["worker_class"] == WORKER_CLASS
+        assert options["preload_app"] is True
+        assert options["max_requests"] == settings.SERVE_MAX_REQUESTS
+        assert options["max_requests_jitter"] == settings.SERVE_MAX_REQUESTS_JITTER
+        assert callable(options["post_fork"])
+
+    def test_reexec_runs_the_module(self, monkeypatch):
+        """Test USR2 re-executes python -m app.serve with the original options"""
+        from types import SimpleNamespace
+
+        monkeypatch.setattr("sys.argv", ["/srv/app/serve.py", "--workers", "2"])
+        server = SimpleNamespace(START_CTX={"args": ["python", "/srv/app/serve.py", "--workers", "2"]})
+
+        gunicorn_options(2)["on_starting"](server)
+
+        assert server.START_CTX["args"][1:] == ["-m", "app.serve", "--workers", "2"]
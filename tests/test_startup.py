@@ -0,0 +1,124 @@
+"""
+Тесты фаз запуска приложения: проверка схемы, прогрев пула, заполнение кэшей
+"""
+
+import subprocess
+import sys
+
+import pytest
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.cache import category_cache, ranking_cache
+from app.config import settings
+from app.migrate import alembic_config, migrate, readiness_gate
+from app.models import Base, Category, User
+from app.startup import bootstrap_admin, prime_caches, run_startup, verify_schema, warm_pool
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    # Файловая SQLite использует QueuePool, как и PostgreSQL
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def startup_settings(monkeypatch):
+    monkeypatch.setattr(settings, "STARTUP_SCHEMA_CHECK", "require")
+    monkeypatch.setattr(settings, "DB_POOL_WARMUP", 3)
+    monkeypatch.setattr(settings, "STARTUP_PRIME_CACHES", True)
+    readiness_gate.reset()
+    yield
+    readiness_gate.reset()
+
+
+class TestStartup:
+
+    def test_import_does_not_touch_database(self):
+        """Test importing the application opens no database connection"""
+        code = (
+            "from sqlalchemy import event\n"
+            "from app.database import engine\n"
+            "connects = []\n"
+            "event.listen(engine.pool, 'connect', lambda *args: connects.append(1))\n"
+            "import app.main\n"
+            "assert not connects, connects\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+    def test_startup_phases_at_head(self, file_engine, startup_settings):
+        """Test startup verifies the schema, warms the pool and marks the instance ready"""
+        migrate(file_engine, alembic_config(with_ini=False))
+        file_engine.dispose()
+
+        timings = run_startup(file_engine, sessionmaker(bind=file_engine))
+
+        assert list(timings) == ["schema", "pool", "bootstrap", "caches"]
+        assert all(value >= 0 for value in timings.values())
+        assert file_engine.pool.checkedin() == 3
+        assert readiness_gate.ready
+
+    def test_schema_behind_head_stops_startup(self, file_engine, startup_settings):
+        """Test startup fails when the schema was not migrated to head"""
+        Base.metadata.create_all(bind=file_engine)
+
+        with pytest.raises(RuntimeError, match="app.migrate"):
+            run_startup(file_engine, sessionmaker(bind=file_engine))
+        assert not readiness_gate.ready
+
+        assert verify_schema(file_engine, "warn") is False
+        assert verify_schema(file_engine, "off") is False
+        with pytest.raises(ValueError):
+            verify_schema(file_engine, "skip")
+
+    def test_warm_pool_limited_by_pool_size(self, tmp_path):
+        """Test pool warm-up never opens more connections than the pool keeps"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=2)
+        try:
+            assert warm_pool(engine, 10) == 2
+            assert engine.pool.checkedin() == 2
+        finally:
+            engine.dispose()
+
+    def test_prime_caches(self, db):
+        """Test categories and global rankings are cached before the first request"""
+        category = Category(name="Primed", description="Категория")
+        db.add(category)
+        db.commit()
+
+        report = prime_caches(db)
+
+        assert report["categories"] == 1
+        assert category_cache.get(category.id).name == "Primed"
+        assert ranking_cache.get(("bestsellers", 0)) == []
+
+    def test_bootstrap_admin(self, db, monkeypatch):
+        """Test the first administrator is created once from settings"""
+        monkeypatch.setattr(settings, "FIRST_ADMIN_EMAIL", "root@example.com")
+        monkeypatch.setattr(settings, "FIRST_ADMIN_PASSWORD", "rootpassword")
+        monkeypatch.setattr(settings, "FIRST_ADMIN_NAME", None)
+
+        bootstrap_admin(db)
+        bootstrap_admin(db)
+
+        admins = db.query(User).filter(User.is_admin == 1).all()
+        assert [(admin.email, admin.name) for admin in admins] == [("root@example.com", "Administrator")]
+
+    def test_lifespan_uses_test_database(self, db, app_database, monkeypatch):
+        """Test the test client's startup phases run against the test database"""
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        monkeypatch.setattr(settings, "FIRST_ADMIN_EMAIL", "root@example.com")
+        monkeypatch.setattr(settings, "FIRST_ADMIN_PASSWORD", "rootpassword")
+
+        with TestClient(app):
+            pass
+
+        assert db.query(User.email).filter(User.is_admin == 1).all() == [("root@example.com",)]
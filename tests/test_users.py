@@ -0,0 +1,121 @@
+"""
+Тесты административных эндпоинтов пользователей
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi import status
+
+
+@pytest.fixture
+def directory_users(db):
+    from app.models import User
+    
+    started = datetime(2026, 1, 1, 12, 0, 0)
+    users = [
+        User(
+            name=name,
+            email=email,
+            hashed_password="not-a-real-hash",
+            is_active=is_active,
+            created_at=started + timedelta(minutes=index),
+        )
+        for index, (name, email, is_active) in enumerate([
+            ("Anna Smirnova", "anna@example.com", 1),
+            ("Boris Petrov", "boris@example.com", 1),
+            ("Anton Ivanov", "Anton.Ivanov@corp.example.com", 0),
+            ("Maria Annenkova", "maria@example.com", 1),
+            ("Oleg 100%_Sale", "oleg@example.com", 1),
+        ])
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+class TestUserDirectory:
+    
+    def test_list_users_hides_password_hash(self, client, admin_headers, directory_users):
+        """Test admin listing serializes users without password hashes"""
+        response = client.get("/users", headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data["items"]) == 6
+        assert all("hashed_password" not in user for user in data["items"])
+    
+    def test_search_by_email_prefix(self, client, admin_headers, directory_users):
+        """Test email search is a case-insensitive prefix match"""
+        response = client.get("/users?email=ANTON", headers=admin_headers)
+        
+        assert [user["name"] for user in response.json()["items"]] == ["Anton Ivanov"]
+        
+        response = client.get("/users?email=example", headers=admin_headers)
+        assert response.json()["items"] == []
+    
+    def test_search_by_name_substring(self, client, admin_headers, directory_users):
+        """Test name search matches substrings and combines with flags"""
+        response = client.get("/users?name=ann", headers=admin_headers)
+        names = {user["name"] for user in response.json()["items"]}
+        assert names == {"Anna Smirnova", "Maria Annenkova"}
+        
+        response = client.get("/users?name=an&is_active=0", headers=admin_headers)
+        assert [user["name"] for user in response.json()["items"]] == ["Anton Ivanov"]
+    
+    def test_search_escapes_like_wildcards(self, client, admin_headers, directory_users):
+        """Test % and _ in search input are matched literally"""
+        response = client.get("/users?name=0%25_", headers=admin_headers)
+        assert [user["name"] for user in response.json()["items"]] == ["Oleg 100%_Sale"]
+        
+        response = client.get("/users?name=%25", headers=admin_headers)
+        assert [user["name"] for user in response.json()["items"]] == ["Oleg 100%_Sale"]
+    
+    def test_filter_by_admin_flag(self, client, admin_headers, admin_user, directory_users):
+        """Test is_admin filter"""
+        response = client.get("/users?is_admin=1", headers=admin_headers)
+        
+        assert [user["id"] for user in response.json()["items"]] == [admin_user.id]
+    
+    def test_keyset_pagination(self, client, admin_headers, directory_users):
+        """Test walking pages with next_cursor returns every user once, newest first"""
+        response = client.get("/users?email=&is_admin=0&page_size=2", headers=admin_headers)
+        data = response.json()
+        assert "pagination" not in data
+        assert not any("count(" in statement.lower() for statement in client.last_queries.statements)
+        seen = [user["email"] for user in data["items"]]
+        
+        while data["next_cursor"]:
+            response = client.get(
+                f"/users?is_admin=0&page_size=2&cursor={data['next_cursor']}",
+                headers=admin_headers
+            )
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            assert "pagination" not in data
+            seen += [user["email"] for user in data["items"]]
+        
+        assert seen == [user.email for user in reversed(directory_users)]
+    
+    def test_offset_pagination_on_request(self, client, admin_headers, directory_users):
+        """Test an explicit page switches to offset pagination with total"""
+        response = client.get("/users?is_admin=0&page=2&page_size=2", headers=admin_headers)
+        
+        data = response.json()
+        assert data["pagination"]["total"] == 5
+        assert [user["email"] for user in data["items"]] == [user.email for user in reversed(directory_users)][2:4]
+        assert "next_cursor" not in data
+        
+        response = client.get("/users?page=1&cursor=abc", headers=admin_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_invalid_cursor(self, client, admin_headers):
+        """Test malformed cursor is rejected"""
+        response = client.get("/users?cursor=not-a-cursor", headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_list_users_as_regular_user(self, client, auth_headers):
+        """Test user directory requires admin"""
+        response = client.get("/users", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN